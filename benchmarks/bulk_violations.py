@@ -0,0 +1,107 @@
+"""
+Bulk citation ingestion benchmark: DatabaseManager.add_violations_bulk() vs. a
+loop of add_violation() calls, as an ANPR camera or offline handheld upload
+would do it. A share of the records uses an unknown violation type to exercise
+the per-record rejection path.
+
+    python benchmarks/bulk_violations.py --records 50000
+    python benchmarks/bulk_violations.py --records 100000 --chunk-size 5000 --single 0
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from synthetic import open_database
+
+
+def query(db, sql, params=()):
+    conn = db.connect()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def delete_ids(db, ids):
+    conn = db.connect()
+    cursor = conn.cursor()
+    try:
+        for start in range(0, len(ids), 1000):
+            chunk = ids[start:start + 1000]
+            cursor.execute(f"DELETE FROM violations WHERE violation_id IN ({', '.join(['%s'] * len(chunk))})", chunk)
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=50_000, help="records in the bulk upload")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="rows per executemany / commit")
+    parser.add_argument("--single", type=int, default=2000, help="records for the add_violation() baseline (0 = skip)")
+    parser.add_argument("--bad-rate", type=float, default=0.01, help="share of records with an unknown type")
+    parser.add_argument("--keep", action="store_true", help="keep the inserted rows afterwards")
+    args = parser.parse_args()
+
+    db = open_database(citation_block_size=max(args.chunk_size, 100))
+    rng = random.Random(11)
+    type_ids = [row[0] for row in query(db, "SELECT type_id FROM violation_types")]
+    enforcers = [row[0] for row in query(db, "SELECT user_id FROM users WHERE role='enforcer'")]
+    registered = [row[0] for row in query(db, "SELECT plate_number FROM vehicles LIMIT 500")]
+    plates = registered + [f"BN {i:04d}" for i in range(2000)]
+    now = datetime.now()
+
+    def record():
+        bad = rng.random() < args.bad_rate
+        return {
+            'plate_number': rng.choice(plates),
+            'violation_type_id': -1 if bad else rng.choice(type_ids),
+            'enforcer_id': rng.choice(enforcers),
+            'location': "Benchmark Ave",
+            'violation_date': now - timedelta(seconds=rng.randrange(86400)),
+            'notes': "bulk benchmark",
+        }
+
+    inserted = []
+    try:
+        if args.single:
+            records = [record() for _ in range(args.single)]
+            started = time.perf_counter()
+            for r in records:
+                vid = db.add_violation(r['plate_number'], r['violation_type_id'], r['enforcer_id'],
+                                       r['location'], r['violation_date'], r['notes'])
+                if vid > 0:
+                    inserted.append(vid)
+            elapsed = time.perf_counter() - started
+            print(f"add_violation() loop:   {args.single:>9,} records {elapsed:>7.2f}s  {args.single / elapsed:>9,.0f}/s")
+
+        records = [record() for _ in range(args.records)]
+        started = time.perf_counter()
+        outcomes = db.add_violations_bulk(records, chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - started
+        ok = [o['violation_id'] for o in outcomes if o['violation_id'] > 0]
+        inserted.extend(ok)
+        print(f"add_violations_bulk():  {args.records:>9,} records {elapsed:>7.2f}s  {args.records / elapsed:>9,.0f}/s "
+              f"(chunk {args.chunk_size})")
+
+        expected_bad = sum(1 for r in records if r['violation_type_id'] == -1)
+        rejected = [o for o in outcomes if o['error']]
+        citations = [o['citation_number'] for o in outcomes if o['citation_number']]
+        print(f"{'✓' if len(rejected) == expected_bad else '✗'} rejected {len(rejected):,} "
+              f"(expected {expected_bad:,} with an unknown type)")
+        print(f"{'✓' if len(set(citations)) == len(citations) == len(ok) else '✗'} "
+              f"{len(ok):,} inserted, each with its own citation number and violation id")
+    finally:
+        if not args.keep and inserted:
+            delete_ids(db, inserted)
+            db.reconcile_dashboard_counters()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Concurrent citation benchmark for DatabaseManager.add_violation().
+
+N threads issue violations in parallel through add_violation(), which takes its
+citation number from the block-reserved id_sequences allocator. Checks that
+every insert succeeded, that all citation numbers are distinct and increasing
+per thread, and reports how many of the same calls would have collided under
+the old CIT-<date>-<unix seconds> scheme.
+
+    python benchmarks/citations.py --threads 16 --per-thread 500
+    python benchmarks/citations.py --threads 32 --block-size 1000
+"""
+import argparse
+import statistics
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from synthetic import open_database
+
+
+def query(db, sql, params=()):
+    conn = db.connect()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16, help="parallel issuing threads")
+    parser.add_argument("--per-thread", type=int, default=500, help="violations issued by each thread")
+    parser.add_argument("--block-size", type=int, default=100, help="citation numbers reserved per round trip")
+    parser.add_argument("--keep", action="store_true", help="keep the inserted rows afterwards")
+    args = parser.parse_args()
+
+    # add_violation holds one connection while the allocator reserves a block on another
+    db = open_database(pool_size=args.threads * 2, max_overflow=0, citation_block_size=args.block_size)
+    type_id = query(db, "SELECT type_id FROM violation_types LIMIT 1")[0][0]
+    enforcer_id = query(db, "SELECT user_id FROM users WHERE role='enforcer' LIMIT 1")[0][0]
+
+    ids, citations, legacy, latencies = [], {}, [], []
+    lock = threading.Lock()
+
+    def issuer(worker):
+        mine, mine_legacy, mine_latency = [], [], []
+        for i in range(args.per_thread):
+            mine_legacy.append(f"CIT-{datetime.now().strftime('%Y%m%d')}-{int(datetime.now().timestamp())}")
+            started = time.perf_counter()
+            vid = db.add_violation(f"BN {worker:02d}{i % 100:02d}", type_id, enforcer_id,
+                                   "Benchmark Ave", datetime.now(), notes="citation benchmark")
+            mine_latency.append(time.perf_counter() - started)
+            mine.append(vid)
+        with lock:
+            ids.extend(mine)
+            citations[worker] = mine
+            legacy.extend(mine_legacy)
+            latencies.extend(mine_latency)
+
+    threads = [threading.Thread(target=issuer, args=(w,)) for w in range(args.threads)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+
+    inserted = [vid for vid in ids if vid > 0]
+    try:
+        total = args.threads * args.per_thread
+        failed = len(ids) - len(inserted)
+        latencies.sort()
+        print(f"threads: {args.threads}, block size: {args.block_size}, violations: {total:,}, wall: {wall:.1f}s")
+        print(f"throughput: {total / wall:,.0f} violations/s, "
+              f"latency median {statistics.median(latencies) * 1000:.1f} ms, "
+              f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:.1f} ms")
+        print(f"allocator: {db.citation_sequence.stats()}")
+
+        numbers = {}
+        for start in range(0, len(inserted), 1000):
+            chunk = inserted[start:start + 1000]
+            marks = ", ".join(["%s"] * len(chunk))
+            for vid, citation in query(db, f"SELECT violation_id, citation_number FROM violations "
+                                           f"WHERE violation_id IN ({marks})", chunk):
+                numbers[vid] = int(citation.rsplit("-", 1)[1])
+        duplicates = len(numbers) - len(set(numbers.values()))
+        unordered = sum(
+            1 for mine in citations.values()
+            for a, b in zip(mine, mine[1:]) if a > 0 and b > 0 and numbers[a] >= numbers[b]
+        )
+        legacy_collisions = sum(n - 1 for n in Counter(legacy).values())
+        print(f"{'✓' if not failed else '✗'} failed inserts: {failed}")
+        print(f"{'✓' if not duplicates else '✗'} duplicate citation numbers: {duplicates}")
+        print(f"{'✓' if not unordered else '✗'} out-of-order numbers within a thread: {unordered}")
+        print(f"  old timestamp scheme would have collided on {legacy_collisions:,} of {total:,} calls")
+    finally:
+        if not args.keep and inserted:
+            conn = db.connect()
+            cursor = conn.cursor()
+            try:
+                for start in range(0, len(inserted), 1000):
+                    chunk = inserted[start:start + 1000]
+                    cursor.execute(f"DELETE FROM violations WHERE violation_id IN ({', '.join(['%s'] * len(chunk))})",
+                                   chunk)
+                conn.commit()
+            finally:
+                cursor.close()
+                conn.close()
+            db.reconcile_dashboard_counters()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
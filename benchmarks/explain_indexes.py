@@ -0,0 +1,133 @@
+"""
+Before/after EXPLAIN benchmark for the hot-path indexes added by migration 4.
+
+"Before" runs each query with IGNORE INDEX for the index that serves it, which
+reproduces the pre-migration plan on the same data; "after" lets MySQL choose.
+
+    python benchmarks/explain_indexes.py                 # current data
+    python benchmarks/explain_indexes.py --rows 200000   # add synthetic violations first
+    python benchmarks/explain_indexes.py --rows 200000 --keep
+"""
+import argparse
+import time
+from datetime import date, timedelta
+
+from synthetic import seed_violations, clear_violations
+from models.database import DatabaseManager
+
+# (name, index, SQL with {hint} after the table it applies to, params(sample))
+HOT_QUERIES = [
+    ("search_vehicle_full: violations by plate", "idx_violations_plate_date", """
+        SELECT v.*, vt.violation_name FROM violations v {hint}
+        JOIN violation_types vt ON v.violation_type_id = vt.type_id
+        WHERE v.plate_number = %s ORDER BY v.violation_date DESC
+    """, lambda s: (s["plate"],)),
+    ("pending violations, newest first", "idx_violations_status_date", """
+        SELECT v.* FROM violations v {hint}
+        WHERE v.status = 'pending' ORDER BY v.violation_date DESC LIMIT 50
+    """, lambda s: ()),
+    ("get_violations_page: first page", "idx_violations_date", """
+        SELECT v.* FROM violations v {hint}
+        ORDER BY v.violation_date DESC, v.violation_id DESC LIMIT 50
+    """, lambda s: ()),
+    ("report: violations in date range", "idx_violations_date", """
+        SELECT COUNT(*), SUM(v.fine_amount) FROM violations v {hint}
+        WHERE v.violation_date >= %s AND v.violation_date < %s
+    """, lambda s: (s["today"] - timedelta(days=30), s["today"] + timedelta(days=1))),
+    ("get_vehicles_by_owner", "idx_vehicles_owner_created", """
+        SELECT * FROM vehicles {hint} WHERE owner_id = %s ORDER BY created_at DESC
+    """, lambda s: (s["owner_id"],)),
+    ("expiring vehicles (30 days)", "idx_vehicles_expiry", """
+        SELECT * FROM vehicles {hint} WHERE expiry_date >= %s AND expiry_date <= %s
+    """, lambda s: (s["today"], s["today"] + timedelta(days=30))),
+    ("get_payment_history(user_id)", "idx_payments_user_created", """
+        SELECT p.* FROM payments p {hint} WHERE p.user_id = %s ORDER BY p.created_at DESC
+    """, lambda s: (s["user_id"],)),
+]
+
+
+def sample_values(cursor):
+    cursor.execute("SELECT plate_number FROM violations GROUP BY plate_number ORDER BY COUNT(*) DESC LIMIT 1")
+    plate = cursor.fetchone()
+    cursor.execute("SELECT owner_id FROM vehicles LIMIT 1")
+    owner = cursor.fetchone()
+    cursor.execute("SELECT user_id FROM payments LIMIT 1")
+    payer = cursor.fetchone()
+    return {
+        "plate": plate["plate_number"] if plate else "ABC 1234",
+        "owner_id": owner["owner_id"] if owner else 0,
+        "user_id": payer["user_id"] if payer else 0,
+        "today": date.today(),
+    }
+
+
+def explain(cursor, sql, params):
+    cursor.execute("EXPLAIN " + sql, params)
+    return cursor.fetchall()
+
+
+def time_query(cursor, sql, params, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        cursor.execute(sql, params)
+        cursor.fetchall()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def describe(plan):
+    # First row is the driving table for every query above
+    row = plan[0]
+    return f"type={row['type']:<6} key={str(row['key']):<28} rows={row['rows']!s:<9} {row.get('Extra') or ''}"
+
+
+def run(db, repeat):
+    conn = db.connect()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        sample = sample_values(cursor)
+        for name, index, sql, params_for in HOT_QUERIES:
+            params = params_for(sample)
+            before_sql = sql.format(hint=f"IGNORE INDEX ({index})")
+            after_sql = sql.format(hint="")
+            before_plan = explain(cursor, before_sql, params)
+            after_plan = explain(cursor, after_sql, params)
+            before_ms = time_query(cursor, before_sql, params, repeat)
+            after_ms = time_query(cursor, after_sql, params, repeat)
+            print(f"\n{name}  [{index}]")
+            print(f"  before: {describe(before_plan)}")
+            print(f"  after : {describe(after_plan)}")
+            speedup = before_ms / after_ms if after_ms else float("inf")
+            print(f"  best of {repeat}: {before_ms:8.2f} ms -> {after_ms:8.2f} ms  ({speedup:.1f}x)")
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=0, help="synthetic violations to add before measuring")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per query (best is reported)")
+    parser.add_argument("--keep", action="store_true", help="keep synthetic rows afterwards")
+    args = parser.parse_args()
+
+    db = DatabaseManager()
+    if args.rows:
+        seed_violations(db, args.rows)
+    try:
+        conn = db.connect()
+        cursor = conn.cursor()
+        cursor.execute("ANALYZE TABLE violations, vehicles, payments")
+        cursor.fetchall()
+        cursor.close()
+        conn.close()
+        run(db, args.repeat)
+    finally:
+        if args.rows and not args.keep:
+            clear_violations(db)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
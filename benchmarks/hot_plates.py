@@ -0,0 +1,140 @@
+"""
+Checkpoint lookup benchmark for the hot-plate cache (DatabaseManager.hot_plates).
+
+N terminal threads search plates drawn from a skewed distribution (a few plates
+are looked up again and again, as at a checkpoint) and cite a share of them,
+once with the cache disabled and once with --cache-size entries. Reports
+throughput, lookup latency, hit rate and pool checkouts for both runs, and
+checks that a search made after a citation includes it, whether the citation
+came from the same terminal or from another one (a second DatabaseManager with
+its own cache, as on another machine).
+
+    python benchmarks/hot_plates.py --terminals 8 --lookups 5000
+    python benchmarks/hot_plates.py --plates 20000 --cache-size 512 --cite-rate 0.1
+"""
+import argparse
+import random
+import threading
+import time
+from datetime import date, datetime
+
+from synthetic import open_database
+
+PLATE_PREFIX = "HP"
+
+
+def query(db, sql, params=(), many=False):
+    conn = db.connect()
+    cursor = conn.cursor()
+    try:
+        if many:
+            cursor.executemany(sql, params)
+            conn.commit()
+            return None
+        cursor.execute(sql, params)
+        if cursor.description is None:
+            conn.commit()
+            return None
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def seed_vehicles(db, count):
+    owner_id = query(db, "SELECT user_id FROM users ORDER BY user_id LIMIT 1")[0][0]
+    plates = [f"{PLATE_PREFIX} {i:05d}" for i in range(count)]
+    query(db, """
+        INSERT INTO vehicles (plate_number, owner_id, make, model, year, color, chassis_number, registration_date, expiry_date, or_cr_number, status)
+        VALUES (%s, %s, 'Toyota', 'Vios', 2020, 'White', %s, %s, %s, %s, 'active')
+    """, [(p, owner_id, f"HPCH{i:05d}", date(2024, 1, 1), date(2030, 1, 1), f"HPOR{i:05d}") for i, p in enumerate(plates)],
+        many=True)
+    return plates
+
+
+def cleanup(db):
+    like = PLATE_PREFIX + " %"
+    query(db, "DELETE FROM violations WHERE plate_number LIKE %s", (like,))
+    query(db, "DELETE FROM vehicles WHERE plate_number LIKE %s", (like,))
+    db.reconcile_dashboard_counters()
+
+
+def run(args, plates, cache_size):
+    db = open_database(hot_plates_size=cache_size, hot_plates_ttl=None)
+    other_terminal = open_database(hot_plates_size=cache_size, hot_plates_ttl=None)
+    type_id = db.get_all_violation_types()[0]['type_id']
+    enforcer_id = query(db, "SELECT user_id FROM users WHERE role='enforcer' LIMIT 1")[0][0]
+    # Zipf-like weights: plate k is searched ~1/k as often as the hottest one
+    weights = [1 / (k + 1) for k in range(len(plates))]
+    latencies, stale, lock = [], [], threading.Lock()
+    checkouts = db.get_pool_stats()['checkouts']
+
+    def terminal(seed):
+        rng = random.Random(seed)
+        local = []
+        for plate in rng.choices(plates, weights, k=args.lookups):
+            started = time.perf_counter()
+            found = db.search_vehicle_full(plate)
+            local.append(time.perf_counter() - started)
+            if rng.random() < args.cite_rate:
+                before = len(found['violations'])
+                writer = db if rng.random() < 0.5 else other_terminal
+                writer.add_violation(plate, type_id, enforcer_id, "Checkpoint 3", datetime.now(), "hot plate benchmark")
+                # The citation must show up on this terminal's next search, whoever wrote it
+                if len(db.search_vehicle_full(plate)['violations']) <= before:
+                    with lock:
+                        stale.append(plate)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=terminal, args=(i,)) for i in range(args.terminals)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    stats = db.get_hot_plate_cache_stats()
+    result = {
+        'rate': len(latencies) / elapsed,
+        'p50': latencies[len(latencies) // 2] * 1000,
+        'p95': latencies[int(len(latencies) * 0.95)] * 1000,
+        'hit_rate': stats['hit_rate'] or 0.0,
+        'checkouts': db.get_pool_stats()['checkouts'] - checkouts,
+        'stale': len(stale),
+    }
+    db.close()
+    other_terminal.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--terminals", type=int, default=8, help="parallel searching terminals")
+    parser.add_argument("--lookups", type=int, default=5000, help="searches per terminal")
+    parser.add_argument("--plates", type=int, default=5000, help="registered plates in the lookup pool")
+    parser.add_argument("--cache-size", type=int, default=2048, help="hot-plate cache entries")
+    parser.add_argument("--cite-rate", type=float, default=0.05, help="share of searches followed by a citation")
+    args = parser.parse_args()
+
+    db = open_database()
+    cleanup(db)
+    plates = seed_vehicles(db, args.plates)
+    db.close()
+    try:
+        for label, size in (("no cache", 0), (f"cache {args.cache_size}", args.cache_size)):
+            r = run(args, plates, size)
+            print(f"{label:<12} {r['rate']:>9,.0f} lookups/s   p50 {r['p50']:.3f} ms   p95 {r['p95']:.3f} ms   "
+                  f"hit rate {r['hit_rate']:.0%}   pool checkouts {r['checkouts']:,}")
+            print(f"{'✓' if not r['stale'] else '✗'} searches after a citation include it "
+                  f"({r['stale']} stale)")
+    finally:
+        db = open_database()
+        cleanup(db)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Offline citation queue against a local stand-in server (no MySQL needed).
+
+The "central" database is an SQLite file behind a backend that can be switched
+off to simulate a lost connection. Enforcer citations are queued in a
+CitationJournal while the server is down, the sync backs off, then the server
+comes back, one acknowledgement is dropped on purpose (the batch is stored but
+the journal isn't updated) and the queue is drained. Checks that every citation
+reached the server exactly once and that the journal holds the server's
+citation numbers.
+
+    python benchmarks/offline_sync.py --citations 2000
+    python benchmarks/offline_sync.py --citations 500 --batch-size 50
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+import synthetic  # noqa: F401  (puts the project root on sys.path)
+from models.backends import SQLiteBackend
+from models.database import DatabaseManager
+from models.offline import CitationJournal, CitationSync
+
+
+class StandInBackend(SQLiteBackend):
+    """SQLite stand-in for the central server that can be taken offline"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.down = False
+
+    def connect(self):
+        if self.down:
+            return None
+        raw = super().connect()
+        return _Unplugged(raw, self) if raw else None
+
+
+class _Unplugged:
+    """Pooled connection that stops working while the stand-in is down"""
+
+    def __init__(self, raw, backend):
+        self._raw = raw
+        self._backend = backend
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def cursor(self, *args, **kwargs):
+        if self._backend.down:
+            raise sqlite3.OperationalError("server unreachable")
+        return self._raw.cursor(*args, **kwargs)
+
+    def is_connected(self):
+        return not self._backend.down and self._raw.is_connected()
+
+
+def percentile(values, share):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--citations", type=int, default=2000, help="citations recorded while offline")
+    parser.add_argument("--batch-size", type=int, default=200, help="citations per sync batch")
+    parser.add_argument("--outage-syncs", type=int, default=5, help="sync attempts made while the server is down")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = StandInBackend(os.path.join(tmp, "central.db"))
+        db = DatabaseManager(backend=server)
+        journal = CitationJournal(os.path.join(tmp, "journal.db"))
+        sync = CitationSync(db, journal, batch_size=args.batch_size, base_delay=0.05, max_delay=1.0)
+        type_id = db.get_all_violation_types()[0]['type_id']
+        enforcer_id = [u for u in db.get_all_users() if u['role'] == 'enforcer'][0]['user_id']
+        sync.sync_once()  # online: snapshot the violation types for offline use
+
+        def record(i, type_id=type_id):
+            return {'plate_number': f"OFF {i:04d}", 'violation_type_id': type_id, 'enforcer_id': enforcer_id,
+                    'location': "Checkpoint 7", 'violation_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    'notes': "offline benchmark"}
+
+        online = []
+        for i in range(200):
+            started = time.perf_counter()
+            db.add_violation(**record(i))
+            online.append(time.perf_counter() - started)
+
+        server.down = True
+        queued = []
+        for i in range(args.citations):
+            started = time.perf_counter()
+            journal.enqueue(record(i))
+            queued.append(time.perf_counter() - started)
+        journal.enqueue(record(-1, type_id=-1))  # will be rejected by the server
+        print(f"submit latency   add_violation (local server): median {statistics.median(online) * 1000:.2f} ms, "
+              f"p95 {percentile(online, 0.95):.2f} ms")
+        print(f"                 journal enqueue (fsync):      median {statistics.median(queued) * 1000:.2f} ms, "
+              f"p95 {percentile(queued, 0.95):.2f} ms")
+        print(f"offline types available: {len(journal.load_violation_types())}")
+
+        delays = []
+        for _ in range(args.outage_syncs):
+            summary = sync.sync_once()
+            delays.append(sync.next_delay())
+        print(f"outage: online={sync.online}, queued={summary['journal']['queued']}, "
+              f"backoff delays {', '.join(f'{d:.2f}s' for d in delays)}")
+
+        server.down = False
+        # Drop one acknowledgement: the batch reaches the server but the journal isn't updated
+        def lost_ack(results):
+            raise ConnectionError("ack lost")
+
+        mark_synced = journal.mark_synced
+        journal.mark_synced = lost_ack
+        try:
+            sync.sync_once()
+        except ConnectionError as e:
+            print(f"reconnect: first batch stored, then {e}")
+        journal.mark_synced = mark_synced
+
+        started = time.perf_counter()
+        totals = {'synced': 0, 'reconciled': 0, 'rejected': 0}
+        while True:
+            summary = sync.sync_once()
+            for key in totals:
+                totals[key] += summary[key]
+            if not summary['journal']['queued']:
+                break
+        elapsed = time.perf_counter() - started
+        print(f"drain: {totals['synced']:,} synced ({totals['reconciled']:,} reconciled from the lost ack), "
+              f"{totals['rejected']} rejected in {elapsed:.2f}s ({totals['synced'] / elapsed:,.0f}/s)")
+
+        conn = db.connect()
+        cursor = conn.cursor()
+        cursor.execute("SELECT client_ref, citation_number FROM violations WHERE client_ref IS NOT NULL")
+        server_refs = dict(cursor.fetchall())
+        cursor.close()
+        conn.close()
+        journal_rows = journal.entries("synced", limit=args.citations + 1)
+        mismatched = sum(1 for e in journal_rows if server_refs.get(e['client_ref']) != e['citation_number'])
+        counts = journal.counts()
+        print(f"{'✓' if len(server_refs) == args.citations else '✗'} server rows from the queue: "
+              f"{len(server_refs):,} (expected {args.citations:,}, no duplicates)")
+        print(f"{'✓' if counts['synced'] == args.citations and not counts['queued'] else '✗'} journal: {counts}")
+        print(f"{'✓' if counts['rejected'] == 1 else '✗'} rejected entry: {journal.entries('rejected')[0]['last_error']}")
+        print(f"{'✓' if not mismatched else '✗'} journal citation numbers matching the server: "
+              f"{len(journal_rows) - mismatched:,}/{len(journal_rows):,}")
+        print(f"{'✓' if not db.reconcile_dashboard_counters() else '✗'} dashboard counters consistent")
+        journal.close()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
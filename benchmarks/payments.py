@@ -0,0 +1,117 @@
+"""
+Concurrent payment benchmark for DatabaseManager.record_payment().
+
+Seeds pending synthetic violations, then N threads pay them in parallel. Every
+citation is raced by --racers payers with different transaction references, and
+a share of submissions is retried with the same reference (idempotency). Checks
+afterwards that no citation has more than one payment and that the dashboard
+counters did not drift.
+
+    python benchmarks/payments.py --payers 16 --violations 2000
+    python benchmarks/payments.py --payers 32 --racers 4 --retry-rate 0.5
+"""
+import argparse
+import queue
+import random
+import statistics
+import threading
+import time
+
+from synthetic import CITATION_PREFIX, seed_violations, clear_violations, open_database
+
+
+def query(db, sql, params=()):
+    conn = db.connect()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--payers", type=int, default=16, help="parallel paying threads")
+    parser.add_argument("--violations", type=int, default=2000, help="pending citations to pay")
+    parser.add_argument("--racers", type=int, default=2, help="competing payers per citation")
+    parser.add_argument("--retry-rate", type=float, default=0.25, help="share of submissions sent twice")
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic rows afterwards")
+    args = parser.parse_args()
+
+    db = open_database(pool_size=args.payers, max_overflow=0)
+    seed_violations(db, args.violations, statuses=["pending"])
+    try:
+        payer_id = query(db, "SELECT user_id FROM users WHERE role='admin' LIMIT 1")[0][0]
+        ids = [row[0] for row in query(db, """
+            SELECT violation_id FROM violations WHERE citation_number LIKE %s AND status = 'pending'
+        """, (CITATION_PREFIX + "%",))]
+        # Seeded rows bypass the counters; start from an exact baseline
+        db.reconcile_dashboard_counters()
+
+        rng = random.Random(7)
+        jobs = queue.Queue()
+        work = [(vid, f"BENCH-PAY-{vid}-{racer}") for vid in ids for racer in range(args.racers)]
+        rng.shuffle(work)
+        for item in work:
+            jobs.put(item)
+
+        latencies, outcomes = [], {"paid": 0, "rejected": 0, "retry_ok": 0, "retry_failed": 0}
+        lock = threading.Lock()
+
+        def payer():
+            local_rng = random.Random(threading.get_ident())
+            while True:
+                try:
+                    vid, ref = jobs.get_nowait()
+                except queue.Empty:
+                    return
+                started = time.perf_counter()
+                ok = db.record_payment(vid, method="benchmark", user_id=payer_id, transaction_ref=ref)
+                elapsed = time.perf_counter() - started
+                retried = None
+                if ok and local_rng.random() < args.retry_rate:
+                    retried = db.record_payment(vid, method="benchmark", user_id=payer_id, transaction_ref=ref)
+                with lock:
+                    latencies.append(elapsed)
+                    outcomes["paid" if ok else "rejected"] += 1
+                    if retried is not None:
+                        outcomes["retry_ok" if retried else "retry_failed"] += 1
+
+        threads = [threading.Thread(target=payer) for _ in range(args.payers)]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - started
+
+        latencies.sort()
+        print(f"payers: {args.payers}, citations: {len(ids):,}, submissions: {len(work):,}, wall: {wall:.1f}s")
+        print(f"throughput: {len(work) / wall:,.0f} submissions/s, "
+              f"latency median {statistics.median(latencies) * 1000:.1f} ms, "
+              f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:.1f} ms")
+        print(f"outcomes: {outcomes}")
+
+        doubles = query(db, """
+            SELECT COUNT(*) FROM (
+                SELECT p.violation_id FROM payments p JOIN violations v ON p.violation_id = v.violation_id
+                WHERE v.citation_number LIKE %s GROUP BY p.violation_id HAVING COUNT(*) > 1
+            ) d
+        """, (CITATION_PREFIX + "%",))[0][0]
+        unpaid = query(db, "SELECT COUNT(*) FROM violations WHERE citation_number LIKE %s AND status <> 'paid'",
+                       (CITATION_PREFIX + "%",))[0][0]
+        drift = db.reconcile_dashboard_counters()
+        print(f"{'✓' if not doubles else '✗'} citations with more than one payment: {doubles}")
+        print(f"{'✓' if not unpaid else '✗'} citations left unpaid: {unpaid}")
+        print(f"{'✓' if not drift else '✗'} dashboard counter drift: {drift}")
+    finally:
+        if not args.keep:
+            clear_violations(db)
+            db.reconcile_dashboard_counters()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Plate search index benchmark: build time, memory and lookup latency of
+models.plate_index.PlateIndex over synthetic plates (no database needed), plus
+one warm_plate_index() pass against the configured database.
+
+Queries are exact plates typed loosely ("abc-1234"), short prefixes as an
+officer starts typing, and misreads (0/O, 1/I, 8/B, ...) of registered plates.
+
+    python benchmarks/plate_index.py --plates 1000000
+    python benchmarks/plate_index.py --plates 200000 --queries 5000 --skip-db
+"""
+import argparse
+import random
+import string
+import time
+import tracemalloc
+
+import synthetic  # noqa: F401  (puts the project root on sys.path)
+from models.plate_index import CONFUSABLE_GROUPS, PlateIndex, normalize_plate
+
+_SWAPS = {ch: group.replace(ch, "") for group in CONFUSABLE_GROUPS for ch in group}
+
+
+def make_plates(count, rng):
+    plates = set()
+    while len(plates) < count:
+        letters = "".join(rng.choices(string.ascii_uppercase, k=3))
+        plates.add(f"{letters} {rng.randrange(10000):04d}")
+    return list(plates)
+
+
+def misread(plate, rng):
+    positions = [i for i, ch in enumerate(plate) if ch in _SWAPS]
+    if not positions:
+        return plate
+    i = rng.choice(positions)
+    return plate[:i] + rng.choice(_SWAPS[plate[i]]) + plate[i + 1:]
+
+
+def timed(fn, queries):
+    samples = []
+    for q in queries:
+        started = time.perf_counter()
+        fn(q)
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return samples
+
+
+def report(label, samples):
+    p50 = samples[len(samples) // 2] * 1e6
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(f"  {label:<32} p50 {p50:>7.1f} µs   p99 {p99 * 1e6:>7.1f} µs   max {samples[-1] * 1e6:>8.1f} µs")
+    return p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--plates", type=int, default=1_000_000, help="synthetic plates in the index")
+    parser.add_argument("--queries", type=int, default=20_000, help="queries per kind")
+    parser.add_argument("--limit", type=int, default=8, help="suggestions per query")
+    parser.add_argument("--skip-db", action="store_true", help="don't time warm_plate_index() on the database")
+    args = parser.parse_args()
+
+    rng = random.Random(23)
+    plates = make_plates(args.plates, rng)
+
+    index = PlateIndex()
+    started = time.perf_counter()
+    index.build(plates)
+    build = time.perf_counter() - started
+    tracemalloc.start()
+    PlateIndex().build(plates)  # measured on a second copy; tracemalloc slows the build down
+    memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"build: {len(index):,} plates in {build:.2f}s, peak ~{memory / 2 ** 20:,.0f} MiB")
+
+    sample = rng.sample(plates, min(args.queries, len(plates)))
+    loose = [p.lower().replace(" ", "-") for p in sample]
+    prefixes = [normalize_plate(p)[:rng.randint(2, 4)] for p in sample]
+    misreads = [misread(p, rng) for p in sample]
+
+    print("latency:")
+    worst = max(
+        report("lookup (loose exact)", timed(index.lookup, loose)),
+        report("suggest (exact)", timed(lambda q: index.suggest(q, args.limit), sample)),
+        report("suggest (2-4 char prefix)", timed(lambda q: index.suggest(q, args.limit), prefixes)),
+        report("suggest (misread)", timed(lambda q: index.suggest(q, args.limit), misreads)),
+    )
+
+    found = sum(1 for q, p in zip(misreads, sample) if p in index.suggest(q, args.limit))
+    resolved = sum(1 for q, p in zip(loose, sample) if index.lookup(q) == p)
+    print(f"{'✓' if resolved == len(sample) else '✗'} loose exact queries resolved: {resolved:,}/{len(sample):,}")
+    print(f"{'✓' if found == len(sample) else '✗'} misread plates suggested: {found:,}/{len(sample):,}")
+    print(f"{'✓' if worst < 1e-3 else '✗'} p99 under 1 ms")
+
+    new = [f"NEW {i:05d}" for i in range(2000)]
+    started = time.perf_counter()
+    for plate in new:
+        index.add(plate)
+    added = (time.perf_counter() - started) / len(new)
+    started = time.perf_counter()
+    for plate in new:
+        index.remove(plate)
+    removed = (time.perf_counter() - started) / len(new)
+    print(f"incremental: add {added * 1e6:.1f} µs, remove {removed * 1e6:.1f} µs per plate")
+
+    if not args.skip_db:
+        db = synthetic.open_database()
+        try:
+            started = time.perf_counter()
+            size = db.warm_plate_index(refresh=True)
+            print(f"warm_plate_index(): {size:,} vehicles in {time.perf_counter() - started:.2f}s")
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Cost of query instrumentation (models/metrics.py): the same workload on a
+DatabaseManager with and without it, plus an export of the collected metrics.
+
+The workload is a mix of small lookups (dashboard stats, violation types, plate
+searches with the hot-plate cache off) and one streamed report, so both the
+per-call and the per-row overhead show up.
+
+    python benchmarks/query_metrics.py --calls 5000
+    python benchmarks/query_metrics.py --calls 2000 --export metrics.prom
+"""
+import argparse
+import time
+
+from synthetic import open_database
+
+
+def workload(db, calls):
+    started = time.perf_counter()
+    for i in range(calls):
+        db.get_dashboard_stats()
+        db.get_all_violation_types(refresh=i % 10 == 0)
+        db.search_vehicle_full("ABC 1234")
+    small = time.perf_counter() - started
+    started = time.perf_counter()
+    rows = sum(1 for _ in db.iter_violations_report())
+    return small, rows, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=5000, help="rounds of small lookups")
+    parser.add_argument("--export", default="", help="write the collected metrics here (.json or Prometheus text)")
+    args = parser.parse_args()
+
+    results = {}
+    for label, on in (("off", False), ("on", True)):
+        db = open_database(instrument_queries=on, hot_plates_size=0)
+        workload(db, min(args.calls, 200))  # warm up the pool and the statement cache
+        if db.metrics:
+            db.metrics.reset()
+        results[label] = workload(db, args.calls)
+        small, rows, stream = results[label]
+        print(f"instrumentation {label:<3}  {args.calls * 3 / small:>9,.0f} calls/s "
+              f"({small / (args.calls * 3) * 1e6:.1f} µs/call)   stream {rows:,} rows in {stream:.2f}s")
+        if db.metrics:
+            snapshot = db.get_query_metrics()
+            search = snapshot['methods']['search_vehicle_full']
+            print(f"  search_vehicle_full: {search['calls']:,} calls, p50 {search['total']['p50'] * 1000:.2f} ms, "
+                  f"p99 {search['total']['p99'] * 1000:.2f} ms, {search['rows']:,} rows, ~{search['bytes'] / 1024:,.0f} KB")
+            if args.export:
+                print(f"  exported {db.metrics.export(args.export)} metrics to {args.export}")
+        db.close()
+
+    overhead = results["on"][0] / results["off"][0] - 1
+    stream_overhead = results["on"][2] / results["off"][2] - 1
+    print(f"overhead: {overhead:+.1%} on small calls, {stream_overhead:+.1%} on the streamed report")
+
+
+if __name__ == "__main__":
+    main()
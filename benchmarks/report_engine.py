@@ -0,0 +1,95 @@
+"""
+Aggregate report benchmark: SQL GROUP BY (models/reports.py) vs. loading every
+violation with get_all_violations() and aggregating in Python, plus export
+timings for each available format.
+
+    python benchmarks/report_engine.py                    # seeds 1,000,000 synthetic rows
+    python benchmarks/report_engine.py --rows 0           # current data only
+    python benchmarks/report_engine.py --keep --no-python # keep rows, skip the slow baseline
+"""
+import argparse
+import os
+import tempfile
+import time
+from collections import defaultdict
+
+from synthetic import seed_violations, clear_violations, open_database
+from models.reports import REPORTS, FORMATS, ReportEngine, available_formats
+
+
+def python_reports(violations):
+    """The same four reports computed client-side (all dates, for comparison)"""
+    by_type = defaultdict(lambda: [0, 0.0, 0.0])
+    by_enforcer_day = defaultdict(lambda: [0, 0.0])
+    by_month = defaultdict(lambda: [0, 0, 0.0, 0.0])
+    by_plate = defaultdict(int)
+    for v in violations:
+        fine = float(v['fine_amount'] or 0)
+        paid = v['status'] == 'paid'
+        e = by_enforcer_day[(v['violation_date'].date(), v['enforcer_id'])]
+        e[0] += 1
+        e[1] += fine
+        by_plate[v['plate_number']] += 1
+        if v['status'] == 'cancelled':
+            continue
+        t = by_type[v['violation_name']]
+        t[0] += 1
+        t[1] += fine
+        t[2] += fine if paid else 0
+        m = by_month[(v['violation_date'].year, v['violation_date'].month)]
+        m[0] += 1
+        m[1] += 1 if paid else 0
+        m[2] += fine
+        m[3] += fine if paid else 0
+    top_plates = sorted(((n, p) for p, n in by_plate.items() if n >= 2), reverse=True)[:100]
+    return by_type, by_enforcer_day, by_month, top_plates
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="synthetic violations to add first")
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic rows afterwards")
+    parser.add_argument("--no-python", action="store_true", help="skip the get_all_violations() baseline")
+    args = parser.parse_args()
+
+    db = open_database()
+    engine = ReportEngine(db)
+    if args.rows:
+        seed_violations(db, args.rows)
+
+    try:
+        if not args.no_python:
+            violations, load_ms = timed(db.get_all_violations)
+            _, loop_ms = timed(lambda: python_reports(violations))
+            print(f"python baseline: load {len(violations):,} rows {load_ms:,.0f} ms, aggregate {loop_ms:,.0f} ms")
+            del violations
+
+        print(f"\n{'report (SQL GROUP BY)':<30} {'rows':>8} {'ms':>10}")
+        for name in REPORTS:
+            (_, rows), ms = timed(lambda: engine.run(name))
+            print(f"{name:<30} {len(rows):>8,} {ms:>10,.0f}")
+
+        formats = available_formats()
+        print(f"\n{'export (run + write)':<30} " + " ".join(f"{FORMATS[f][0] + ' ms':>14}" for f in formats))
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in REPORTS:
+                cells = []
+                for fmt in formats:
+                    path = os.path.join(tmp, name + FORMATS[fmt][1])
+                    _, ms = timed(lambda: engine.export(name, path, fmt))
+                    cells.append(f"{ms:>14,.0f}")
+                print(f"{name:<30} " + " ".join(cells))
+    finally:
+        if args.rows and not args.keep:
+            clear_violations(db)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
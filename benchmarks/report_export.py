@@ -0,0 +1,87 @@
+"""
+CSV report export: load-everything-then-filter vs. iter_violations_report().
+
+For each date range, writes the report to a temporary file both ways and reports
+wall time and peak Python heap (tracemalloc). The streaming path should stay flat
+as the range grows; the old path grows with the whole violations table.
+
+    python benchmarks/report_export.py --rows 500000
+    python benchmarks/report_export.py --rows 500000 --keep --batch-size 2000
+"""
+import argparse
+import csv
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from synthetic import seed_violations, clear_violations, open_database
+
+RANGES = [("1 day", 0), ("30 days", 30), ("1 year", 365), ("2 years", 730)]
+
+
+def write_rows(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        count = 0
+        for row in rows:
+            writer.writerow([row.get("citation_number", ""), row["plate_number"], row.get("violation_name", ""),
+                             row["location"], row["violation_date"], row["fine_amount"], row["status"],
+                             row.get("enforcer_name", "")])
+            count += 1
+    return count
+
+
+def export_loaded(db, path, start, end):
+    """The previous GenerateReportsDialog.export_csv() path"""
+    filtered = [v for v in db.get_all_violations() if start <= str(v["violation_date"]).split()[0] <= end]
+    return write_rows(path, filtered)
+
+
+def export_streamed(db, path, start, end, batch_size):
+    return write_rows(path, db.iter_violations_report(start, end, None, batch_size=batch_size))
+
+
+def measure(fn):
+    tracemalloc.start()
+    started = time.perf_counter()
+    count = fn()
+    elapsed = (time.perf_counter() - started) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=0, help="synthetic violations to add first")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic rows afterwards")
+    args = parser.parse_args()
+
+    db = open_database()
+    if args.rows:
+        seed_violations(db, args.rows)
+
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        today = date.today()
+        print(f"{'range':<10} {'rows':>9} | {'loaded ms':>10} {'peak MB':>8} | {'streamed ms':>11} {'peak MB':>8}")
+        for label, days in RANGES:
+            start, end = str(today - timedelta(days=days)), str(today)
+            rows, old_ms, old_mb = measure(lambda: export_loaded(db, path, start, end))
+            streamed, new_ms, new_mb = measure(lambda: export_streamed(db, path, start, end, args.batch_size))
+            if rows != streamed:
+                print(f"  ⚠ row counts differ for {label}: {rows} vs {streamed}")
+            print(f"{label:<10} {streamed:>9,} | {old_ms:>10.0f} {old_mb:>8.1f} | {new_ms:>11.0f} {new_mb:>8.1f}")
+    finally:
+        os.remove(path)
+        if args.rows and not args.keep:
+            clear_violations(db)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Cold-start benchmark: time until the login window is ready.
+
+Measures, each in a fresh process so imports and connections start cold:
+  db-check      DatabaseManager(auto_bootstrap=False) + needs_bootstrap()
+  db-bootstrap  DatabaseManager() with bootstrap(force=True), i.e. the old startup path
+  login-window  import main + MainApp() until the login screen is built (offscreen Qt)
+
+    python benchmarks/startup.py --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    "db-check": """
+from models.database import DatabaseManager
+db = DatabaseManager(auto_bootstrap=False)
+db.needs_bootstrap()
+""",
+    "db-bootstrap": """
+from models.database import DatabaseManager
+db = DatabaseManager(auto_bootstrap=False)
+db.bootstrap(force=True)
+""",
+    "login-window": """
+from PyQt6.QtWidgets import QApplication
+app = QApplication([])
+import main
+window = main.MainApp()
+app.processEvents()
+""",
+}
+
+# Wraps each scenario so the child reports its own wall time (excludes interpreter start-up)
+HARNESS = """
+import time, sys, io, contextlib
+_t0 = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+{body}
+sys.stderr.write(f"ELAPSED {{(time.perf_counter() - _t0) * 1000:.1f}}\\n")
+"""
+
+
+def run_scenario(name, runs):
+    body = "\n".join("    " + line for line in SCENARIOS[name].strip().splitlines())
+    code = HARNESS.format(body=body)
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                              capture_output=True, text=True)
+        total = (time.perf_counter() - started) * 1000
+        marker = [line for line in proc.stderr.splitlines() if line.startswith("ELAPSED ")]
+        if proc.returncode != 0 or not marker:
+            print(f"  ✗ {name} failed:\n{proc.stderr.strip()}")
+            return None
+        timings.append((float(marker[-1].split()[1]), total))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("scenarios", nargs="*", help=f"subset of: {', '.join(SCENARIOS)}")
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    print(f"{'scenario':<14} {'median ms':>10} {'min ms':>10} {'process ms':>11}")
+    for name in args.scenarios or SCENARIOS:
+        timings = run_scenario(name, args.runs)
+        if not timings:
+            continue
+        inner = [t[0] for t in timings]
+        outer = [t[1] for t in timings]
+        print(f"{name:<14} {statistics.median(inner):>10.1f} {min(inner):>10.1f} {statistics.median(outer):>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
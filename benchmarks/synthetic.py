@@ -0,0 +1,92 @@
+"""
+Synthetic violation rows for benchmarks.
+
+Rows are tagged with a BENCH- citation prefix so they can be removed again with
+clear_violations(). They bypass the dashboard counter bookkeeping, so call
+DatabaseManager.reconcile_dashboard_counters() if you keep them around.
+
+Benchmarks open the database through open_database(), so they run against the
+embedded SQLite engine with NEXUS_DB_BACKEND=sqlite (see models/backends.py).
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Allow `python benchmarks/<script>.py` from the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CITATION_PREFIX = "BENCH-"
+STATUSES = ["pending", "pending", "paid", "paid", "paid", "overdue"]
+
+
+def open_database(**kwargs):
+    """DatabaseManager on the backend picked by NEXUS_DB_BACKEND (MySQL by default)"""
+    from models.backends import backend_from_env
+    from models.database import DatabaseManager
+    return DatabaseManager(backend=backend_from_env(), **kwargs)
+
+
+def seed_violations(db, count, chunk_size=5000, plates=2000, days=730, seed=42, statuses=STATUSES):
+    """Insert `count` synthetic violations spread over `plates` plates and the last `days` days"""
+    rng = random.Random(seed)
+    conn = db.connect()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT type_id, fine_amount FROM violation_types")
+        types = cursor.fetchall()
+        cursor.execute("SELECT user_id FROM users WHERE role='enforcer'")
+        enforcers = [row[0] for row in cursor.fetchall()]
+        if not types or not enforcers:
+            raise RuntimeError("Need at least one violation type and one enforcer (run the app once to seed)")
+
+        cursor.execute("SELECT COUNT(*) FROM violations WHERE citation_number LIKE %s", (CITATION_PREFIX + "%",))
+        offset = cursor.fetchone()[0]
+
+        now = datetime.now()
+        sql = """
+            INSERT INTO violations (citation_number, plate_number, violation_type_id, enforcer_id,
+                                    location, violation_date, fine_amount, status)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """
+        started = time.perf_counter()
+        for start in range(0, count, chunk_size):
+            batch = []
+            for i in range(start, min(start + chunk_size, count)):
+                type_id, fine = rng.choice(types)
+                batch.append((
+                    f"{CITATION_PREFIX}{offset + i:09d}",
+                    f"BN {rng.randrange(plates):04d}",
+                    type_id,
+                    rng.choice(enforcers),
+                    "Benchmark Ave",
+                    now - timedelta(seconds=rng.randrange(days * 86400)),
+                    fine,
+                    rng.choice(statuses),
+                ))
+            cursor.executemany(sql, batch)
+            conn.commit()
+        elapsed = time.perf_counter() - started
+        print(f"  ✓ Seeded {count:,} synthetic violations in {elapsed:.1f}s")
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def clear_violations(db):
+    conn = db.connect()
+    cursor = conn.cursor()
+    try:
+        # Payments made by benchmarks reference the synthetic rows
+        cursor.execute("""
+            DELETE FROM payments WHERE violation_id IN (
+                SELECT violation_id FROM violations WHERE citation_number LIKE %s
+            )
+        """, (CITATION_PREFIX + "%",))
+        cursor.execute("DELETE FROM violations WHERE citation_number LIKE %s", (CITATION_PREFIX + "%",))
+        conn.commit()
+        print(f"  ✓ Removed {cursor.rowcount:,} synthetic violations")
+    finally:
+        cursor.close()
+        conn.close()
@@ -0,0 +1,150 @@
+"""
+UI benchmark: time-to-first-paint for the main windows/dialogs and refresh time
+for the per-row tables. Runs offscreen against an in-memory stand-in for
+DatabaseManager, so no MySQL server is needed.
+
+    python benchmarks/ui_paint.py --rows 500 --repeat 5
+
+To compare before/after a styling change, run the same script on both trees
+(it works whether or not views/theme.py exists).
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtWidgets import QApplication
+
+try:
+    from views.theme import apply_theme
+except ImportError:  # tree without the shared theme
+    apply_theme = None
+
+
+class SampleData:
+    """Just enough of the DatabaseManager API to build the windows with `rows` records"""
+
+    def __init__(self, rows):
+        today = date.today()
+        self.vehicles = [{
+            "vehicle_id": i, "plate_number": f"ABC {i:04d}", "owner_id": 3, "owner_name": f"Owner {i}",
+            "make": "Toyota", "model": "Vios", "year": 2022, "color": "White",
+            "expiry_date": today + timedelta(days=(i % 90) - 30),
+            "status": ("expired", "expiring", "active")[i % 3], "email": "", "phone": "",
+        } for i in range(rows)]
+        self.users = [{
+            "user_id": i, "full_name": f"User {i}", "role": "citizen",
+            "department": None, "office_location": "Davao District Office",
+        } for i in range(rows)]
+        self.types = [{"type_id": 1, "violation_name": "No Helmet", "fine_amount": 1500.0, "penalty_points": 2}]
+
+    def get_all_violation_types(self, refresh=False): return self.types
+    def get_all_users(self, role=None): return self.users
+    def get_all_vehicles(self): return self.vehicles
+    def get_vehicles_by_owner(self, owner_id): return self.vehicles
+    def get_violations_by_owner(self, owner_id, status=None, limit=None, offset=0): return []
+    def get_violations_page(self, after=None, limit=50, filters=None): return []
+    def page_cursor(self, rows): return None
+    def get_expiration_overview(self, days=30, limit=200):
+        expired = [dict(v, days=(date.today() - v["expiry_date"]).days) for v in self.vehicles if v["status"] == "expired"]
+        expiring = [dict(v, days=(v["expiry_date"] - date.today()).days) for v in self.vehicles if v["status"] == "expiring"]
+        return {"expired": expired[:limit], "expired_total": len(expired),
+                "expiring": expiring[:limit], "expiring_total": len(expiring)}
+    def get_dashboard_stats(self):
+        return {"users": len(self.users), "enforcers": 1, "vehicles": len(self.vehicles),
+                "violations": 0, "pending_violations": 0, "fines": 0.0}
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), min(samples)
+
+
+def first_paint(app, factory):
+    def run():
+        widget = factory()
+        widget.resize(1300, 750)
+        widget.show()
+        app.processEvents()
+        widget.grab()  # forces a full render
+        widget.close()
+        widget.deleteLater()
+        app.processEvents()
+    return run
+
+
+def table_refresh(app, widget, populate, table):
+    def run():
+        populate()
+        app.processEvents()
+        table.grab()
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500, help="rows per table / vehicle cards")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    if apply_theme:
+        apply_theme(app)
+    data = SampleData(args.rows)
+    citizen = {"user_id": 3, "full_name": "Juan Dela Cruz", "username": "juandelacruz",
+               "email": "", "phone": "", "office_location": "Davao District Office"}
+
+    from views.ui_login import LoginWindow
+    from views.ui_admin import AdminDashboard
+    from views.ui_enforcer import EnforcerDashboard
+    from views.ui_citizen import CitizenDashboard
+    from controllers.admin_dialogs import AddUserDialog, AddVehicleDialog
+    from controllers.enforcer_dialogs import RecordViolationDialog
+
+    print(f"theme: {'shared app stylesheet' if apply_theme else 'per-widget stylesheets'}, rows: {args.rows}")
+    print(f"{'first paint':<32} {'median ms':>10} {'min ms':>10}")
+    windows = [
+        ("LoginWindow", LoginWindow),
+        ("AdminDashboard", AdminDashboard),
+        ("EnforcerDashboard", EnforcerDashboard),
+        ("CitizenDashboard", lambda: CitizenDashboard(citizen, None)),
+        ("AddUserDialog", lambda: AddUserDialog(data)),
+        ("AddVehicleDialog", lambda: AddVehicleDialog(data)),
+        ("RecordViolationDialog", lambda: RecordViolationDialog(data, 2)),
+    ]
+    for name, factory in windows:
+        median, best = timed(first_paint(app, factory), args.repeat)
+        print(f"{name:<32} {median:>10.1f} {best:>10.1f}")
+
+    admin = AdminDashboard()
+    admin.resize(1300, 750)
+    admin.show()
+    citizen_dash = CitizenDashboard(citizen, None)
+    citizen_dash.resize(1300, 750)
+    citizen_dash.show()
+    app.processEvents()
+
+    print(f"\n{'table refresh':<32} {'median ms':>10} {'min ms':>10}")
+    refreshes = [
+        ("admin vehicle table", lambda: admin.populate_vehicle_table(data.vehicles), admin.vehicle_table),
+        ("admin user table", lambda: admin.populate_user_table(data.users), admin.user_table),
+        ("admin expiration tables", lambda: admin.populate_expiration_tables(data.get_expiration_overview(limit=args.rows)),
+         admin.expired_vehicles_table),
+        ("citizen vehicle cards", lambda: citizen_dash.render_vehicle_cards(data.vehicles), citizen_dash),
+    ]
+    for name, populate, table in refreshes:
+        median, best = timed(table_refresh(app, admin, populate, table), args.repeat)
+        print(f"{name:<32} {median:>10.1f} {best:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,15 @@ from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                              QPushButton, QLineEdit, QComboBox, QMessageBox, 
                              QFrame, QTextEdit, QDateEdit, QTableWidget,
                              QTableWidgetItem, QSpinBox, QDoubleSpinBox,
-                             QFormLayout, QHeaderView, QFileDialog)
-from PyQt6.QtCore import Qt, QDate
+                             QFormLayout, QHeaderView, QFileDialog, QProgressDialog)
+from PyQt6.QtCore import Qt, QDate, QTimer
 import csv
+import os
 from PyQt6.QtGui import QFont
 from datetime import datetime
 
+from models.reports import REPORTS, FORMATS, ReportEngine, available_formats
+
 
 # ==================== ADD USER DIALOG ====================
 class AddUserDialog(QDialog):
@@ -18,7 +21,7 @@ class AddUserDialog(QDialog):
         self.setWindowTitle("Edit User" if user_data else "Add New User")
         self.setFixedSize(520, 680)
         self.setModal(True)
-        self.setStyleSheet("QDialog { background-color: #f8fafc; }")
+        self.setObjectName("FormDialog")
         self.init_ui()
     
     def init_ui(self):
@@ -49,13 +52,7 @@ class AddUserDialog(QDialog):
         
         # Form Container with white background
         form_frame = QFrame()
-        form_frame.setStyleSheet("""
-            QFrame { 
-                background-color: white; 
-                border-radius: 12px; 
-                border: 1px solid #e2e8f0;
-            }
-        """)
+        form_frame.setObjectName("FormCard")
         form_layout = QVBoxLayout()
         form_layout.setContentsMargins(20, 20, 20, 20)
         form_layout.setSpacing(12)
@@ -73,23 +70,23 @@ class AddUserDialog(QDialog):
         username_col = QVBoxLayout()
         username_col.setSpacing(5)
         username_lbl = QLabel("Username")
-        username_lbl.setStyleSheet("color: #64748b; font-size: 11px; font-weight: bold; background: transparent; border: none;")
+        username_lbl.setObjectName("FieldLabel")
         self.username_input = QLineEdit()
         self.username_input.setPlaceholderText("Enter username")
         self.username_input.setFixedHeight(42)
-        self.username_input.setStyleSheet(self._input_style())
+        self.username_input.setObjectName("FormInput")
         username_col.addWidget(username_lbl)
         username_col.addWidget(self.username_input)
         
         password_col = QVBoxLayout()
         password_col.setSpacing(5)
         password_lbl = QLabel("Password")
-        password_lbl.setStyleSheet("color: #64748b; font-size: 11px; font-weight: bold; background: transparent; border: none;")
+        password_lbl.setObjectName("FieldLabel")
         self.password_input = QLineEdit()
         self.password_input.setPlaceholderText("Enter password")
         self.password_input.setEchoMode(QLineEdit.EchoMode.Password)
         self.password_input.setFixedHeight(42)
-        self.password_input.setStyleSheet(self._input_style())
+        self.password_input.setObjectName("FormInput")
         password_col.addWidget(password_lbl)
         password_col.addWidget(self.password_input)
         
@@ -107,11 +104,11 @@ class AddUserDialog(QDialog):
         fullname_col = QVBoxLayout()
         fullname_col.setSpacing(5)
         fullname_lbl = QLabel("Full Name")
-        fullname_lbl.setStyleSheet("color: #64748b; font-size: 11px; font-weight: bold; background: transparent; border: none;")
+        fullname_lbl.setObjectName("FieldLabel")
         self.fullname_input = QLineEdit()
         self.fullname_input.setPlaceholderText("Enter full name")
         self.fullname_input.setFixedHeight(42)
-        self.fullname_input.setStyleSheet(self._input_style())
+        self.fullname_input.setObjectName("FormInput")
         fullname_col.addWidget(fullname_lbl)
         fullname_col.addWidget(self.fullname_input)
         form_layout.addLayout(fullname_col)
@@ -123,22 +120,22 @@ class AddUserDialog(QDialog):
         email_col = QVBoxLayout()
         email_col.setSpacing(5)
         email_lbl = QLabel("Email Address")
-        email_lbl.setStyleSheet("color: #64748b; font-size: 11px; font-weight: bold; background: transparent; border: none;")
+        email_lbl.setObjectName("FieldLabel")
         self.email_input = QLineEdit()
         self.email_input.setPlaceholderText("example@email.com")
         self.email_input.setFixedHeight(42)
-        self.email_input.setStyleSheet(self._input_style())
+        self.email_input.setObjectName("FormInput")
         email_col.addWidget(email_lbl)
         email_col.addWidget(self.email_input)
         
         phone_col = QVBoxLayout()
         phone_col.setSpacing(5)
         phone_lbl = QLabel("Phone Number")
-        phone_lbl.setStyleSheet("color: #64748b; font-size: 11px; font-weight: bold; background: transparent; border: none;")
+        phone_lbl.setObjectName("FieldLabel")
         self.phone_input = QLineEdit()
         self.phone_input.setPlaceholderText("09XX-XXX-XXXX")
         self.phone_input.setFixedHeight(42)
-        self.phone_input.setStyleSheet(self._input_style())
+        self.phone_input.setObjectName("FormInput")
         phone_col.addWidget(phone_lbl)
         phone_col.addWidget(self.phone_input)
         
@@ -159,7 +156,7 @@ class AddUserDialog(QDialog):
         role_col = QVBoxLayout()
         role_col.setSpacing(5)
         role_lbl = QLabel("Role")
-        role_lbl.setStyleSheet("color: #64748b; font-size: 11px; font-weight: bold; background: transparent; border: none;")
+        role_lbl.setObjectName("FieldLabel")
         self.role_combo = QComboBox()
         self.role_combo.addItems(["admin", "enforcer", "citizen"])
         self.role_combo.setFixedHeight(42)
@@ -170,11 +167,11 @@ class AddUserDialog(QDialog):
         dept_col = QVBoxLayout()
         dept_col.setSpacing(5)
         dept_lbl = QLabel("Department")
-        dept_lbl.setStyleSheet("color: #64748b; font-size: 11px; font-weight: bold; background: transparent; border: none;")
+        dept_lbl.setObjectName("FieldLabel")
         self.department_input = QLineEdit()
         self.department_input.setPlaceholderText("Optional")
         self.department_input.setFixedHeight(42)
-        self.department_input.setStyleSheet(self._input_style())
+        self.department_input.setObjectName("FormInput")
         dept_col.addWidget(dept_lbl)
         dept_col.addWidget(self.department_input)
         
@@ -186,12 +183,12 @@ class AddUserDialog(QDialog):
         office_col = QVBoxLayout()
         office_col.setSpacing(5)
         office_lbl = QLabel("Office Location")
-        office_lbl.setStyleSheet("color: #64748b; font-size: 11px; font-weight: bold; background: transparent; border: none;")
+        office_lbl.setObjectName("FieldLabel")
         self.office_input = QLineEdit()
         self.office_input.setPlaceholderText("Davao District Office")
         self.office_input.setText("Davao District Office")
         self.office_input.setFixedHeight(42)
-        self.office_input.setStyleSheet(self._input_style())
+        self.office_input.setObjectName("FormInput")
         office_col.addWidget(office_lbl)
         office_col.addWidget(self.office_input)
         form_layout.addLayout(office_col)
@@ -253,21 +250,6 @@ class AddUserDialog(QDialog):
             self.office_input.setText(self.user_data.get('office_location', ''))
             self.password_input.setPlaceholderText("Leave blank to keep current")
     
-    def _input_style(self):
-        return """
-            QLineEdit {
-                background-color: #f8fafc;
-                border: 2px solid #e2e8f0;
-                border-radius: 8px;
-                padding: 8px 12px;
-                font-size: 13px;
-            }
-            QLineEdit:focus { 
-                border: 2px solid #1e40af; 
-                background-color: white;
-            }
-        """
-    
     def _combo_style(self):
         return """
             QComboBox {
@@ -555,7 +537,7 @@ class AddVehicleDialog(QDialog):
         self.setWindowTitle("Edit Vehicle" if vehicle_data else "Register New Vehicle")
         self.setFixedSize(560, 720)
         self.setModal(True)
-        self.setStyleSheet("QDialog { background-color: #f8fafc; }")
+        self.setObjectName("FormDialog")
         self.init_ui()
     
     def init_ui(self):
@@ -586,13 +568,7 @@ class AddVehicleDialog(QDialog):
         
         # Form Container
         form_frame = QFrame()
-        form_frame.setStyleSheet("""
-            QFrame { 
-                background-color: white; 
-                border-radius: 12px; 
-                border: 1px solid #e2e8f0;
-            }
-        """)
+        form_frame.setObjectName("FormCard")
         form_layout = QVBoxLayout()
         form_layout.setContentsMargins(20, 20, 20, 20)
         form_layout.setSpacing(10)
@@ -606,7 +582,7 @@ class AddVehicleDialog(QDialog):
         owner_col = QVBoxLayout()
         owner_col.setSpacing(5)
         owner_lbl = QLabel("Select Owner")
-        owner_lbl.setStyleSheet("color: #64748b; font-size: 11px; font-weight: bold; background: transparent; border: none;")
+        owner_lbl.setObjectName("FieldLabel")
         self.owner_combo = QComboBox()
         self.owner_combo.setFixedHeight(42)
         self.owner_combo.setStyleSheet(self._combo_style())
@@ -624,11 +600,11 @@ class AddVehicleDialog(QDialog):
         plate_col = QVBoxLayout()
         plate_col.setSpacing(5)
         plate_lbl = QLabel("Plate Number")
-        plate_lbl.setStyleSheet("color: #64748b; font-size: 11px; font-weight: bold; background: transparent; border: none;")
+        plate_lbl.setObjectName("FieldLabel")
         self.plate_input = QLineEdit()
         self.plate_input.setPlaceholderText("e.g., ABC 1234")
         self.plate_input.setFixedHeight(42)
-        self.plate_input.setStyleSheet(self._input_style())
+        self.plate_input.setObjectName("FormInput")
         plate_col.addWidget(plate_lbl)
         plate_col.addWidget(self.plate_input)
         form_layout.addLayout(plate_col)
@@ -640,22 +616,22 @@ class AddVehicleDialog(QDialog):
         make_col = QVBoxLayout()
         make_col.setSpacing(5)
         make_lbl = QLabel("Make")
-        make_lbl.setStyleSheet("color: #64748b; font-size: 11px; font-weight: bold; background: transparent; border: none;")
+        make_lbl.setObjectName("FieldLabel")
         self.make_input = QLineEdit()
         self.make_input.setPlaceholderText("e.g., Toyota")
         self.make_input.setFixedHeight(42)
-        self.make_input.setStyleSheet(self._input_style())
+        self.make_input.setObjectName("FormInput")
         make_col.addWidget(make_lbl)
         make_col.addWidget(self.make_input)
         
         model_col = QVBoxLayout()
         model_col.setSpacing(5)
         model_lbl = QLabel("Model")
-        model_lbl.setStyleSheet("color: #64748b; font-size: 11px; font-weight: bold; background: transparent; border: none;")
+        model_lbl.setObjectName("FieldLabel")
         self.model_input = QLineEdit()
         self.model_input.setPlaceholderText("e.g., Vios")
         self.model_input.setFixedHeight(42)
-        self.model_input.setStyleSheet(self._input_style())
+        self.model_input.setObjectName("FormInput")
         model_col.addWidget(model_lbl)
         model_col.addWidget(self.model_input)
         
@@ -670,7 +646,7 @@ class AddVehicleDialog(QDialog):
         year_col = QVBoxLayout()
         year_col.setSpacing(5)
         year_lbl = QLabel("Year")
-        year_lbl.setStyleSheet("color: #64748b; font-size: 11px; font-weight: bold; background: transparent; border: none;")
+        year_lbl.setObjectName("FieldLabel")
         self.year_input = QSpinBox()
         self.year_input.setRange(1990, 2030)
         self.year_input.setValue(2024)
@@ -682,11 +658,11 @@ class AddVehicleDialog(QDialog):
         color_col = QVBoxLayout()
         color_col.setSpacing(5)
         color_lbl = QLabel("Color")
-        color_lbl.setStyleSheet("color: #64748b; font-size: 11px; font-weight: bold; background: transparent; border: none;")
+        color_lbl.setObjectName("FieldLabel")
         self.color_input = QLineEdit()
         self.color_input.setPlaceholderText("e.g., White")
         self.color_input.setFixedHeight(42)
-        self.color_input.setStyleSheet(self._input_style())
+        self.color_input.setObjectName("FormInput")
         color_col.addWidget(color_lbl)
         color_col.addWidget(self.color_input)
         
@@ -707,22 +683,22 @@ class AddVehicleDialog(QDialog):
         chassis_col = QVBoxLayout()
         chassis_col.setSpacing(5)
         chassis_lbl = QLabel("Chassis Number")
-        chassis_lbl.setStyleSheet("color: #64748b; font-size: 11px; font-weight: bold; background: transparent; border: none;")
+        chassis_lbl.setObjectName("FieldLabel")
         self.chassis_input = QLineEdit()
         self.chassis_input.setPlaceholderText("Vehicle chassis no.")
         self.chassis_input.setFixedHeight(42)
-        self.chassis_input.setStyleSheet(self._input_style())
+        self.chassis_input.setObjectName("FormInput")
         chassis_col.addWidget(chassis_lbl)
         chassis_col.addWidget(self.chassis_input)
         
         or_cr_col = QVBoxLayout()
         or_cr_col.setSpacing(5)
         or_cr_lbl = QLabel("OR/CR Number")
-        or_cr_lbl.setStyleSheet("color: #64748b; font-size: 11px; font-weight: bold; background: transparent; border: none;")
+        or_cr_lbl.setObjectName("FieldLabel")
         self.or_cr_input = QLineEdit()
         self.or_cr_input.setPlaceholderText("OR-2024-XXXXXX")
         self.or_cr_input.setFixedHeight(42)
-        self.or_cr_input.setStyleSheet(self._input_style())
+        self.or_cr_input.setObjectName("FormInput")
         or_cr_col.addWidget(or_cr_lbl)
         or_cr_col.addWidget(self.or_cr_input)
         
@@ -737,7 +713,7 @@ class AddVehicleDialog(QDialog):
         reg_date_col = QVBoxLayout()
         reg_date_col.setSpacing(5)
         reg_date_lbl = QLabel("Registration Date")
-        reg_date_lbl.setStyleSheet("color: #64748b; font-size: 11px; font-weight: bold; background: transparent; border: none;")
+        reg_date_lbl.setObjectName("FieldLabel")
         self.reg_date = QDateEdit()
         self.reg_date.setDate(QDate.currentDate())
         self.reg_date.setCalendarPopup(True)
@@ -749,7 +725,7 @@ class AddVehicleDialog(QDialog):
         exp_date_col = QVBoxLayout()
         exp_date_col.setSpacing(5)
         exp_date_lbl = QLabel("Expiry Date")
-        exp_date_lbl.setStyleSheet("color: #64748b; font-size: 11px; font-weight: bold; background: transparent; border: none;")
+        exp_date_lbl.setObjectName("FieldLabel")
         self.exp_date = QDateEdit()
         self.exp_date.setDate(QDate.currentDate().addYears(3))
         self.exp_date.setCalendarPopup(True)
@@ -810,18 +786,6 @@ class AddVehicleDialog(QDialog):
         
         self.setLayout(layout)
     
-    def _input_style(self):
-        return """
-            QLineEdit {
-                background-color: #f8fafc;
-                border: 2px solid #e2e8f0;
-                border-radius: 8px;
-                padding: 8px 12px;
-                font-size: 13px;
-            }
-            QLineEdit:focus { border: 2px solid #1e40af; background-color: white; }
-        """
-    
     def _combo_style(self):
         return """
             QComboBox {
@@ -941,7 +905,7 @@ class UpdateStatusDialog(QDialog):
         self.db_manager = db_manager
         self.setWindowTitle("Update Violation Status")
         self.setFixedSize(450, 380)
-        self.setStyleSheet("QDialog { background-color: #f8fafc; }")
+        self.setObjectName("FormDialog")
         self.init_ui()
         
     def init_ui(self):
@@ -976,13 +940,7 @@ class UpdateStatusDialog(QDialog):
         
         # Form Container
         form_frame = QFrame()
-        form_frame.setStyleSheet("""
-            QFrame { 
-                background-color: white; 
-                border-radius: 12px; 
-                border: 1px solid #e2e8f0;
-            }
-        """)
+        form_frame.setObjectName("FormCard")
         form_layout = QVBoxLayout()
         form_layout.setContentsMargins(20, 20, 20, 20)
         form_layout.setSpacing(15)
@@ -991,7 +949,7 @@ class UpdateStatusDialog(QDialog):
         id_col = QVBoxLayout()
         id_col.setSpacing(5)
         id_lbl = QLabel("Violation ID or Citation Number")
-        id_lbl.setStyleSheet("color: #64748b; font-size: 11px; font-weight: bold; background: transparent; border: none;")
+        id_lbl.setObjectName("FieldLabel")
         self.id_input = QLineEdit()
         self.id_input.setPlaceholderText("Enter ID (e.g., 1) or Citation Number")
         self.id_input.setFixedHeight(45)
@@ -1013,7 +971,7 @@ class UpdateStatusDialog(QDialog):
         status_col = QVBoxLayout()
         status_col.setSpacing(5)
         status_lbl = QLabel("New Status")
-        status_lbl.setStyleSheet("color: #64748b; font-size: 11px; font-weight: bold; background: transparent; border: none;")
+        status_lbl.setObjectName("FieldLabel")
         self.status_combo = QComboBox()
         self.status_combo.addItems(["paid", "pending", "cancelled", "overdue"])
         self.status_combo.setFixedHeight(45)
@@ -1101,7 +1059,7 @@ class AddViolationTypeDialog(QDialog):
         self.db_manager = db_manager
         self.setWindowTitle("Add New Violation Type")
         self.setFixedSize(480, 480)
-        self.setStyleSheet("QDialog { background-color: #f8fafc; }")
+        self.setObjectName("FormDialog")
         self.init_ui()
 
     def init_ui(self):
@@ -1136,13 +1094,7 @@ class AddViolationTypeDialog(QDialog):
         
         # Form Container
         form_frame = QFrame()
-        form_frame.setStyleSheet("""
-            QFrame { 
-                background-color: white; 
-                border-radius: 12px; 
-                border: 1px solid #e2e8f0;
-            }
-        """)
+        form_frame.setObjectName("FormCard")
         form_layout = QVBoxLayout()
         form_layout.setContentsMargins(20, 20, 20, 20)
         form_layout.setSpacing(12)
@@ -1151,11 +1103,12 @@ class AddViolationTypeDialog(QDialog):
         name_col = QVBoxLayout()
         name_col.setSpacing(5)
         name_lbl = QLabel("Violation Name *")
-        name_lbl.setStyleSheet("color: #64748b; font-size: 11px; font-weight: bold; background: transparent; border: none;")
+        name_lbl.setObjectName("FieldLabel")
         self.name_input = QLineEdit()
         self.name_input.setPlaceholderText("e.g., Over Speeding")
         self.name_input.setFixedHeight(42)
-        self.name_input.setStyleSheet(self._input_style())
+        self.name_input.setObjectName("FormInput")
+        self.name_input.setProperty("accent", "amber")
         name_col.addWidget(name_lbl)
         name_col.addWidget(self.name_input)
         form_layout.addLayout(name_col)
@@ -1167,18 +1120,19 @@ class AddViolationTypeDialog(QDialog):
         fine_col = QVBoxLayout()
         fine_col.setSpacing(5)
         fine_lbl = QLabel("Fine Amount (₱) *")
-        fine_lbl.setStyleSheet("color: #64748b; font-size: 11px; font-weight: bold; background: transparent; border: none;")
+        fine_lbl.setObjectName("FieldLabel")
         self.fine_input = QLineEdit()
         self.fine_input.setPlaceholderText("e.g., 500.00")
         self.fine_input.setFixedHeight(42)
-        self.fine_input.setStyleSheet(self._input_style())
+        self.fine_input.setObjectName("FormInput")
+        self.fine_input.setProperty("accent", "amber")
         fine_col.addWidget(fine_lbl)
         fine_col.addWidget(self.fine_input)
         
         points_col = QVBoxLayout()
         points_col.setSpacing(5)
         points_lbl = QLabel("Penalty Points")
-        points_lbl.setStyleSheet("color: #64748b; font-size: 11px; font-weight: bold; background: transparent; border: none;")
+        points_lbl.setObjectName("FieldLabel")
         self.points_input = QSpinBox()
         self.points_input.setRange(0, 20)
         self.points_input.setValue(1)
@@ -1204,7 +1158,7 @@ class AddViolationTypeDialog(QDialog):
         desc_col = QVBoxLayout()
         desc_col.setSpacing(5)
         desc_lbl = QLabel("Description")
-        desc_lbl.setStyleSheet("color: #64748b; font-size: 11px; font-weight: bold; background: transparent; border: none;")
+        desc_lbl.setObjectName("FieldLabel")
         self.desc_input = QTextEdit()
         self.desc_input.setPlaceholderText("Brief description of the violation...")
         self.desc_input.setFixedHeight(80)
@@ -1267,18 +1221,6 @@ class AddViolationTypeDialog(QDialog):
         
         self.setLayout(layout)
     
-    def _input_style(self):
-        return """
-            QLineEdit {
-                background-color: #f8fafc;
-                border: 2px solid #e2e8f0;
-                border-radius: 8px;
-                padding: 8px 12px;
-                font-size: 13px;
-            }
-            QLineEdit:focus { border: 2px solid #f59e0b; background-color: white; }
-        """
-
     def save_type(self):
         name = self.name_input.text().strip()
         fine = self.fine_input.text().strip()
@@ -1318,11 +1260,15 @@ class ManageViolationTypesDialog(QDialog):
         header_layout = QHBoxLayout()
         title = QLabel("Existing Violation Types")
         title.setFont(QFont("Arial", 12, QFont.Weight.Bold))
+        refresh_btn = QPushButton("⟳ Refresh")
+        refresh_btn.setToolTip("Reload violation types from the database")
+        refresh_btn.clicked.connect(lambda: self.load_types(refresh=True))
         add_btn = QPushButton("+ Add New Type")
         add_btn.clicked.connect(self.open_add_dialog)
         
         header_layout.addWidget(title)
         header_layout.addStretch()
+        header_layout.addWidget(refresh_btn)
         header_layout.addWidget(add_btn)
         layout.addLayout(header_layout)
         
@@ -1342,8 +1288,8 @@ class ManageViolationTypesDialog(QDialog):
         self.setLayout(layout)
 
 
-    def load_types(self):
-        types = self.db_manager.get_all_violation_types()
+    def load_types(self, refresh=False):
+        types = self.db_manager.get_all_violation_types(refresh=refresh)
         self.table.setRowCount(len(types))
         for row, t in enumerate(types):
             self.table.setItem(row, 0, QTableWidgetItem(t['violation_name']))
@@ -1357,11 +1303,12 @@ class ManageViolationTypesDialog(QDialog):
             self.load_types()
 
 class GenerateReportsDialog(QDialog):
-    def __init__(self, db_manager, parent=None):
+    def __init__(self, db_manager, parent=None, executor=None):
         super().__init__(parent)
         self.db_manager = db_manager
+        self.executor = executor
         self.setWindowTitle("Generate Reports")
-        self.setFixedSize(400, 300)
+        self.setFixedSize(420, 480)
         self.init_ui()
 
     def init_ui(self):
@@ -1398,53 +1345,272 @@ class GenerateReportsDialog(QDialog):
         export_btn.setStyleSheet("background-color: #16a34a; color: white; font-weight: bold; border-radius: 5px;")
         export_btn.clicked.connect(self.export_csv)
         layout.addWidget(export_btn)
-        
+
+        # Summary reports (aggregated in SQL, date range only)
+        separator = QFrame()
+        separator.setFrameShape(QFrame.Shape.HLine)
+        layout.addWidget(separator)
+
+        layout.addWidget(QLabel("Summary Report:"))
+        self.report_combo = QComboBox()
+        for name, spec in REPORTS.items():
+            self.report_combo.addItem(spec["title"], name)
+        layout.addWidget(self.report_combo)
+
+        layout.addWidget(QLabel("Format:"))
+        self.format_combo = QComboBox()
+        for fmt in available_formats():
+            self.format_combo.addItem(FORMATS[fmt][0], fmt)
+        layout.addWidget(self.format_combo)
+
+        self.summary_btn = QPushButton("📊 Export Summary")
+        self.summary_btn.setFixedHeight(45)
+        self.summary_btn.setStyleSheet("background-color: #1e40af; color: white; font-weight: bold; border-radius: 5px;")
+        self.summary_btn.clicked.connect(self.export_summary)
+        layout.addWidget(self.summary_btn)
+
         self.setLayout(layout)
 
     def export_csv(self):
         start = self.start_date.date().toString("yyyy-MM-dd")
         end = self.end_date.date().toString("yyyy-MM-dd")
         status = self.status_combo.currentText().lower()
-        
-        # Fetch data (we might need a new method in db_manager or filter here)
-        # For simplicity, let's fetch all and filter here
-        violations = self.db_manager.get_all_violations()
-        
-        filtered = []
-        for v in violations:
-            v_date = str(v['violation_date']).split()[0]
-            if start <= v_date <= end:
-                if status == "all" or v['status'].lower() == status:
-                    filtered.append(v)
-        
-        if not filtered:
+
+        # Only the row count is fetched up front; the rows themselves are streamed below
+        total = self.db_manager.count_violations_report(start, end, status)
+        if not total:
             QMessageBox.information(self, "No Data", "No records found for the selected criteria.")
             return
 
         filename, _ = QFileDialog.getSaveFileName(self, "Save Report", "", "CSV Files (*.csv)")
-        if filename:
+        if not filename:
+            return
+
+        progress = QProgressDialog(f"Exporting {total:,} violations...", "Cancel", 0, total, self)
+        progress.setWindowTitle("Export Report")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(300)
+
+        rows = self.db_manager.iter_violations_report(start, end, status)
+        written = 0
+        cancelled = False
+        # Written next to the target and moved into place only once complete, so a failed or
+        # cancelled export never leaves a truncated report (or clobbers an existing one)
+        partial = filename + ".part"
+        try:
+            with open(partial, 'w', newline='') as f:
+                writer = csv.writer(f)
+                # Header
+                writer.writerow(["Citation", "Plate", "Violation", "Location", "Date", "Fine", "Status", "Enforcer"])
+                # Rows
+                for row in rows:
+                    writer.writerow([
+                        row.get('citation_number', ''),
+                        row['plate_number'],
+                        row.get('violation_name', ''),
+                        row['location'],
+                        row['violation_date'],
+                        row['fine_amount'],
+                        row['status'],
+                        row.get('enforcer_name', '')
+                    ])
+                    written += 1
+                    if written % 500 == 0:
+                        # Rows added since the count was taken can push past the maximum
+                        progress.setMaximum(max(total, written))
+                        progress.setValue(written)  # also processes events for the Cancel button
+                        if progress.wasCanceled():
+                            cancelled = True
+                            break
+            if not cancelled:
+                os.replace(partial, filename)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to export report: {e}")
+            return
+        finally:
+            rows.close()
+            progress.close()
             try:
-                with open(filename, 'w', newline='') as f:
-                    writer = csv.writer(f)
-                    # Header
-                    writer.writerow(["Citation", "Plate", "Violation", "Location", "Date", "Fine", "Status", "Enforcer"])
-                    # Rows
-                    for row in filtered:
-                        writer.writerow([
-                            row.get('citation_number', ''),
-                            row['plate_number'],
-                            row.get('violation_name', ''),
-                            row['location'],
-                            row['violation_date'],
-                            row['fine_amount'],
-                            row['status'],
-                            row.get('enforcer_name', '')
-                        ])
-                QMessageBox.information(self, "Success", f"Report saved to {filename}")
-                self.accept()
+                os.remove(partial)
+            except OSError:
+                pass
+
+        if cancelled:
+            QMessageBox.information(self, "Cancelled", "Export cancelled.")
+            return
+
+        QMessageBox.information(self, "Success", f"Report saved to {filename} ({written:,} records)")
+        self.accept()
+
+    def export_summary(self):
+        name = self.report_combo.currentData()
+        fmt = self.format_combo.currentData()
+        label, ext, _ = FORMATS[fmt]
+        filename, _ = QFileDialog.getSaveFileName(self, "Save Report", name + ext, f"{label} Files (*{ext})")
+        if not filename:
+            return
+        start = self.start_date.date().toString("yyyy-MM-dd")
+        end = self.end_date.date().toString("yyyy-MM-dd")
+        engine = ReportEngine(self.db_manager)
+        job = lambda: engine.export(name, filename, fmt, start, end)
+
+        self.summary_btn.setEnabled(False)
+        self.summary_btn.setText("Generating...")
+        on_result = lambda count: self.on_summary_done(filename, count)
+        if self.executor:
+            self.executor.submit("reports.summary", job, on_result=on_result, on_error=self.on_summary_failed)
+        else:
+            try:
+                on_result(job())
             except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to save file: {e}")
+                self.on_summary_failed(str(e))
+
+    def on_summary_done(self, filename, count):
+        self.summary_btn.setEnabled(True)
+        self.summary_btn.setText("📊 Export Summary")
+        QMessageBox.information(self, "Success", f"Report saved to {filename} ({count:,} rows)")
+
+    def on_summary_failed(self, message):
+        self.summary_btn.setEnabled(True)
+        self.summary_btn.setText("📊 Export Summary")
+        QMessageBox.critical(self, "Error", f"Failed to generate report: {message}")
+
+    def done(self, result):
+        # Don't deliver a late result to a closed dialog
+        if self.executor:
+            self.executor.cancel("reports.summary")
+        super().done(result)
+
+
+class QueryMetricsDialog(QDialog):
+    """Per-method database latency and the slow-query log (DatabaseManager.metrics), refreshed live"""
+    REFRESH_MS = 5000
+
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.metrics = getattr(db_manager, 'metrics', None)
+        self.setWindowTitle("Database Query Metrics")
+        self.resize(980, 640)
+        self.init_ui()
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        if self.metrics:
+            self.refresh()
+            self.timer.start(self.REFRESH_MS)
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        header_layout = QHBoxLayout()
+        title = QLabel("Query Metrics")
+        title.setFont(QFont("Arial", 12, QFont.Weight.Bold))
+        refresh_btn = QPushButton("⟳ Refresh")
+        refresh_btn.clicked.connect(self.refresh)
+        export_btn = QPushButton("💾 Export...")
+        export_btn.setToolTip("Save as Prometheus text (.prom) or JSON (.json)")
+        export_btn.clicked.connect(self.export)
+        reset_btn = QPushButton("Reset")
+        reset_btn.setToolTip("Clear all histograms and the slow-query log")
+        reset_btn.clicked.connect(self.reset)
+        for btn in (refresh_btn, export_btn, reset_btn):
+            btn.setEnabled(self.metrics is not None)
+
+        header_layout.addWidget(title)
+        header_layout.addStretch()
+        header_layout.addWidget(refresh_btn)
+        header_layout.addWidget(export_btn)
+        header_layout.addWidget(reset_btn)
+        layout.addLayout(header_layout)
+
+        self.summary_label = QLabel("Query instrumentation is disabled." if self.metrics is None else "")
+        self.summary_label.setStyleSheet("color: #64748b;")
+        layout.addWidget(self.summary_label)
+
+        # Slowest methods first (by total time spent)
+        self.method_table = QTableWidget()
+        self.method_table.setColumnCount(11)
+        self.method_table.setHorizontalHeaderLabels(["Method", "Calls", "Errors", "p50 ms", "p95 ms", "p99 ms",
+                                                     "Max ms", "Connect ms", "Queries", "Rows", "KB"])
+        self.method_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.method_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.method_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.method_table, 3)
 
+        layout.addWidget(QLabel("Slow queries (newest first):"))
+        self.slow_table = QTableWidget()
+        self.slow_table.setColumnCount(4)
+        self.slow_table.setHorizontalHeaderLabels(["Time", "Method", "ms", "SQL"])
+        self.slow_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.slow_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+        self.slow_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.slow_table, 2)
 
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        layout.addWidget(close_btn)
+
+        self.setLayout(layout)
+
+    @staticmethod
+    def ms(seconds):
+        return "-" if seconds is None else f"{seconds * 1000:,.1f}"
+
+    def refresh(self):
+        snapshot = self.metrics.snapshot()
+        methods = sorted(snapshot['methods'].items(), key=lambda item: item[1]['total']['sum'], reverse=True)
+        self.summary_label.setText(
+            f"Since {snapshot['started_at']}  •  {sum(m['calls'] for _, m in methods):,} calls  •  "
+            f"{snapshot['slow_queries_total']:,} statements over {snapshot['slow_query_ms']} ms")
+
+        self.method_table.setRowCount(len(methods))
+        for row, (name, m) in enumerate(methods):
+            total, connect = m['total'], m['connect']
+            avg_connect = connect['sum'] / connect['count'] if connect['count'] else None
+            errors = m['errors'] + m['failed_queries']
+            values = [name, f"{m['calls']:,}", f"{errors:,}", self.ms(total['p50']), self.ms(total['p95']),
+                      self.ms(total['p99']), self.ms(total['max'] if total['count'] else None), self.ms(avg_connect),
+                      f"{m['queries']:,}", f"{m['rows']:,}", f"{m['bytes'] / 1024:,.0f}"]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.method_table.setItem(row, col, item)
+            if errors:
+                self.method_table.item(row, 2).setToolTip(
+                    f"{m['errors']} call(s) raised, {m['failed_queries']} statement(s) failed\n{m['last_error']}")
+
+        slow = self.metrics.slow_queries()
+        self.slow_table.setRowCount(len(slow))
+        for row, entry in enumerate(slow):
+            self.slow_table.setItem(row, 0, QTableWidgetItem(entry['at']))
+            self.slow_table.setItem(row, 1, QTableWidgetItem(entry['method']))
+            self.slow_table.setItem(row, 2, QTableWidgetItem(f"{entry['ms']:,.1f}"))
+            sql_item = QTableWidgetItem(entry['sql'])
+            tooltip = f"{entry['sql']}\n\nParams: {entry['params']}"
+            if entry['error']:
+                tooltip += f"\nError: {entry['error']}"
+            sql_item.setToolTip(tooltip)
+            self.slow_table.setItem(row, 3, sql_item)
+
+    def export(self):
+        filename, _ = QFileDialog.getSaveFileName(self, "Export Query Metrics", "nexus_db_metrics.prom",
+                                                  "Prometheus Text (*.prom);;JSON (*.json)")
+        if not filename:
+            return
+        try:
+            fmt = self.metrics.export(filename)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to export metrics: {e}")
+            return
+        QMessageBox.information(self, "Success", f"Metrics saved to {filename} ({fmt})")
 
+    def reset(self):
+        if QMessageBox.question(self, "Reset Metrics", "Clear all collected query metrics?") \
+                == QMessageBox.StandardButton.Yes:
+            self.metrics.reset()
+            self.refresh()
 
+    def done(self, result):
+        self.timer.stop()
+        super().done(result)
@@ -6,6 +6,9 @@ from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
 from PyQt6.QtCore import Qt, QDate
 from PyQt6.QtGui import QFont, QColor
 
+# Violation cards fetched per "Load more" in CheckStatusDialog
+STATUS_PAGE_SIZE = 20
+
 class PaymentDialog(QDialog):
     def __init__(self, db_manager, user_id, parent=None):
         super().__init__(parent)
@@ -110,9 +113,7 @@ class PaymentDialog(QDialog):
         self.build_extra_fields()
     
     def load_pending_violations(self):
-        violations = self.db_manager.get_violations_by_owner(self.user_id)
-        # Filter pending
-        self.pending = [v for v in violations if v['status'].lower() == 'pending']
+        self.pending = self.db_manager.get_violations_by_owner(self.user_id, status='pending')
         
         if not self.pending:
             self.violation_combo.addItem("No pending violations", None)
@@ -348,64 +349,20 @@ class CheckStatusDialog(QDialog):
         scroll.setStyleSheet("background: transparent; border: none;")
         
         content = QFrame()
-        content_layout = QVBoxLayout()
-        content_layout.setSpacing(15)
-        
-        violations = self.db_manager.get_violations_by_owner(self.user_id)
-        
-        if not violations:
-            lbl = QLabel("No violations found. Drive safely! 🚗")
-            lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            lbl.setStyleSheet("color: #16a34a; font-size: 14px; margin-top: 50px;")
-            content_layout.addWidget(lbl)
-        else:
-            for v in violations:
-                card = QFrame()
-                card.setStyleSheet("""
-                    QFrame {
-                        background-color: white;
-                        border: 1px solid #e2e8f0;
-                        border-radius: 12px;
-                        padding: 14px;
-                    }
-                """)
-                card_layout = QVBoxLayout()
-                card_layout.setSpacing(6)
-                
-                h_top = QHBoxLayout()
-                v_name = QLabel(v['violation_name'])
-                v_name.setFont(QFont("Arial", 12, QFont.Weight.Bold))
-                
-                status_lbl = QLabel(v['status'].upper())
-                status_lbl.setFont(QFont("Arial", 10, QFont.Weight.Bold))
-                if v['status'] == 'paid':
-                    status_lbl.setStyleSheet("color: #16a34a; background: #dcfce7; padding: 4px 10px; border-radius: 8px;")
-                elif v['status'] == 'pending':
-                    status_lbl.setStyleSheet("color: #dc2626; background: #fee2e2; padding: 4px 10px; border-radius: 8px;")
-                else:
-                    status_lbl.setStyleSheet("color: #f59e0b; background: #fef3c7; padding: 4px 10px; border-radius: 8px;")
-                     
-                h_top.addWidget(v_name)
-                h_top.addStretch()
-                h_top.addWidget(status_lbl)
-                
-                details = QLabel(f"Plate: {v['plate_number']}  •  Date: {v['violation_date']}")
-                details.setStyleSheet("color: #475569; font-size: 11px;")
-
-                payment = v.get('payment_date')
-                payment_txt = f"Payment Date: {payment}" if payment else "Payment Date: -"
-                location_txt = f"Location: {v.get('location','-')}"
-                extra = QLabel(f"{location_txt}  •  {payment_txt}")
-                extra.setStyleSheet("color: #64748b; font-size: 10px;")
-                
-                card_layout.addLayout(h_top)
-                card_layout.addWidget(details)
-                card_layout.addWidget(extra)
-                card.setLayout(card_layout)
-                content_layout.addWidget(card)
-                
-        content_layout.addStretch()
-        content.setLayout(content_layout)
+        self.content_layout = QVBoxLayout()
+        self.content_layout.setSpacing(15)
+        
+        # Cards are fetched a page at a time; "Load more" appends the next page
+        self.loaded = 0
+        self.load_more_btn = QPushButton("LOAD MORE")
+        self.load_more_btn.setFixedHeight(36)
+        self.load_more_btn.setStyleSheet("background-color: #e2e8f0; color: #1e40af; border-radius: 8px; font-weight: bold;")
+        self.load_more_btn.clicked.connect(self.load_more)
+        self.content_layout.addWidget(self.load_more_btn)
+        self.content_layout.addStretch()
+        self.load_more()
+        
+        content.setLayout(self.content_layout)
         scroll.setWidget(content)
         layout.addWidget(scroll)
         
@@ -417,6 +374,71 @@ class CheckStatusDialog(QDialog):
         
         self.setLayout(layout)
 
+    def load_more(self):
+        # One extra row tells us whether another page exists
+        page = self.db_manager.get_violations_by_owner(self.user_id, limit=STATUS_PAGE_SIZE + 1, offset=self.loaded)
+        has_more = len(page) > STATUS_PAGE_SIZE
+        page = page[:STATUS_PAGE_SIZE]
+        
+        if not page and not self.loaded:
+            lbl = QLabel("No violations found. Drive safely! 🚗")
+            lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            lbl.setStyleSheet("color: #16a34a; font-size: 14px; margin-top: 50px;")
+            self.content_layout.insertWidget(0, lbl)
+        
+        # New cards go above the "Load more" button
+        insert_at = self.content_layout.indexOf(self.load_more_btn)
+        for v in page:
+            self.content_layout.insertWidget(insert_at, self.create_violation_card(v))
+            insert_at += 1
+        self.loaded += len(page)
+        self.load_more_btn.setVisible(has_more)
+
+    def create_violation_card(self, v):
+        card = QFrame()
+        card.setStyleSheet("""
+            QFrame {
+                background-color: white;
+                border: 1px solid #e2e8f0;
+                border-radius: 12px;
+                padding: 14px;
+            }
+        """)
+        card_layout = QVBoxLayout()
+        card_layout.setSpacing(6)
+        
+        h_top = QHBoxLayout()
+        v_name = QLabel(v['violation_name'])
+        v_name.setFont(QFont("Arial", 12, QFont.Weight.Bold))
+        
+        status_lbl = QLabel(v['status'].upper())
+        status_lbl.setFont(QFont("Arial", 10, QFont.Weight.Bold))
+        if v['status'] == 'paid':
+            status_lbl.setStyleSheet("color: #16a34a; background: #dcfce7; padding: 4px 10px; border-radius: 8px;")
+        elif v['status'] == 'pending':
+            status_lbl.setStyleSheet("color: #dc2626; background: #fee2e2; padding: 4px 10px; border-radius: 8px;")
+        else:
+            status_lbl.setStyleSheet("color: #f59e0b; background: #fef3c7; padding: 4px 10px; border-radius: 8px;")
+             
+        h_top.addWidget(v_name)
+        h_top.addStretch()
+        h_top.addWidget(status_lbl)
+        
+        details = QLabel(f"Plate: {v['plate_number']}  •  Date: {v['violation_date']}")
+        details.setStyleSheet("color: #475569; font-size: 11px;")
+
+        payment = v.get('payment_date')
+        payment_txt = f"Payment Date: {payment}" if payment else "Payment Date: -"
+        location_txt = f"Location: {v.get('location','-')}"
+        extra = QLabel(f"{location_txt}  •  {payment_txt}")
+        extra.setStyleSheet("color: #64748b; font-size: 10px;")
+        
+        card_layout.addLayout(h_top)
+        card_layout.addWidget(details)
+        card_layout.addWidget(extra)
+        card.setLayout(card_layout)
+        return card
+
 class EditProfileDialog(QDialog):
     def __init__(self, db_manager, user_data, parent=None):
         super().__init__(parent)
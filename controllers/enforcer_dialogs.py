@@ -1,19 +1,46 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
-                             QPushButton, QLineEdit, QComboBox, QMessageBox, QTextEdit, QDateEdit)
-from PyQt6.QtCore import Qt, QDate, QTime
+                             QPushButton, QLineEdit, QComboBox, QMessageBox, QTextEdit, QDateEdit, QCompleter)
+from PyQt6.QtCore import Qt, QDate, QTime, QStringListModel
 from PyQt6.QtGui import QFont
 from datetime import datetime
 
+from models.offline import MAX_LENGTHS
+
+PLATE_SUGGESTIONS = 8
+
+
+def attach_plate_completer(line_edit, db_manager, on_chosen=None):
+    """Type-ahead plate suggestions from db_manager's plate index (prefix and misread-tolerant)"""
+    model = QStringListModel(line_edit)
+    completer = QCompleter(model, line_edit)
+    # The index already did the matching (e.g. "A8C" -> "ABC 1234"); show its list as is
+    completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+    completer.setMaxVisibleItems(PLATE_SUGGESTIONS)
+    line_edit.setCompleter(completer)
+
+    def update(text):
+        plates = db_manager.suggest_plates(text, PLATE_SUGGESTIONS) if len(text.strip()) >= 2 else []
+        model.setStringList(plates)
+        if plates:
+            completer.complete()
+
+    line_edit.textEdited.connect(update)
+    if on_chosen:
+        completer.activated.connect(lambda _plate: on_chosen())
+    return completer
+
 # --- 1. RECORD VIOLATION DIALOG ---
 class RecordViolationDialog(QDialog):
-    def __init__(self, db_manager, enforcer_id, parent=None, violation_data=None):
+    def __init__(self, db_manager, enforcer_id, parent=None, violation_data=None, citation_sync=None):
         super().__init__(parent)
         self.db_manager = db_manager
         self.enforcer_id = enforcer_id
         self.violation_data = violation_data
+        # Offline-first: new citations go to the local journal and sync in the background
+        self.citation_sync = citation_sync
         self.setWindowTitle("Update Violation" if violation_data else "Record New Violation")
         self.setFixedSize(500, 650)
-        self.setStyleSheet("QDialog { background-color: #f8fafc; }")
+        self.setObjectName("FormDialog")
         self.init_ui()
 
     def init_ui(self):
@@ -32,13 +59,14 @@ class RecordViolationDialog(QDialog):
         self.plate_input = QLineEdit()
         self.plate_input.setPlaceholderText("e.g. ABC 1234")
         self.plate_input.setFixedHeight(42)
-        self.plate_input.setStyleSheet("padding: 10px; border: 2px solid #e2e8f0; border-radius: 8px; background: white;")
+        self.plate_input.setObjectName("PlainInput")
+        attach_plate_completer(self.plate_input, self.db_manager)
         layout.addWidget(self.plate_input)
         
         layout.addWidget(self.label("Violation Type:"))
         self.type_combo = QComboBox()
         self.type_combo.setFixedHeight(42)
-        self.type_combo.setStyleSheet("padding: 10px; border: 2px solid #e2e8f0; border-radius: 8px; background: white;")
+        self.type_combo.setObjectName("PlainInput")
         self.load_violation_types()
         layout.addWidget(self.type_combo)
         
@@ -46,13 +74,13 @@ class RecordViolationDialog(QDialog):
         self.loc_input = QLineEdit()
         self.loc_input.setPlaceholderText("Street, City, Landmark")
         self.loc_input.setFixedHeight(42)
-        self.loc_input.setStyleSheet("padding: 10px; border: 2px solid #e2e8f0; border-radius: 8px; background: white;")
+        self.loc_input.setObjectName("PlainInput")
         layout.addWidget(self.loc_input)
         
         layout.addWidget(self.label("Notes / Remarks:"))
         self.notes_input = QTextEdit()
         self.notes_input.setPlaceholderText("Driver behavior, weather conditions, etc.")
-        self.notes_input.setStyleSheet("padding: 10px; border: 2px solid #e2e8f0; border-radius: 8px; background: white;")
+        self.notes_input.setObjectName("PlainInput")
         self.notes_input.setFixedHeight(90)
         layout.addWidget(self.notes_input)
         
@@ -86,7 +114,7 @@ class RecordViolationDialog(QDialog):
              self.status_combo.addItems(["PENDING", "PAID", "OVERDUE", "CONTESTED"])
              self.status_combo.setCurrentText(self.violation_data.get('status', 'PENDING').upper())
              self.status_combo.setFixedHeight(42)
-             self.status_combo.setStyleSheet("padding: 10px; border: 2px solid #e2e8f0; border-radius: 8px; background: white;")
+             self.status_combo.setObjectName("PlainInput")
              layout.addWidget(self.status_combo)
              
              btn.setText("UPDATE VIOLATION")
@@ -102,7 +130,11 @@ class RecordViolationDialog(QDialog):
         return l
 
     def load_violation_types(self):
-        types = self.db_manager.get_all_violation_types()
+        offline = self.citation_sync is not None and not self.citation_sync.online
+        types = [] if offline else self.db_manager.get_all_violation_types()
+        if not types and self.citation_sync:
+            # Server unreachable: use the types saved by the last successful sync
+            types = self.citation_sync.journal.load_violation_types()
         for t in types:
             # Display: "No Helmet (₱1,500)"
             self.type_combo.addItem(f"{t['violation_name']} (₱{t['fine_amount']:,.2f})", t['type_id'])
@@ -116,6 +148,14 @@ class RecordViolationDialog(QDialog):
         if not plate or not location:
             QMessageBox.warning(self, "Missing Info", "Plate Number and Location are required!")
             return
+        if v_type_id is None:
+            QMessageBox.warning(self, "Missing Info", "Please choose a violation type.")
+            return
+        for field, value in (('plate_number', plate), ('location', location)):
+            if len(value) > MAX_LENGTHS[field]:
+                QMessageBox.warning(self, "Too Long", f"{field.replace('_', ' ').capitalize()} must be at most "
+                                                      f"{MAX_LENGTHS[field]} characters.")
+                return
 
         if self.violation_data:
             # UPDATE LOGIC
@@ -134,9 +174,16 @@ class RecordViolationDialog(QDialog):
                 QMessageBox.critical(self, "Error", "Failed to update violation.")
         else:
             # INSERT LOGIC
-            # 1. Validation: Check if vehicle exists
-            vehicle = self.db_manager.search_vehicle(plate)
-            if not vehicle:
+            offline = self.citation_sync is not None and not self.citation_sync.online
+            # 1. Validation: Check if vehicle exists. With the journal this must not touch the
+            # network (the server may have just gone away), so only the in-memory plate index
+            # is asked; the sync links the vehicle. None: index not built yet, don't ask
+            plate = self.db_manager.resolve_plate(plate)
+            if self.citation_sync:
+                registered = self.db_manager.is_registered_plate(plate)
+            else:
+                registered = self.db_manager.search_vehicle(plate) is not None
+            if registered is False:
                 reply = QMessageBox.question(self, "Vehicle Not Found", 
                                            f"Vehicle with plate '{plate}' is not registered in the system.\nDo you want to proceed anyway?",
                                            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
@@ -145,7 +192,27 @@ class RecordViolationDialog(QDialog):
     
             # Current Timestamp
             violation_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
+
+            if self.citation_sync:
+                # Save to the local journal (a local fsync, no server round trip)
+                try:
+                    queued = self.citation_sync.journal.enqueue({
+                        'plate_number': plate,
+                        'violation_type_id': v_type_id,
+                        'enforcer_id': self.enforcer_id,
+                        'location': location,
+                        'violation_date': violation_date,
+                        'notes': notes,
+                    })
+                except Exception as e:
+                    QMessageBox.critical(self, "Error", f"Could not save violation on this device: {e}")
+                    return
+                status = "Offline - it will be sent when the connection is back." if offline else \
+                         "It will be sent to the system automatically."
+                QMessageBox.information(self, "Success", f"Violation recorded (reference {queued['reference']}).\n{status}")
+                self.accept()
+                return
+
             # Save to Database
             result = self.db_manager.add_violation(
                 plate_number=plate,
@@ -169,7 +236,7 @@ class SearchVehicleDialog(QDialog):
         self.db_manager = db_manager
         self.setWindowTitle("Search Vehicle Database")
         self.setFixedSize(520, 520)
-        self.setStyleSheet("QDialog { background-color: #f8fafc; }")
+        self.setObjectName("FormDialog")
         self.init_ui()
         
     def init_ui(self):
@@ -187,6 +254,8 @@ class SearchVehicleDialog(QDialog):
         self.input = QLineEdit()
         self.input.setPlaceholderText("ABC 123")
         self.input.setStyleSheet("font-size: 16px; padding: 10px; border: 2px solid #1e40af; border-radius: 8px; background: white;")
+        self.input.returnPressed.connect(self.search)
+        attach_plate_completer(self.input, self.db_manager, on_chosen=self.search)
         layout.addWidget(self.input)
         
         btn = QPushButton("SEARCH DATABASE")
@@ -205,7 +274,10 @@ class SearchVehicleDialog(QDialog):
         self.setLayout(layout)
         
     def search(self):
-        plate = self.input.text().strip().upper()
+        # "abc1234" or "ABC-1234" finds "ABC 1234"
+        plate = self.db_manager.resolve_plate(self.input.text())
+        if not plate:
+            return
         # Use new full search method
         data = self.db_manager.search_vehicle_full(plate)
         vehicle = data.get("vehicle")
@@ -237,7 +309,11 @@ class SearchVehicleDialog(QDialog):
                 
             self.result_lbl.setText(text)
         else:
-            self.result_lbl.setText(f"❌ No record found for <b>{plate}</b>")
+            text = f"❌ No record found for <b>{plate}</b>"
+            similar = self.db_manager.suggest_plates(plate, 5)
+            if similar:
+                text += "<br><br>Did you mean: " + ", ".join(f"<b>{p}</b>" for p in similar) + "?"
+            self.result_lbl.setText(text)
 
 # --- 3. UPDATE DETAILS DIALOG ---
 class UpdateDetailsDialog(QDialog):
@@ -246,7 +322,7 @@ class UpdateDetailsDialog(QDialog):
         self.db_manager = db_manager
         self.setWindowTitle("Update Violation Details")
         self.setFixedSize(520, 520)
-        self.setStyleSheet("QDialog { background-color: #f8fafc; }")
+        self.setObjectName("FormDialog")
         self.init_ui()
         
     def init_ui(self):
@@ -263,7 +339,8 @@ class UpdateDetailsDialog(QDialog):
         self.plate_input = QLineEdit()
         self.plate_input.setPlaceholderText("ABC 1234")
         self.plate_input.setFixedHeight(42)
-        self.plate_input.setStyleSheet("padding: 10px; border: 2px solid #e2e8f0; border-radius: 8px; background: white;")
+        self.plate_input.setObjectName("PlainInput")
+        attach_plate_completer(self.plate_input, self.db_manager, on_chosen=self.load_violations)
         layout.addWidget(self.plate_input)
 
         self.search_btn = QPushButton("LOAD VIOLATIONS")
@@ -274,7 +351,7 @@ class UpdateDetailsDialog(QDialog):
 
         self.vio_combo = QComboBox()
         self.vio_combo.setFixedHeight(42)
-        self.vio_combo.setStyleSheet("padding: 10px; border: 2px solid #e2e8f0; border-radius: 8px; background: white;")
+        self.vio_combo.setObjectName("PlainInput")
         self.vio_combo.currentIndexChanged.connect(self.prefill_fields)
         layout.addWidget(QLabel("SELECT VIOLATION:"))
         layout.addWidget(self.vio_combo)
@@ -282,25 +359,25 @@ class UpdateDetailsDialog(QDialog):
         layout.addWidget(QLabel("VIOLATION TYPE:"))
         self.type_combo = QComboBox()
         self.type_combo.setFixedHeight(42)
-        self.type_combo.setStyleSheet("padding: 10px; border: 2px solid #e2e8f0; border-radius: 8px; background: white;")
+        self.type_combo.setObjectName("PlainInput")
         layout.addWidget(self.type_combo)
 
         layout.addWidget(QLabel("STATUS:"))
         self.status_combo = QComboBox()
         self.status_combo.addItems(["PENDING", "PAID", "OVERDUE", "CONTESTED"])
         self.status_combo.setFixedHeight(42)
-        self.status_combo.setStyleSheet("padding: 10px; border: 2px solid #e2e8f0; border-radius: 8px; background: white;")
+        self.status_combo.setObjectName("PlainInput")
         layout.addWidget(self.status_combo)
 
         layout.addWidget(QLabel("CORRECTED LOCATION:"))
         self.loc_input = QLineEdit()
         self.loc_input.setFixedHeight(42)
-        self.loc_input.setStyleSheet("padding: 10px; border: 2px solid #e2e8f0; border-radius: 8px; background: white;")
+        self.loc_input.setObjectName("PlainInput")
         layout.addWidget(self.loc_input)
 
         layout.addWidget(QLabel("ADDITIONAL NOTES:"))
         self.note_input = QTextEdit()
-        self.note_input.setStyleSheet("padding: 10px; border: 2px solid #e2e8f0; border-radius: 8px; background: white;")
+        self.note_input.setObjectName("PlainInput")
         self.note_input.setFixedHeight(90)
         layout.addWidget(self.note_input)
 
@@ -325,6 +402,7 @@ class UpdateDetailsDialog(QDialog):
         if not plate:
             QMessageBox.warning(self, "Required", "Please enter a plate number.")
             return
+        plate = self.db_manager.resolve_plate(plate)
         data = self.db_manager.search_vehicle_full(plate)
         self.violations = data.get("violations", [])
         self.vio_combo.clear()
@@ -1,48 +1,88 @@
+import os
 import sys
 import traceback
-from datetime import datetime
-import mysql.connector
-from PyQt6.QtWidgets import QApplication, QMainWindow, QStackedWidget, QMessageBox, QLabel, QDialog, QVBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView, QPushButton
-from PyQt6.QtCore import Qt
+from datetime import datetime, timedelta
+from PyQt6.QtWidgets import QApplication, QMainWindow, QStackedWidget, QMessageBox, QLabel, QDialog, QVBoxLayout, QPushButton
+from PyQt6.QtCore import Qt, QTimer
 
-# Import UIs
+# Import UIs (dashboards and dialogs are imported on first use, see open_* methods)
 from views.ui_login import LoginWindow       
-from views.ui_admin import AdminDashboard
-from views.ui_enforcer import EnforcerDashboard
-from views.ui_citizen import CitizenDashboard
+from views.assets import preload_assets
+from views.theme import apply_theme
 
 # Import Database
+from models.backends import MySQLBackend, backend_from_env
 from models.database import DatabaseManager
-
-# Import Dialogs
-from controllers.admin_dialogs import (AddUserDialog, AddViolationDialog, AddVehicleDialog, 
-                          UpdateStatusDialog, ManageViolationTypesDialog, 
-                          AddViolationTypeDialog, GenerateReportsDialog)
-from controllers.enforcer_dialogs import RecordViolationDialog, SearchVehicleDialog, UpdateDetailsDialog
-from controllers.citizen_dialogs import PaymentDialog, HelpSupportDialog, CheckStatusDialog, EditProfileDialog
+from models.offline import CitationJournal, CitationSync
+from models.worker import QueryExecutor
+
+# How often dashboard_counters is recounted from the base tables to repair drift
+COUNTER_RECONCILE_INTERVAL_MS = 15 * 60 * 1000
+# Longest gap between daily-expiration checks; a no-op unless the server's date has rolled over
+EXPIRATION_CHECK_MAX_INTERVAL_MS = 60 * 60 * 1000
+# Local journal of citations recorded by enforcers, synced in the background (models/offline.py)
+CITATION_JOURNAL_PATH = "enforcer_journal.db"
+# Recently searched plates kept in memory for checkpoint lookups (LRU; NEXUS_HOT_PLATES overrides)
+HOT_PLATE_CACHE_SIZE = int(os.environ.get("NEXUS_HOT_PLATES", "2048"))
+# Statements slower than this are appended (SQL and parameter types) to SLOW_QUERY_LOG_PATH as JSON lines
+SLOW_QUERY_MS = int(os.environ.get("NEXUS_SLOW_QUERY_MS", "200"))
+SLOW_QUERY_LOG_PATH = "nexus_slow_queries.jsonl"
+# NEXUS_SLOW_QUERY_PARAMS=1 logs parameter values too (never for password statements); for debugging only
+SLOW_QUERY_PARAMS = os.environ.get("NEXUS_SLOW_QUERY_PARAMS", "") == "1"
 
 class MainApp(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Nexus Monitor System")
         self.setGeometry(100, 50, 1300, 750)
+
+        # One shared stylesheet for every window and dialog (views/theme.py)
+        apply_theme(QApplication.instance())
         
         # Initialize database
         print("  - Connecting to database...")
+        backend = None
         try:
-            self.db = DatabaseManager()
+            # NEXUS_DB_BACKEND=sqlite runs on the embedded engine instead of MySQL; MySQLBackend
+            # imports mysql.connector itself, so SQLite installs never load the driver
+            backend = backend_from_env() or MySQLBackend()
+            # Only the schema-version check runs here; bootstrap (if needed) runs below.
+            self.db = DatabaseManager(auto_bootstrap=False, backend=backend,
+                                      hot_plates_size=HOT_PLATE_CACHE_SIZE, slow_query_ms=SLOW_QUERY_MS,
+                                      slow_query_log=SLOW_QUERY_LOG_PATH, slow_query_params=SLOW_QUERY_PARAMS)
             print("✓ Database initialized successfully")
-        except mysql.connector.Error as e:
-            print(f"✗ Database connection error: {e}")
-            print("  Please ensure MySQL server is running and credentials are correct.")
-            traceback.print_exc()
-            # Continue anyway - user can still see the error
-            self.db = None
         except Exception as e:
-            print(f"✗ Database initialization error: {e}")
+            if backend is not None and isinstance(e, backend.Error):
+                print(f"✗ Database connection error: {e}")
+                print(f"  Please ensure {backend.describe()} is reachable and credentials are correct.")
+            else:
+                print(f"✗ Database initialization error: {e}")
             traceback.print_exc()
+            # Continue anyway - user can still see the error
             self.db = None
         
+        # Background query executor shared by all dashboards
+        self.executor = QueryExecutor(parent=self)
+
+        # Periodic background reconciliation of the dashboard summary counters
+        self.reconcile_timer = QTimer(self)
+        self.reconcile_timer.timeout.connect(self.reconcile_dashboard_counters)
+        if self.db:
+            self.reconcile_timer.start(COUNTER_RECONCILE_INTERVAL_MS)
+
+        # Daily vehicle expiration job; first run after the schema check/bootstrap
+        self.expiration_timer = QTimer(self)
+        self.expiration_timer.setSingleShot(True)
+        self.expiration_timer.timeout.connect(self.run_expiration_job)
+
+        # Offline citation queue; started on enforcer login, or at startup if a journal exists
+        self.citation_sync = None
+        self.citation_sync_timer = QTimer(self)
+        self.citation_sync_timer.setSingleShot(True)
+        self.citation_sync_timer.timeout.connect(self.run_citation_sync)
+        if self.db and os.path.exists(CITATION_JOURNAL_PATH):
+            self.start_citation_sync()
+        
         self.current_user = None
         self.stack = QStackedWidget()
         self.setCentralWidget(self.stack)
@@ -55,6 +95,9 @@ class MainApp(QMainWindow):
             self.stack.setCurrentWidget(self.login_screen)
             self.login_screen.login_btn.clicked.connect(self.handle_login)
             print("✓ Login window initialized")
+            self.start_bootstrap()
+            # Warm the logo cache for the dashboards once the login screen is up
+            QTimer.singleShot(0, preload_assets)
         except Exception as e:
             print(f"✗ Error initializing login window: {e}")
             traceback.print_exc()
@@ -63,6 +106,86 @@ class MainApp(QMainWindow):
             error_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             self.stack.addWidget(error_label)
     
+    def start_bootstrap(self):
+        """Migrate/seed a new or outdated database in the background while the login screen is up"""
+        if not self.db or not self.db.needs_bootstrap():
+            if self.db:
+                print("✓ Database schema is current")
+                self.run_expiration_job()
+            return
+        self.login_screen.login_btn.setEnabled(False)
+        self.login_screen.login_btn.setText("⏳ PREPARING DATABASE...")
+        self.executor.submit("app.bootstrap", self.db.bootstrap,
+                             on_result=self.on_bootstrap_finished,
+                             on_error=self.on_bootstrap_finished)
+
+    def on_bootstrap_finished(self, _result=None):
+        self.login_screen.login_btn.setEnabled(True)
+        self.login_screen.login_btn.setText('🚀 LOGIN TO SYSTEM')
+        print("✓ Database bootstrap finished")
+        self.run_expiration_job()
+
+    def run_expiration_job(self):
+        """Run the once-per-day expiration pass in the background and re-arm for the next check"""
+        if self.db and not self.executor.is_busy("app.expiration"):
+            self.executor.submit("app.expiration", self.db.run_daily_expiration,
+                                 on_result=self.on_expiration_job_finished)
+        # Wake just after local midnight, or within the hour if the server's day rolls over first
+        now = datetime.now()
+        midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=5, microsecond=0)
+        until_midnight_ms = int((midnight - now).total_seconds() * 1000)
+        self.expiration_timer.start(min(until_midnight_ms, EXPIRATION_CHECK_MAX_INTERVAL_MS))
+
+    def start_citation_sync(self):
+        if self.citation_sync or not self.db:
+            return
+        try:
+            journal = CitationJournal(CITATION_JOURNAL_PATH)
+            journal.purge_synced()
+        except Exception as e:
+            print(f"  ⚠ Offline citation journal unavailable: {e}")
+            return
+        self.citation_sync = CitationSync(self.db, journal)
+        self.citation_sync_timer.start(0)
+
+    def run_citation_sync(self):
+        """Send queued citations in the background, then re-arm with the sync's backoff"""
+        if not self.citation_sync:
+            return
+        if self.executor.is_busy("app.citation_sync"):
+            self.citation_sync_timer.start(int(self.citation_sync.base_delay * 1000))
+            return
+        self.executor.submit("app.citation_sync", self.citation_sync.sync_once,
+                             on_result=self.on_citation_sync_finished,
+                             on_error=self.on_citation_sync_failed)
+
+    def on_citation_sync_finished(self, summary):
+        # The dashboard of a logged-out session may already be deleted
+        if self.current_user and self.stack.currentWidget() is getattr(self, 'enforcer_dashboard', None):
+            if summary['synced']:
+                self.refresh_enforcer_data()
+            self.enforcer_dashboard.set_sync_status(summary['journal'], online=self.citation_sync.online)
+        self.citation_sync_timer.start(int(self.citation_sync.next_delay() * 1000))
+
+    def requeue_rejected_citations(self):
+        """Give citations the server rejected another try on the next sync"""
+        if not self.citation_sync:
+            return
+        count = self.citation_sync.journal.requeue()
+        print(f"  ↻ Re-queued {count} rejected citation(s)")
+        self.enforcer_dashboard.set_sync_status(self.citation_sync.journal.counts(), online=self.citation_sync.online)
+        if not self.executor.is_busy("app.citation_sync"):
+            self.citation_sync_timer.start(0)
+
+    def on_citation_sync_failed(self, error):
+        print(f"  ⚠ Citation sync failed: {error}")
+        self.citation_sync_timer.start(int(self.citation_sync.max_delay * 1000))
+
+    def on_expiration_job_finished(self, changed):
+        # None: another client (or an earlier run) already did today's pass
+        if changed and self.current_user and self.stack.currentWidget() is getattr(self, 'admin_dashboard', None):
+            self.refresh_vehicle_expiration()
+
     def handle_login(self):
         try:
             username = self.login_screen.username_input.text().strip()
@@ -120,6 +243,7 @@ class MainApp(QMainWindow):
     #  ENFORCER DASHBOARD LOGIC
     # =========================================================
     def open_enforcer_dashboard(self):
+        from views.ui_enforcer import EnforcerDashboard
         try:
             print("  - Opening Enforcer Dashboard...")
             if not self.db:
@@ -132,6 +256,7 @@ class MainApp(QMainWindow):
             )
             self.enforcer_dashboard.db_manager = self.db
             self.enforcer_dashboard.current_user = self.current_user
+            self.enforcer_dashboard.set_executor(self.executor)
             
             # Connect Buttons
             self.connect_enforcer_buttons()
@@ -145,6 +270,11 @@ class MainApp(QMainWindow):
             
             self.stack.addWidget(self.enforcer_dashboard)
             self.stack.setCurrentWidget(self.enforcer_dashboard)
+            self.start_citation_sync()
+            self.warm_plate_index()
+            if self.citation_sync:
+                self.enforcer_dashboard.set_sync_status(self.citation_sync.journal.counts(),
+                                                        online=self.citation_sync.online)
             print("✓ Enforcer Dashboard opened successfully")
             
         except Exception as e:
@@ -163,6 +293,8 @@ class MainApp(QMainWindow):
                 self.enforcer_dashboard.btn_search.clicked.connect(self.open_search_vehicle)
             if hasattr(self.enforcer_dashboard, 'btn_manage'):
                 self.enforcer_dashboard.btn_manage.clicked.connect(self.enforcer_dashboard.show_manage)
+            if hasattr(self.enforcer_dashboard, 'btn_requeue'):
+                self.enforcer_dashboard.btn_requeue.clicked.connect(self.requeue_rejected_citations)
             
             # Dashboard Actions (Quick Actions)
             if hasattr(self.enforcer_dashboard, 'qa_record'):
@@ -183,11 +315,9 @@ class MainApp(QMainWindow):
             if hasattr(self.enforcer_dashboard, 'update_stats'):
                 self.enforcer_dashboard.update_stats()
             
-            all_violations = self.db.get_all_violations()
-            # Filter recent 20 for the dashboard table
-            recent = sorted(all_violations, key=lambda x: str(x.get('violation_date', '')), reverse=True)[:20]
-            if hasattr(self.enforcer_dashboard, 'populate_recent_table'):
-                self.enforcer_dashboard.populate_recent_table(recent)
+            # Only the 20 most recent rows are shown on the dashboard table
+            if hasattr(self.enforcer_dashboard, 'refresh_recent_table'):
+                self.enforcer_dashboard.refresh_recent_table()
             
             # Refresh Manage Table if on that page
             if hasattr(self.enforcer_dashboard, 'refresh_manage_table'):
@@ -197,20 +327,38 @@ class MainApp(QMainWindow):
 
     # --- ENFORCER DIALOGS ---
     def open_record_violation(self):
-        dialog = RecordViolationDialog(self.db, self.current_user['user_id'], self.enforcer_dashboard)
+        from controllers.enforcer_dialogs import RecordViolationDialog
+        dialog = RecordViolationDialog(self.db, self.current_user['user_id'], self.enforcer_dashboard,
+                                       citation_sync=self.citation_sync)
         if dialog.exec():
-            self.refresh_enforcer_data()
+            if self.citation_sync:
+                # Push it now; the dashboard refreshes once the sync has stored it
+                self.enforcer_dashboard.set_sync_status(self.citation_sync.journal.counts(),
+                                                        online=self.citation_sync.online)
+                self.citation_sync_timer.start(0)
+            else:
+                self.refresh_enforcer_data()
+
+    def warm_plate_index(self):
+        """Build (or refresh, once stale) the plate type-ahead index off the GUI thread"""
+        if self.db and not self.executor.is_busy("app.plate_index"):
+            self.executor.submit("app.plate_index", self.db.warm_plate_index)
 
     def open_search_vehicle(self):
+        from controllers.enforcer_dialogs import SearchVehicleDialog
+        self.warm_plate_index()
         dialog = SearchVehicleDialog(self.db, self.enforcer_dashboard)
         dialog.exec()
 
     def open_update_details(self):
+        from controllers.enforcer_dialogs import UpdateDetailsDialog
+        self.warm_plate_index()
         dialog = UpdateDetailsDialog(self.db, self.enforcer_dashboard)
         if dialog.exec():
             self.refresh_enforcer_data()
 
     def open_generate_reports(self):
+        from controllers.admin_dialogs import GenerateReportsDialog
         # Determine which dashboard is active
         parent = None
         if hasattr(self, 'admin_dashboard'):
@@ -218,10 +366,11 @@ class MainApp(QMainWindow):
         elif hasattr(self, 'enforcer_dashboard'):
             parent = self.enforcer_dashboard
         
-        dialog = GenerateReportsDialog(self.db, parent if parent else self)
+        dialog = GenerateReportsDialog(self.db, parent if parent else self, executor=self.executor)
         dialog.exec()
 
     def handle_edit_violation(self, violation_data):
+        from controllers.enforcer_dialogs import RecordViolationDialog
         dialog = RecordViolationDialog(self.db, self.current_user['user_id'], self.enforcer_dashboard, violation_data)
         if dialog.exec():
             self.refresh_enforcer_data()
@@ -240,6 +389,7 @@ class MainApp(QMainWindow):
     #  ADMIN DASHBOARD LOGIC
     # =========================================================
     def open_admin_dashboard(self):
+        from views.ui_admin import AdminDashboard
         try:
             print("  - Opening Admin Dashboard...")
             if not self.db:
@@ -252,6 +402,7 @@ class MainApp(QMainWindow):
             )
             self.admin_dashboard.db_manager = self.db
             self.admin_dashboard.current_user = self.current_user
+            self.admin_dashboard.set_executor(self.executor)
             
             self.connect_admin_buttons()
             
@@ -318,6 +469,8 @@ class MainApp(QMainWindow):
                 self.admin_dashboard.btn_refresh_expiration.clicked.connect(self.refresh_vehicle_expiration)
             if hasattr(self.admin_dashboard, 'btn_refresh_exp_dashboard'):
                 self.admin_dashboard.btn_refresh_exp_dashboard.clicked.connect(self.refresh_vehicle_expiration)
+            if hasattr(self.admin_dashboard, 'btn_query_metrics'):
+                self.admin_dashboard.btn_query_metrics.clicked.connect(self.open_query_metrics_dialog)
         except Exception as e:
             print(f"  ⚠ Error connecting admin buttons: {e}")
             traceback.print_exc()
@@ -329,12 +482,14 @@ class MainApp(QMainWindow):
             self.admin_dashboard.refresh_vehicle_table()
 
     def open_add_user_dialog(self):
+        from controllers.admin_dialogs import AddUserDialog
         dialog = AddUserDialog(self.db, self.admin_dashboard)
         if dialog.exec(): 
             self.admin_dashboard.refresh_user_table()
             self.admin_dashboard.update_stats()
 
     def handle_edit_user(self, user_data):
+        from controllers.admin_dialogs import AddUserDialog
         dialog = AddUserDialog(self.db, self.admin_dashboard, user_data)
         if dialog.exec():
             self.admin_dashboard.refresh_user_table()
@@ -351,12 +506,14 @@ class MainApp(QMainWindow):
                 QMessageBox.warning(self.admin_dashboard, "Error", "Failed to delete user.")
 
     def open_add_vehicle_dialog(self):
+        from controllers.admin_dialogs import AddVehicleDialog
         dialog = AddVehicleDialog(self.db, self.admin_dashboard)
         if dialog.exec(): 
             self.admin_dashboard.refresh_vehicle_table()
             self.admin_dashboard.update_stats()
 
     def handle_edit_vehicle(self, vehicle_data):
+        from controllers.admin_dialogs import AddVehicleDialog
         dialog = AddVehicleDialog(self.db, self.admin_dashboard, vehicle_data)
         if dialog.exec():
             self.admin_dashboard.refresh_vehicle_table()
@@ -374,54 +531,25 @@ class MainApp(QMainWindow):
     
 
     def open_update_status_dialog(self):
+        from controllers.admin_dialogs import UpdateStatusDialog
         dialog = UpdateStatusDialog(self.db, self.admin_dashboard)
         if dialog.exec(): self.refresh_violation_tables()
 
     def open_manage_types_dialog(self):
+        from controllers.admin_dialogs import ManageViolationTypesDialog
         dialog = ManageViolationTypesDialog(self.db, self.admin_dashboard)
         dialog.exec()
 
+    def open_query_metrics_dialog(self):
+        from controllers.admin_dialogs import QueryMetricsDialog
+        dialog = QueryMetricsDialog(self.db, self.admin_dashboard)
+        dialog.exec()
+
     def open_add_type_dialog(self):
+        from controllers.admin_dialogs import AddViolationTypeDialog
         dialog = AddViolationTypeDialog(self.db, self.admin_dashboard)
         dialog.exec()
         
-    def open_view_all_violations_dialog(self):
-        dialog = QDialog(self.admin_dashboard)
-        dialog.setWindowTitle("All Violations")
-        dialog.setFixedSize(900, 600)
-        layout = QVBoxLayout()
-        
-        table = QTableWidget()
-        table.setColumnCount(5)
-        table.setHorizontalHeaderLabels(["ID", "Plate", "Violation", "Date", "Status"])
-        table.verticalHeader().setVisible(False)
-        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        
-        violations = self.db.get_all_violations()
-        table.setRowCount(len(violations))
-        
-        for row, v in enumerate(violations):
-            table.setItem(row, 0, QTableWidgetItem(str(v.get('citation_number', ''))))
-            table.setItem(row, 1, QTableWidgetItem(v['plate_number']))
-            table.setItem(row, 2, QTableWidgetItem(v['violation_name']))
-            table.setItem(row, 3, QTableWidgetItem(str(v['violation_date'])))
-            
-            status = v['status'].upper()
-            status_item = QTableWidgetItem(status)
-            if status == "PAID": status_item.setForeground(Qt.GlobalColor.green)
-            else: status_item.setForeground(Qt.GlobalColor.red)
-            table.setItem(row, 4, status_item)
-            
-        layout.addWidget(table)
-        
-        cls_btn = QPushButton("CLOSE")
-        cls_btn.setFixedSize(100, 40)
-        cls_btn.clicked.connect(dialog.accept)
-        layout.addWidget(cls_btn, alignment=Qt.AlignmentFlag.AlignRight)
-        
-        dialog.setLayout(layout)
-        dialog.exec()
-
     def refresh_admin_dashboard(self):
         if not self.db or not hasattr(self, 'admin_dashboard'):
             return
@@ -440,9 +568,8 @@ class MainApp(QMainWindow):
         if not self.db:
             return
         try:
-            violations = self.db.get_all_violations()
-            if hasattr(self.admin_dashboard, 'populate_violation_table'):
-                self.admin_dashboard.populate_violation_table(violations)
+            if hasattr(self.admin_dashboard, 'refresh_violation_table'):
+                self.admin_dashboard.refresh_violation_table()
         except Exception as e:
             print(f"  ⚠ Error refreshing violation tables: {e}")
 
@@ -453,13 +580,14 @@ class MainApp(QMainWindow):
     #  CITIZEN / SHARED
     # =========================================================
     def open_citizen_dashboard(self):
+        from views.ui_citizen import CitizenDashboard
         try:
             print("  - Opening Citizen Dashboard...")
             if not self.db:
                 raise Exception("Database connection not available")
             
             # New Signature: user_data, db_manager
-            self.citizen_dashboard = CitizenDashboard(self.current_user, self.db)
+            self.citizen_dashboard = CitizenDashboard(self.current_user, self.db, executor=self.executor)
             self.citizen_dashboard.logout_btn.clicked.connect(self.handle_logout)
             
             # Connect Quick Actions
@@ -485,20 +613,24 @@ class MainApp(QMainWindow):
             raise  # Re-raise to be caught by handle_login
 
     def open_citizen_payment(self):
+        from controllers.citizen_dialogs import PaymentDialog
         # We need the user_id. Citizen Dashboard has user_data, but accessing from Main is safer/direct
         dialog = PaymentDialog(self.db, self.current_user['user_id'], self.citizen_dashboard)
         if dialog.exec():
             self.citizen_dashboard.update_dashboard()
 
     def open_citizen_help(self):
+        from controllers.citizen_dialogs import HelpSupportDialog
         dialog = HelpSupportDialog(self.citizen_dashboard)
         dialog.exec()
         
     def open_citizen_check_status(self):
+        from controllers.citizen_dialogs import CheckStatusDialog
         dialog = CheckStatusDialog(self.db, self.current_user['user_id'], self.citizen_dashboard)
         dialog.exec()
         
     def open_citizen_edit_profile(self):
+        from controllers.citizen_dialogs import EditProfileDialog
         dialog = EditProfileDialog(self.db, self.current_user, self.citizen_dashboard)
         if dialog.exec():
             # Update current user data from DB to reflect changes immediately in UI
@@ -524,38 +656,32 @@ class MainApp(QMainWindow):
                 traceback.print_exc()
         
     def open_view_all_violations_dialog(self):
-        # reuse ReportsDialog or create a simple table dialog
-        # For now, let's use the Dashboard's violation table by showing dashboard and ensuring it's populated?
-        # No, user wants specific action. Let's make a quick dialog here or import one.
-        # Check if we have one. We don't. Let's make a simple one or just show a message if not critical.
-        # BETTER: Re-use GenerateReportsDialog but that's for reports. 
-        # Actually, let's just make a QDialog with a QTableWidget on the fly.
+        from views.violation_table import ViolationTableModel, create_violation_view, format_status
         dialog = QDialog(self.admin_dashboard)
         dialog.setWindowTitle("All Violations")
         dialog.setFixedSize(900, 600)
         layout = QVBoxLayout()
         
-        table = QTableWidget()
-        table.setColumnCount(5)
-        table.setHorizontalHeaderLabels(["ID", "Plate", "Violation", "Date", "Status"])
-        table.verticalHeader().setVisible(False)
-        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        
-        violations = self.db.get_all_violations()
-        table.setRowCount(len(violations))
-        for row, v in enumerate(violations):
-            table.setItem(row, 0, QTableWidgetItem(str(v['citation_number'])))
-            table.setItem(row, 1, QTableWidgetItem(v['plate_number']))
-            table.setItem(row, 2, QTableWidgetItem(v['violation_name']))
-            table.setItem(row, 3, QTableWidgetItem(str(v['violation_date'])))
-            table.setItem(row, 4, QTableWidgetItem(v['status'].upper()))
-            
+        # Virtualized view: rows are fetched from the database page by page while scrolling
+        model = ViolationTableModel(self.db, [
+            ("ID", "citation_number", None),
+            ("Plate", "plate_number", None),
+            ("Violation", "violation_name", None),
+            ("Date", "violation_date", None),
+            ("Status", "status", format_status),
+        ], parent=dialog, executor=self.executor, key="admin.all_violations_page")
+        table = create_violation_view(model)
         layout.addWidget(table)
+        
         cls_btn = QPushButton("CLOSE")
+        cls_btn.setFixedSize(100, 40)
         cls_btn.clicked.connect(dialog.accept)
-        layout.addWidget(cls_btn)
+        layout.addWidget(cls_btn, alignment=Qt.AlignmentFlag.AlignRight)
+        
         dialog.setLayout(layout)
         dialog.exec()
+        # Drop a page still in flight so it is not delivered to the closed dialog's model
+        self.executor.cancel(model.key)
 
     def refresh_citizen_dashboard(self):
         # Deprecated logic, sticking to internal update_dashboard
@@ -568,6 +694,11 @@ class MainApp(QMainWindow):
         reply = QMessageBox.question(self, 'Logout', "Are you sure you want to logout?", 
                                      QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
+            # Ignore refreshes still in flight for the old session; app-wide jobs (citation
+            # sync, expiration, ...) keep running and re-arm their own timers
+            self.executor.cancel_all(keep=("app.",))
+            if self.db:
+                self.db.invalidate_owner_plates()
             self.current_user = None
             self.login_screen.password_input.clear()
             self.login_screen.username_input.clear()
@@ -577,7 +708,84 @@ class MainApp(QMainWindow):
                 widget.deleteLater()
             self.stack.setCurrentWidget(self.login_screen)
 
+    def reconcile_dashboard_counters(self):
+        if self.db and not self.executor.is_busy("app.reconcile_counters"):
+            self.executor.submit("app.reconcile_counters", self.db.reconcile_dashboard_counters)
+
+    def closeEvent(self, event):
+        self.reconcile_timer.stop()
+        self.expiration_timer.stop()
+        self.citation_sync_timer.stop()
+        self.executor.cancel_all()
+        self.executor.wait_for_done(3000)
+        if self.citation_sync:
+            self.citation_sync.journal.close()
+        if self.db:
+            self.db.close()
+        super().closeEvent(event)
+
+# Run in a child `python -X importtime` by --profile-startup: build the login window, then exit
+_STARTUP_PROBE = """
+import os, sys, time
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+_t0 = time.perf_counter()
+from PyQt6.QtWidgets import QApplication
+app = QApplication(sys.argv)
+import main
+window = main.MainApp()
+app.processEvents()
+print(f"STARTUP_MS {(time.perf_counter() - _t0) * 1000:.1f}")
+"""
+
+def profile_startup(top=25):
+    """Print an import-time report (python -X importtime) for startup up to the login window"""
+    import subprocess
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", _STARTUP_PROBE],
+                          cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True)
+
+    imports = []  # (cumulative_us, self_us, depth, module)
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((int(cumulative_us), int(self_us), depth, name.strip()))
+
+    startup_ms = next((line.split()[1] for line in proc.stdout.splitlines() if line.startswith("STARTUP_MS")), None)
+    if proc.returncode != 0 or startup_ms is None:
+        print("✗ Startup probe failed:")
+        print(proc.stderr[-2000:])
+        return 1
+
+    # importtime lists a module's own imports just before the module itself
+    top_level, main_imports, pending = [], [], []
+    for entry in imports:
+        if entry[2] == 1:
+            pending.append(entry)
+        elif entry[2] == 0:
+            top_level.append(entry)
+            if entry[3] == "main":
+                main_imports = pending
+            pending = []
+
+    print("=" * 70)
+    print(f"Startup to login window: {startup_ms} ms")
+    print(f"Modules imported: {len(imports)}, total import time: {sum(i[0] for i in top_level) / 1000:.1f} ms")
+    print("=" * 70)
+    print("Imported by main.py:")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative_us, self_us, depth, name in sorted(main_imports, reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+    print("-" * 70)
+    print("Slowest individual modules (self time):")
+    for cumulative_us, self_us, depth, name in sorted(imports, key=lambda i: i[1], reverse=True)[:10]:
+        print(f"{'':>14} {self_us / 1000:>9.1f}  {name}")
+    return 0
+
 if __name__ == '__main__':
+    if "--profile-startup" in sys.argv:
+        sys.exit(profile_startup())
+
     try:
         print("=" * 50)
         print("Nexus Monitor System - Starting...")
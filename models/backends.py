@@ -0,0 +1,308 @@
+"""
+Storage backends for DatabaseManager.
+
+A backend opens driver connections and owns the few operations whose SQL can't
+be shared between engines. DatabaseManager code is written against the
+mysql.connector API (`conn.cursor(dictionary=True)`, `%s` placeholders,
+`lastrowid`, `rowcount`); the SQLite backend wraps sqlite3 in that API and
+translates the MySQL constructs the repo uses, so the same queries and
+migrations run on both.
+
+    DatabaseManager()                                          # MySQL (default)
+    DatabaseManager(backend=SQLiteBackend("nexus_offline.db"))  # embedded, no server
+    NEXUS_DB_BACKEND=sqlite python main.py                      # see backend_from_env()
+"""
+import os
+import re
+import sqlite3
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Optional, Tuple
+
+
+class StorageBackend:
+    """Base class: connect() returns a mysql.connector-style connection or None"""
+
+    name = "base"
+    Error = Exception
+    # Failures caused by the row itself (too long, constraint violated): retrying can't help
+    data_errors = ()
+
+    def connect(self):
+        raise NotImplementedError
+
+    def reserve_block(self, cursor, sequence, count) -> int:
+        """Advance id_sequences[sequence] by count inside the caller's transaction; returns the new high value"""
+        raise NotImplementedError
+
+    def describe(self) -> str:
+        return self.name
+
+
+# ==================== MYSQL ====================
+class MySQLBackend(StorageBackend):
+    name = "mysql"
+
+    def __init__(self, host="localhost", user="root", password="", database="nexus_db"):
+        # Imported here so SQLite-only installs don't need the driver
+        import mysql.connector
+        self._driver = mysql.connector
+        self.Error = mysql.connector.Error
+        self.data_errors = (mysql.connector.DataError, mysql.connector.IntegrityError)
+        self.config = {
+            "host": host,
+            "user": user,
+            "password": password,
+            "database": database
+        }
+
+    def describe(self) -> str:
+        return f"mysql://{self.config['user']}@{self.config['host']}/{self.config['database']}"
+
+    def connect(self):
+        try:
+            return self._driver.connect(**self.config)
+        except self.Error as e:
+            if e.errno == 1049: # Unknown database
+                print(f"  - Database '{self.config['database']}' not found, creating...")
+                # Create database
+                temp_config = self.config.copy()
+                del temp_config["database"]
+                try:
+                    conn = self._driver.connect(**temp_config)
+                    cursor = conn.cursor()
+                    cursor.execute(f"CREATE DATABASE {self.config['database']}")
+                    cursor.close()
+                    conn.close()
+                    print(f"  ✓ Database '{self.config['database']}' created")
+                    return self._driver.connect(**self.config)
+                except Exception as create_err:
+                    print(f"  ✗ Error creating database: {create_err}")
+                    return None
+            elif e.errno == 2003:  # Can't connect to MySQL server
+                print(f"  ✗ Cannot connect to MySQL server. Is MySQL running?")
+                print(f"     Error: {e}")
+                return None
+            else:
+                print(f"  ✗ Error connecting to database: {e}")
+                return None
+        except Exception as e:
+            print(f"  ✗ Unexpected database error: {e}")
+            return None
+
+    def reserve_block(self, cursor, sequence, count) -> int:
+        # LAST_INSERT_ID(expr) hands the new high-water mark back in the OK packet
+        sql = "UPDATE id_sequences SET next_value = LAST_INSERT_ID(next_value + %s) WHERE name = %s"
+        cursor.execute(sql, (count, sequence))
+        if cursor.rowcount == 0:
+            # First use of this sequence; create the row and reserve again
+            cursor.execute("INSERT IGNORE INTO id_sequences (name, next_value) VALUES (%s, 0)", (sequence,))
+            cursor.execute(sql, (count, sequence))
+        return cursor.lastrowid
+
+
+# ==================== SQLITE ====================
+# Parameters are stored as ISO / decimal text. Adapted per statement by _SQLiteCursor rather than
+# with sqlite3.register_adapter(), which would change every sqlite3 connection in the process
+_ADAPTERS = {
+    Decimal: str,
+    date: lambda d: d.isoformat(),
+    datetime: lambda d: d.isoformat(" "),
+}
+
+
+def _adapt(params) -> tuple:
+    adapter = _ADAPTERS.get
+    return tuple(p if (convert := adapter(type(p))) is None else convert(p) for p in params)
+
+
+_converters_registered = False
+
+
+def _register_converters():
+    """
+    Read stored text back into the types mysql.connector returns. sqlite3 only has
+    process-wide converters; they apply to connections opened with detect_types
+    (ours, not e.g. CitationJournal's) but replace sqlite3's own "date"/"timestamp"
+    converters, so they are registered only once a SQLiteBackend is created.
+    """
+    global _converters_registered
+    if _converters_registered:
+        return
+    sqlite3.register_converter("DATE", lambda b: date.fromisoformat(b.decode()[:10]))
+    sqlite3.register_converter("DATETIME", lambda b: datetime.fromisoformat(b.decode()))
+    sqlite3.register_converter("TIMESTAMP", lambda b: datetime.fromisoformat(b.decode()))
+    sqlite3.register_converter("DECIMAL", lambda b: Decimal(b.decode()))
+    _converters_registered = True
+
+
+_LOCKING_READ = re.compile(r"\s+(FOR UPDATE|LOCK IN SHARE MODE)\b", re.IGNORECASE)
+_SQLITE_REWRITES = [
+    (re.compile(r"\bINT AUTO_INCREMENT PRIMARY KEY\b", re.IGNORECASE), "INTEGER PRIMARY KEY AUTOINCREMENT"),
+    (re.compile(r"\bENUM\([^)]*\)", re.IGNORECASE), "TEXT"),
+    (re.compile(r"\s+ON UPDATE CURRENT_TIMESTAMP\b", re.IGNORECASE), ""),
+    (re.compile(r"\bINSERT IGNORE\b", re.IGNORECASE), "INSERT OR IGNORE"),
+    # CURDATE() + INTERVAL n DAY -> date(CURDATE(), n || ' days')
+    (re.compile(r"(\w+\(\)|[\w.]+)\s*\+\s*INTERVAL\s+(%s|\d+)\s+DAY\b", re.IGNORECASE), r"date(\1, \2 || ' days')"),
+    (re.compile(r"%(s|%)"), lambda m: "?" if m.group(1) == "s" else "%"),
+]
+_UPSERT = re.compile(r"\bON DUPLICATE KEY UPDATE\b", re.IGNORECASE)
+_UPSERT_VALUES = re.compile(r"\bVALUES\((\w+)\)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=512)
+def translate_sql(sql) -> Tuple[str, bool]:
+    """MySQL statement -> (SQLite statement, whether it was a locking read)"""
+    locking = bool(_LOCKING_READ.search(sql))
+    sql = _LOCKING_READ.sub("", sql)
+    parts = _UPSERT.split(sql, maxsplit=1)
+    if len(parts) == 2:
+        # ON DUPLICATE KEY UPDATE col=VALUES(col) -> ON CONFLICT DO UPDATE SET col=excluded.col
+        sql = parts[0] + "ON CONFLICT DO UPDATE SET" + _UPSERT_VALUES.sub(r"excluded.\1", parts[1])
+    for pattern, replacement in _SQLITE_REWRITES:
+        sql = pattern.sub(replacement, sql)
+    return sql, locking
+
+
+def _datediff(a, b) -> Optional[int]:
+    if a is None or b is None:
+        return None
+    return (date.fromisoformat(str(a)[:10]) - date.fromisoformat(str(b)[:10])).days
+
+
+class _SQLiteCursor:
+    """sqlite3 cursor behind the mysql.connector cursor API used by DatabaseManager"""
+
+    dialect = "sqlite"
+
+    def __init__(self, conn, dictionary=False):
+        self._conn = conn
+        self._cursor = conn._raw.cursor()
+        self._dictionary = dictionary
+
+    def execute(self, sql, params=()):
+        sql, locking = translate_sql(sql)
+        if locking and not self._conn._raw.in_transaction:
+            # SQLite locks the whole database; take the write lock up front like SELECT ... FOR UPDATE would
+            self._cursor.execute("BEGIN IMMEDIATE")
+        self._cursor.execute(sql, _adapt(params or ()))
+
+    def executemany(self, sql, rows):
+        self._cursor.executemany(translate_sql(sql)[0], (_adapt(row) for row in rows))
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip((col[0] for col in self._cursor.description), row))
+
+    def fetchone(self):
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size=1):
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def close(self):
+        self._cursor.close()
+
+
+class _SQLiteConnection:
+    def __init__(self, raw):
+        self._raw = raw
+
+    def cursor(self, dictionary=False, buffered=None):
+        return _SQLiteCursor(self, dictionary)
+
+    def commit(self):
+        self._raw.commit()
+
+    def rollback(self):
+        self._raw.rollback()
+
+    def close(self):
+        self._raw.close()
+
+    def is_connected(self) -> bool:
+        try:
+            self._raw.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    Embedded single-file database for offline field offices, tests and benchmarks.
+
+    WAL journaling lets readers run alongside the writer, sqlite3's per-connection
+    statement cache keeps every distinct query prepared, and the file is read
+    through mmap (`mmap_size` bytes). Pooled connections each open the same file.
+    """
+
+    name = "sqlite"
+    Error = sqlite3.Error
+    data_errors = (sqlite3.DataError, sqlite3.IntegrityError)
+
+    def __init__(self, path="nexus_offline.db", mmap_size=256 * 1024 * 1024, cached_statements=256,
+                 busy_timeout=10.0, synchronous="NORMAL"):
+        self.path = path
+        self.mmap_size = mmap_size
+        self.cached_statements = cached_statements
+        self.busy_timeout = busy_timeout
+        self.synchronous = synchronous
+        _register_converters()
+
+    def describe(self) -> str:
+        return f"sqlite:///{self.path}"
+
+    def connect(self):
+        try:
+            # check_same_thread=False: the pool hands a connection to one thread at a time
+            raw = sqlite3.connect(self.path, timeout=self.busy_timeout, detect_types=sqlite3.PARSE_DECLTYPES,
+                                  check_same_thread=False, cached_statements=self.cached_statements)
+            raw.execute("PRAGMA journal_mode=WAL")
+            raw.execute(f"PRAGMA synchronous={self.synchronous}")
+            raw.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+            raw.execute("PRAGMA foreign_keys=ON")
+            # MySQL functions used by the shared queries
+            raw.create_function("CURDATE", 0, lambda: date.today().isoformat())
+            raw.create_function("NOW", 0, lambda: datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            raw.create_function("DATEDIFF", 2, _datediff, deterministic=True)
+            raw.create_function("YEAR", 1, lambda d: int(str(d)[:4]) if d else None, deterministic=True)
+            raw.create_function("MONTH", 1, lambda d: int(str(d)[5:7]) if d else None, deterministic=True)
+            return _SQLiteConnection(raw)
+        except sqlite3.Error as e:
+            print(f"  ✗ Error opening SQLite database {self.path}: {e}")
+            return None
+
+    def reserve_block(self, cursor, sequence, count) -> int:
+        # The UPDATE takes SQLite's write lock, so the read-back sees only our increment
+        sql = "UPDATE id_sequences SET next_value = next_value + %s WHERE name = %s"
+        cursor.execute(sql, (count, sequence))
+        if cursor.rowcount == 0:
+            cursor.execute("INSERT IGNORE INTO id_sequences (name, next_value) VALUES (%s, 0)", (sequence,))
+            cursor.execute(sql, (count, sequence))
+        cursor.execute("SELECT next_value FROM id_sequences WHERE name = %s", (sequence,))
+        return cursor.fetchone()[0]
+
+
+def backend_from_env() -> Optional[StorageBackend]:
+    """SQLiteBackend when NEXUS_DB_BACKEND=sqlite (file from NEXUS_SQLITE_PATH), else None (MySQL default)"""
+    if os.environ.get("NEXUS_DB_BACKEND", "mysql").lower() == "sqlite":
+        return SQLiteBackend(os.environ.get("NEXUS_SQLITE_PATH", "nexus_offline.db"))
+    return None
@@ -0,0 +1,143 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+
+class CachedValue:
+    """
+    Read-through cache for a single value (e.g. a small lookup table).
+
+    get() returns the cached value while it is younger than `ttl` seconds and
+    calls `loader` otherwise. invalidate() forces the next get() to reload.
+    A loader that raises leaves the cache empty, so failures are never cached.
+    """
+
+    def __init__(self, loader: Callable, ttl: Optional[float] = 300):
+        self._loader = loader
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._value = None
+        self._loaded_at = None
+        self._generation = 0
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def get(self, refresh=False):
+        with self._lock:
+            if not refresh and self._fresh():
+                self._stats["hits"] += 1
+                return self._value
+            self._stats["misses"] += 1
+            generation = self._generation
+
+        # Load outside the lock so a slow query doesn't block readers of a fresh value
+        value = self._loader()
+        with self._lock:
+            # Don't overwrite with a value read before a concurrent invalidate()
+            if generation == self._generation:
+                self._value = value
+                self._loaded_at = time.monotonic()
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._value = None
+            self._loaded_at = None
+            self._generation += 1
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["ttl"] = self.ttl
+            snapshot["age"] = time.monotonic() - self._loaded_at if self._loaded_at is not None else None
+        return snapshot
+
+    def _fresh(self) -> bool:
+        if self._loaded_at is None:
+            return False
+        return self.ttl is None or time.monotonic() - self._loaded_at < self.ttl
+
+
+class LRUCache:
+    """
+    Bounded read-through cache keyed by argument (e.g. vehicle records by plate).
+
+    get(arg) returns the entry for key(arg) while it is younger than `ttl`
+    seconds and calls loader(key(arg)) otherwise, so an entry is always what its
+    key loads; beyond `maxsize` entries the least recently used one is evicted. A loader that raises or returns None leaves
+    nothing behind, so failures and "not found" are retried on the next get().
+    Loads that started before an invalidate() are not stored.
+    """
+
+    def __init__(self, loader: Callable, maxsize=1024, ttl: Optional[float] = None, key: Callable = None):
+        self._loader = loader
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._key = key or (lambda arg: arg)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Any, tuple]" = OrderedDict()  # key -> (value, loaded_at)
+        self._generation = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def get(self, arg, refresh=False):
+        key = self._key(arg)
+        with self._lock:
+            if refresh:
+                self._stats["misses"] += 1
+            else:
+                value = self._lookup(key)
+                if value is not None:
+                    return value
+            generation = self._generation
+
+        value = self._loader(key)
+        if value is not None:
+            with self._lock:
+                if generation == self._generation:
+                    self._entries[key] = (value, time.monotonic())
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+                        self._stats["evictions"] += 1
+        return value
+
+    def peek(self, arg):
+        """The cached entry for arg, or None; never calls the loader and leaves stats and LRU order alone"""
+        with self._lock:
+            entry = self._entries.get(self._key(arg))
+        if entry is None or (self.ttl is not None and time.monotonic() - entry[1] >= self.ttl):
+            return None
+        return entry[0]
+
+    def invalidate(self, arg=None):
+        """Drop the entry for arg, or every entry (arg=None)"""
+        with self._lock:
+            if arg is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(self._key(arg), None)
+            self._generation += 1
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot.update(size=len(self._entries), maxsize=self.maxsize, ttl=self.ttl)
+        lookups = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_rate"] = snapshot["hits"] / lookups if lookups else None
+        return snapshot
+
+    def _lookup(self, key):
+        """Caller holds the lock; counts the hit or miss"""
+        entry = self._entries.get(key)
+        if entry is not None and self.ttl is not None and time.monotonic() - entry[1] >= self.ttl:
+            del self._entries[key]
+            self._stats["expirations"] += 1
+            entry = None
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        return entry[0]
@@ -1,179 +1,157 @@
-import mysql.connector
 import hashlib
-from datetime import datetime
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Tuple
 
+from models.backends import MySQLBackend
+from models.cache import CachedValue, LRUCache
+from models.metrics import QueryMetrics, instrument
+from models.plate_index import PlateIndex
+from models.pool import ConnectionPool, PoolTimeout
+from models.sequences import BlockSequence
+from models.migrations import migrate, SCHEMA_VERSION
+
+# Vehicles whose registration lapses within this many days are 'expiring'
+EXPIRING_WINDOW_DAYS = 30
+# job_runs marker for DatabaseManager.run_daily_expiration()
+EXPIRATION_JOB = "vehicle_expiration"
+
+# Columns of the single-row dashboard_counters table, in get_dashboard_stats() key order
+DASHBOARD_COUNTERS = ("users", "enforcers", "vehicles", "violations", "pending_violations", "fines")
+# Public methods that aren't timed by QueryMetrics: connection plumbing and in-memory reads
+UNINSTRUMENTED = ("connect", "connection", "close", "get_pool_stats", "get_violation_type_cache_stats",
+                  "get_hot_plate_cache_stats", "get_query_metrics", "suggest_plates", "resolve_plate",
+                  "is_registered_plate")
+
 class DatabaseManager:
-    def __init__(self, host="localhost", user="root", password="", database="nexus_db"):
-        self.config = {
-            "host": host,
-            "user": user,
-            "password": password,
-            "database": database
-        }
-        self.create_tables()
-        self.seed_initial_data()
+    def __init__(self, host="localhost", user="root", password="", database="nexus_db",
+                 pool_size=5, max_overflow=10, pool_idle_timeout=300, pool_timeout=10, pool_pre_ping=True,
+                 auto_bootstrap=True, violation_types_ttl=300, owner_plates_ttl=300, citation_block_size=100,
+                 backend=None, plate_index_ttl=900, hot_plates_size=2048, hot_plates_ttl=60,
+                 instrument_queries=True, slow_query_ms=200, slow_query_log=None, slow_query_params=False):
+        # Storage engine (models/backends.py); host/user/password/database configure the MySQL default
+        self.backend = backend or MySQLBackend(host, user, password, database)
+        self.pool = ConnectionPool(
+            self.backend.connect,
+            size=pool_size,
+            max_overflow=max_overflow,
+            idle_timeout=pool_idle_timeout,
+            timeout=pool_timeout,
+            pre_ping=pool_pre_ping
+        )
+        # Active violation types rarely change: add_violation_type() invalidates the cache
+        # and the TTL picks up edits made by other clients (None = never expire)
+        self.violation_types = CachedValue(self._load_violation_types, ttl=violation_types_ttl)
+        # Citation numbers come from blocks reserved in id_sequences (one round trip per block)
+        self.citation_sequence = BlockSequence(self, "citation", block_size=citation_block_size)
+        # Citizen plate lists, one cache per owner; vehicle writes invalidate them
+        self.owner_plates_ttl = owner_plates_ttl
+        self._owner_plates: Dict[int, CachedValue] = {}
+        self._owner_plates_lock = threading.Lock()
+        # Type-ahead / fuzzy plate lookups; built by warm_plate_index(), kept current by this
+        # client's vehicle writes and rebuilt after plate_index_ttl for other clients' writes
+        self.plate_index = PlateIndex()
+        self.plate_index_ttl = plate_index_ttl
+        # Recently searched vehicles (vehicle and owner row) by plate as stored; the loader queries
+        # with that key too, so "xyz 999" finds "XYZ 999" on case-sensitive SQLite as on MySQL.
+        # Violation history is always read fresh. This client's vehicle and owner writes
+        # invalidate entries, the TTL bounds staleness from other terminals
+        self.hot_plates = LRUCache(self._load_vehicle_record, maxsize=hot_plates_size, ttl=hot_plates_ttl,
+                                   key=lambda plate: str(plate).strip().upper())
+        # Per-method latency histograms and a slow-query log (models/metrics.py); None when disabled
+        self.metrics = None
+        if instrument_queries:
+            self.metrics = QueryMetrics(slow_query_ms=slow_query_ms, slow_log_path=slow_query_log,
+                                        log_params=slow_query_params)
+            instrument(self, self.metrics, exclude=UNINSTRUMENTED)
+        # Pass auto_bootstrap=False to decide when (and on which thread) bootstrap() runs
+        if auto_bootstrap:
+            self.bootstrap()
 
     def connect(self):
+        """Borrow a pooled connection; calling close() on it returns it to the pool"""
+        started = time.perf_counter()
         try:
-            return mysql.connector.connect(**self.config)
-        except mysql.connector.Error as e:
-            if e.errno == 1049: # Unknown database
-                print(f"  - Database '{self.config['database']}' not found, creating...")
-                # Create database
-                temp_config = self.config.copy()
-                del temp_config["database"]
-                try:
-                    conn = mysql.connector.connect(**temp_config)
-                    cursor = conn.cursor()
-                    cursor.execute(f"CREATE DATABASE {self.config['database']}")
-                    cursor.close()
-                    conn.close()
-                    print(f"  ✓ Database '{self.config['database']}' created")
-                    return mysql.connector.connect(**self.config)
-                except Exception as create_err:
-                    print(f"  ✗ Error creating database: {create_err}")
-                    return None
-            elif e.errno == 2003:  # Can't connect to MySQL server
-                print(f"  ✗ Cannot connect to MySQL server. Is MySQL running?")
-                print(f"     Error: {e}")
-                return None
+            conn = self.pool.acquire()
+        except PoolTimeout as e:
+            print(f"  ✗ Database pool exhausted: {e}")
+            conn = None
+        if self.metrics:
+            elapsed = time.perf_counter() - started
+            if conn is None:
+                self.metrics.observe_connect(self.metrics.current(), elapsed)
             else:
-                print(f"  ✗ Error connecting to database: {e}")
-                return None
-        except Exception as e:
-            print(f"  ✗ Unexpected database error: {e}")
-            return None
+                conn = self.metrics.wrap_connection(conn, elapsed)
+        return conn
 
-    def create_tables(self):
-        print("  - Creating database tables...")
+    @contextmanager
+    def connection(self):
+        """Context-manager form of connect(): `with db.connection() as conn: ...`"""
         conn = self.connect()
-        if not conn: 
-            print("  ⚠ Could not connect to database")
-            return
-        cursor = conn.cursor()
-        
         try:
-            # 1. USERS TABLE
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS users (
-                    user_id INT AUTO_INCREMENT PRIMARY KEY,
-                    username VARCHAR(50) UNIQUE NOT NULL,
-                    password VARCHAR(255) NOT NULL,
-                    full_name VARCHAR(100) NOT NULL,
-                    email VARCHAR(100),
-                    phone VARCHAR(20),
-                    role ENUM('admin', 'enforcer', 'citizen') NOT NULL,
-                    department VARCHAR(100),
-                    office_location VARCHAR(100),
-                    status VARCHAR(20) DEFAULT 'active',
-                    last_login DATETIME,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
+            yield conn
+        finally:
+            if conn:
+                conn.close()
 
-            # 2. VEHICLES TABLE
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS vehicles (
-                    vehicle_id INT AUTO_INCREMENT PRIMARY KEY,
-                    plate_number VARCHAR(20) UNIQUE NOT NULL,
-                    owner_id INT NOT NULL,
-                    make VARCHAR(50),
-                    model VARCHAR(50),
-                    year INT,
-                    color VARCHAR(30),
-                    chassis_number VARCHAR(50) UNIQUE,
-                    registration_date DATE,
-                    expiry_date DATE,
-                    or_cr_number VARCHAR(50) UNIQUE,
-                    status ENUM('active', 'expired', 'expiring') DEFAULT 'active',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (owner_id) REFERENCES users(user_id)
-                )
-            """)
-            
-            # Add status column if it doesn't exist (for existing databases)
-            try:
-                cursor.execute("ALTER TABLE vehicles ADD COLUMN status ENUM('active', 'expired', 'expiring') DEFAULT 'active'")
-                print("  - Added status column to vehicles table")
-            except mysql.connector.Error:
-                pass  # Column already exists
+    def get_pool_stats(self) -> Dict:
+        return self.pool.stats()
 
-            # 3. VIOLATION TYPES TABLE
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS violation_types (
-                    type_id INT AUTO_INCREMENT PRIMARY KEY,
-                    violation_name VARCHAR(100) UNIQUE NOT NULL,
-                    fine_amount DECIMAL(10, 2) NOT NULL,
-                    description TEXT,
-                    penalty_points INT DEFAULT 0,
-                    status VARCHAR(20) DEFAULT 'active',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
+    def get_query_metrics(self) -> Dict:
+        """QueryMetrics snapshot (per-method histograms and counters); {} when instrumentation is off"""
+        return self.metrics.snapshot() if self.metrics else {}
 
-            # 4. VIOLATIONS TABLE
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS violations (
-                    violation_id INT AUTO_INCREMENT PRIMARY KEY,
-                    citation_number VARCHAR(50) UNIQUE,
-                    plate_number VARCHAR(20) NOT NULL,
-                    vehicle_id INT,
-                    violation_type_id INT NOT NULL,
-                    enforcer_id INT NOT NULL,
-                    location VARCHAR(255) NOT NULL,
-                    violation_date DATETIME NOT NULL,
-                    fine_amount DECIMAL(10, 2) NOT NULL,
-                    status VARCHAR(20) DEFAULT 'pending',
-                    notes TEXT,
-                    photo_evidence TEXT,
-                    payment_date TIMESTAMP NULL,
-                    payment_method VARCHAR(50),
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (vehicle_id) REFERENCES vehicles(vehicle_id),
-                    FOREIGN KEY (violation_type_id) REFERENCES violation_types(type_id),
-                    FOREIGN KEY (enforcer_id) REFERENCES users(user_id)
-                )
-            """)
+    def close(self):
+        self.pool.dispose()
 
-            # 5. OFFICERS TABLE
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS officers (
-                    officer_id INT AUTO_INCREMENT PRIMARY KEY,
-                    user_id INT UNIQUE NOT NULL,
-                    badge_number VARCHAR(50) UNIQUE NOT NULL,
-                    assigned_area VARCHAR(100),
-                    duty_status VARCHAR(20) DEFAULT 'off-duty',
-                    shift_start TIME,
-                    shift_end TIME,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users(user_id)
-                )
-            """)
+    def schema_version(self) -> int:
+        """Applied schema version, or 0 if the database has never been migrated"""
+        conn = self.connect()
+        if not conn: return 0
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT MAX(version) FROM schema_migrations")
+            row = cursor.fetchone()
+            return row[0] or 0
+        except self.backend.Error:
+            return 0  # schema_migrations does not exist yet
+        finally:
+            cursor.close()
+            conn.close()
 
-            # 6. PAYMENTS TABLE
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS payments (
-                    payment_id INT AUTO_INCREMENT PRIMARY KEY,
-                    violation_id INT NOT NULL,
-                    user_id INT NOT NULL,
-                    amount DECIMAL(10, 2) NOT NULL,
-                    payment_method VARCHAR(50) NOT NULL,
-                    payment_details TEXT,
-                    transaction_reference VARCHAR(100),
-                    status VARCHAR(20) DEFAULT 'completed',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (violation_id) REFERENCES violations(violation_id),
-                    FOREIGN KEY (user_id) REFERENCES users(user_id)
-                )
-            """)
+    def needs_bootstrap(self) -> bool:
+        return self.schema_version() < SCHEMA_VERSION
 
-            conn.commit()
-            print("  ✓ Tables verified")
+    def bootstrap(self, force=False) -> bool:
+        """
+        Run migrations and seed default data, unless the schema is already current.
+        A current schema costs a single query; returns True if bootstrap work ran.
+        """
+        if not force and not self.needs_bootstrap():
+            print(f"  ✓ Schema current (version {SCHEMA_VERSION}), skipping bootstrap")
+            return False
+        self.create_tables()
+        self.seed_initial_data()
+        return True
+
+    def create_tables(self):
+        """Bring the schema up to date by applying pending migrations (see models/migrations.py)"""
+        print("  - Checking database schema...")
+        conn = self.connect()
+        if not conn: 
+            print("  ⚠ Could not connect to database")
+            return
+        try:
+            applied = migrate(conn)
+            if applied:
+                print(f"  ✓ Schema migrated to version {SCHEMA_VERSION} (applied {applied})")
+            else:
+                print(f"  ✓ Schema up to date (version {SCHEMA_VERSION})")
         except Exception as e:
-            print(f"  ⚠ Error creating tables: {e}")
+            print(f"  ⚠ Error migrating schema: {e}")
         finally:
-            cursor.close()
             conn.close()
 
     def seed_initial_data(self):
@@ -193,6 +171,7 @@ class DatabaseManager:
                 return row['user_id'] if row else None
 
             print("  - Seeding initial data...")
+            seeded = False
 
             # USERS
             admin_id = get_user_id("admin")
@@ -202,6 +181,7 @@ class DatabaseManager:
                     INSERT INTO users (username, password, full_name, email, role, department, office_location) 
                     VALUES (%s, %s, %s, %s, %s, %s, %s)
                 """, ("admin", admin_pass, "System Administrator", "admin@lto.gov.ph", "admin", "IT Department", "Davao District Office"))
+                seeded = True
                 admin_id = cursor.lastrowid
 
             enforcer_id = get_user_id("enforcer01")
@@ -211,6 +191,7 @@ class DatabaseManager:
                     INSERT INTO users (username, password, full_name, email, phone, role, department, office_location) 
                     VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
                 """, ("enforcer01", enf_pass, "Officer Juan Santos", "juan@lto.gov.ph", "09171234567", "enforcer", "Traffic Enforcement", "Davao District Office"))
+                seeded = True
                 enforcer_id = cursor.lastrowid
 
             # OFFICER RECORD (only if missing)
@@ -221,6 +202,7 @@ class DatabaseManager:
                         INSERT INTO officers (user_id, badge_number, assigned_area, duty_status) 
                         VALUES (%s, %s, %s, %s)
                     """, (enforcer_id, "OFF-2024-001", "EDSA-Shaw", "on-duty"))
+                    seeded = True
 
             citizen_id = get_user_id("juandelacruz")
             if not citizen_id:
@@ -229,6 +211,7 @@ class DatabaseManager:
                     INSERT INTO users (username, password, full_name, email, phone, role, office_location) 
                     VALUES (%s, %s, %s, %s, %s, %s, %s)
                 """, ("juandelacruz", cit_pass, "Juan Dela Cruz", "juan@email.com", "09181234567", "citizen", "Davao District Office"))
+                seeded = True
                 citizen_id = cursor.lastrowid
 
             # VEHICLE (only if missing)
@@ -239,6 +222,7 @@ class DatabaseManager:
                         INSERT INTO vehicles (plate_number, owner_id, make, model, year, color, chassis_number, registration_date, expiry_date, or_cr_number)
                         VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                     """, ("ABC 1234", citizen_id, "Toyota", "Vios", 2022, "White", "ABC123XYZ", "2022-01-15", "2025-01-15", "OR-2022-123"))
+                    seeded = True
                     vehicle_id = cursor.lastrowid
                 else:
                     vehicle_id = cursor.fetchone()
@@ -262,6 +246,7 @@ class DatabaseManager:
                         INSERT INTO violation_types (violation_name, fine_amount, description, penalty_points) 
                         VALUES (%s, %s, %s, %s)
                     """, v)
+                    seeded = True
 
             # Sample Violation (only if data exists and citation missing)
             if vehicle_id and enforcer_id:
@@ -272,9 +257,16 @@ class DatabaseManager:
                         INSERT INTO violations (plate_number, vehicle_id, violation_type_id, enforcer_id, location, violation_date, fine_amount, status, citation_number)
                         VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
                     """, ("ABC 1234", vehicle_id, 2, enforcer_id, "EDSA", now, 1500.00, "pending", "CIT-2024-001"))
+                    seeded = True
 
             conn.commit()
             print("  ✓ Initial data seeded/verified")
+            self.violation_types.invalidate()
+
+            # Seed rows bypass the counter bookkeeping; rebuild counters if anything was added
+            cursor.execute("SELECT counter_id FROM dashboard_counters WHERE counter_id = 1")
+            if seeded or not cursor.fetchone():
+                self.reconcile_dashboard_counters()
 
         except Exception as e:
             print(f"  ⚠ Error seeding data: {e}")
@@ -315,9 +307,11 @@ class DatabaseManager:
                 INSERT INTO users (username, password, full_name, email, phone, role, department, office_location)
                 VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
             """, (username, hashed, full_name, email, phone, role, department, office_location))
+            user_id = cursor.lastrowid
+            self._bump_counters(cursor, users=1, enforcers=1 if role == 'enforcer' else 0)
             conn.commit()
-            return cursor.lastrowid
-        except mysql.connector.Error as e:
+            return user_id
+        except self.backend.Error as e:
             print(f"Error adding user: {e}")
             return -1
         finally:
@@ -346,7 +340,7 @@ class DatabaseManager:
         try:
             from datetime import date, timedelta
             today = date.today()
-            expiring_threshold = today + timedelta(days=30)
+            expiring_threshold = today + timedelta(days=EXPIRING_WINDOW_DAYS)
             
             # Determine initial status based on expiry_date
             if expiry_date and expiry_date < today:
@@ -360,9 +354,13 @@ class DatabaseManager:
                 INSERT INTO vehicles (plate_number, owner_id, make, model, year, color, chassis_number, registration_date, expiry_date, or_cr_number, status)
                 VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             """, (plate_number, owner_id, make, model, year, color, chassis_number, registration_date, expiry_date, or_cr_number, initial_status))
+            vehicle_id = cursor.lastrowid
+            self._bump_counters(cursor, vehicles=1)
             conn.commit()
-            return cursor.lastrowid
-        except mysql.connector.Error as e:
+            self.invalidate_owner_plates(owner_id)
+            self.plate_index.add(plate_number)
+            return vehicle_id
+        except self.backend.Error as e:
             print(f"Error adding vehicle: {e}")
             return -1
         finally:
@@ -370,22 +368,18 @@ class DatabaseManager:
             conn.close()
 
     def search_vehicle(self, plate_number) -> Optional[Dict]:
-        conn = self.connect()
-        cursor = conn.cursor(dictionary=True)
+        """Vehicle and owner details for a plate (served from the hot-plate cache when possible)"""
         try:
-            cursor.execute("""
-                SELECT v.*, u.full_name as owner_name, u.phone as owner_phone 
-                FROM vehicles v 
-                JOIN users u ON v.owner_id = u.user_id 
-                WHERE v.plate_number = %s
-            """, (plate_number,))
-            return cursor.fetchone()
-        finally:
-            cursor.close()
-            conn.close()
+            vehicle = self.hot_plates.get(plate_number)
+        except ConnectionError:
+            return None
+        # A copy, so callers can't change what the next lookup returns
+        return dict(vehicle) if vehicle else None
 
     def get_vehicles_by_owner(self, owner_id) -> List[Dict]:
+        """One owner's vehicles, newest first (served by idx_vehicles_owner_created)"""
         conn = self.connect()
+        if not conn: return []
         cursor = conn.cursor(dictionary=True)
         try:
             cursor.execute("SELECT * FROM vehicles WHERE owner_id=%s ORDER BY created_at DESC", (owner_id,))
@@ -396,6 +390,80 @@ class DatabaseManager:
             cursor.close()
             conn.close()
 
+    def get_owner_plates(self, owner_id, refresh=False) -> List[str]:
+        """Plate numbers registered to owner_id, cached per owner until a vehicle write or the TTL"""
+        with self._owner_plates_lock:
+            cache = self._owner_plates.get(owner_id)
+            if cache is None:
+                cache = CachedValue(lambda: self._load_owner_plates(owner_id), ttl=self.owner_plates_ttl)
+                self._owner_plates[owner_id] = cache
+        try:
+            return list(cache.get(refresh=refresh))
+        except Exception as e:
+            print(f"Error loading plates for owner {owner_id}: {e}")
+            return []
+
+    def invalidate_owner_plates(self, owner_id=None):
+        """Drop one owner's cached plates, or every owner's (owner_id=None, e.g. on logout)"""
+        with self._owner_plates_lock:
+            if owner_id is None:
+                self._owner_plates.clear()
+            else:
+                self._owner_plates.pop(owner_id, None)
+
+    def _load_owner_plates(self, owner_id) -> List[str]:
+        conn = self.connect()
+        if not conn:
+            raise ConnectionError("no database connection available")
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT plate_number FROM vehicles WHERE owner_id=%s ORDER BY created_at DESC", (owner_id,))
+            return [row[0] for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+            conn.close()
+
+    def warm_plate_index(self, refresh=False) -> int:
+        """Build the plate index from vehicles if it is missing or older than plate_index_ttl; returns its size"""
+        age = self.plate_index.age()
+        if not refresh and age is not None and (self.plate_index_ttl is None or age < self.plate_index_ttl):
+            return len(self.plate_index)
+        conn = self.connect()
+        if not conn: return len(self.plate_index)
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT plate_number FROM vehicles")
+
+            def plates():
+                while True:
+                    rows = cursor.fetchmany(10000)
+                    if not rows:
+                        return
+                    for row in rows:
+                        yield row[0]
+
+            self.plate_index.build(plates())
+        except Exception as e:
+            print(f"Error building plate index: {e}")
+        finally:
+            cursor.close()
+            conn.close()
+        return len(self.plate_index)
+
+    def suggest_plates(self, query, limit=10) -> List[str]:
+        """Type-ahead / did-you-mean plates from the in-memory index ([] until warm_plate_index() has run)"""
+        return self.plate_index.suggest(query, limit)
+
+    def resolve_plate(self, query) -> str:
+        """Plate as stored for a loosely typed query ("abc1234" -> "ABC 1234"); the query itself if unknown"""
+        return self.plate_index.lookup(query) or query.strip().upper()
+
+    def is_registered_plate(self, plate) -> Optional[bool]:
+        """Whether plate (as stored) belongs to a registered vehicle, from the plate index; None until it is built"""
+        if self.plate_index.age() is None:
+            return None
+        return self.plate_index.lookup(plate) == plate
+
     # ==================== VIOLATION MANAGEMENT ====================
     def add_violation_type(self, name, fine, description, points) -> bool:
         conn = self.connect()
@@ -406,6 +474,7 @@ class DatabaseManager:
                 VALUES (%s, %s, %s, %s)
             """, (name, fine, description, points))
             conn.commit()
+            self.violation_types.invalidate()
             return True
         except:
             return False
@@ -413,8 +482,56 @@ class DatabaseManager:
             cursor.close()
             conn.close()
 
-    def get_all_violation_types(self) -> List[Dict]:
+    def get_all_violation_types(self, refresh=False) -> List[Dict]:
+        """Active violation types from the in-process cache; refresh=True reloads from the database"""
+        try:
+            types = self.violation_types.get(refresh=refresh)
+        except Exception as e:
+            print(f"Error loading violation types: {e}")
+            return []
+        # Copies, so callers can't mutate the cached rows
+        return [dict(t) for t in types]
+
+    def refresh_violation_types(self) -> List[Dict]:
+        return self.get_all_violation_types(refresh=True)
+
+    def get_violation_type_cache_stats(self) -> Dict:
+        return self.violation_types.stats()
+
+    def get_violation_fine(self, type_id, cursor=None) -> float:
+        """
+        Fine amount for a violation type. Active types come from the cache; anything else
+        (e.g. a type deactivated after the form was opened) is read from the database.
+        Returns 0 for an unknown type.
+        """
+        try:
+            for vtype in self.violation_types.get():
+                if vtype['type_id'] == type_id:
+                    return vtype['fine_amount']
+        except Exception as e:
+            print(f"Error loading violation types: {e}")
+
+        conn = None
+        if cursor is None:
+            conn = self.connect()
+            if not conn: return 0
+            cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT fine_amount FROM violation_types WHERE type_id=%s", (type_id,))
+            res = cursor.fetchone()
+            if not res:
+                return 0
+            return res['fine_amount'] if isinstance(res, dict) else res[0]
+        finally:
+            if conn:
+                cursor.close()
+                conn.close()
+
+    def _load_violation_types(self) -> List[Dict]:
+        """Cache loader; raises rather than returning [] so a failed read is never cached"""
         conn = self.connect()
+        if not conn:
+            raise ConnectionError("no database connection available")
         cursor = conn.cursor(dictionary=True)
         try:
             cursor.execute("SELECT * FROM violation_types WHERE status='active'")
@@ -424,28 +541,35 @@ class DatabaseManager:
             conn.close()
 
     def add_violation(self, plate_number, violation_type_id, enforcer_id, location, violation_date, notes=None) -> int:
+        try:
+            # Before taking a connection: a new citation block or a violation-type cache
+            # reload borrows one of its own
+            citation = self.next_citation_number()
+            fine = self.get_violation_fine(violation_type_id)
+        except Exception as e:
+            print(f"Error adding violation: {e}")
+            return -1
         conn = self.connect()
         cursor = conn.cursor()
         try:
-            # Get vehicle info
-            vehicle = self.search_vehicle(plate_number)
-            vehicle_id = vehicle['vehicle_id'] if vehicle else None
-            
-            # Get violation type info
-            cursor.execute("SELECT fine_amount FROM violation_types WHERE type_id=%s", (violation_type_id,))
-            res = cursor.fetchone()
-            fine = res[0] if res else 0
-            
-            # Generate Citation
-            citation = f"CIT-{datetime.now().strftime('%Y%m%d')}-{int(datetime.now().timestamp())}"
+            # Get vehicle info (cached if just searched, else on this connection; unregistered plates are still cited)
+            cached = self.hot_plates.peek(plate_number)
+            if cached:
+                vehicle_id = cached["vehicle_id"]
+            else:
+                cursor.execute("SELECT vehicle_id FROM vehicles WHERE plate_number=%s", (plate_number,))
+                vehicle = cursor.fetchone()
+                vehicle_id = vehicle[0] if vehicle else None
             
             cursor.execute("""
                 INSERT INTO violations (citation_number, plate_number, vehicle_id, violation_type_id, enforcer_id, location, violation_date, fine_amount, notes)
                 VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
             """, (citation, plate_number, vehicle_id, violation_type_id, enforcer_id, location, violation_date, fine, notes))
+            violation_id = cursor.lastrowid
+            self._bump_counters(cursor, violations=1, pending_violations=1)
             
             conn.commit()
-            return cursor.lastrowid
+            return violation_id
         except Exception as e:
             print(f"Error adding violation: {e}")
             return -1
@@ -453,6 +577,154 @@ class DatabaseManager:
             cursor.close()
             conn.close()
 
+    def add_violations_bulk(self, records, chunk_size=1000) -> List[Dict]:
+        """
+        Insert many violations (camera/handheld batches). Each record is a dict with
+        plate_number, violation_type_id, enforcer_id, location, violation_date and optional notes
+        and client_ref (idempotency key: a record whose client_ref is already stored returns
+        that row with existing=True instead of being inserted again).
+        Vehicles, fines and enforcers are resolved once per batch; rows are written with
+        executemany in chunks of chunk_size, each chunk committed with its counter update.
+        Returns one {'violation_id', 'citation_number', 'error', 'retryable', 'existing'} per
+        record, in input order. Failed records have violation_id -1 and an error; retryable
+        is True for database/connection failures, False for records that will never insert.
+        A chunk that fails on one bad row (backend.data_errors) is retried row by row, so
+        only that row fails.
+        """
+        required = ('plate_number', 'violation_type_id', 'enforcer_id', 'location', 'violation_date')
+        outcomes = [{'violation_id': -1, 'citation_number': None, 'error': None, 'retryable': False, 'existing': False}
+                    for _ in records]
+        valid = []
+        for i, rec in enumerate(records):
+            missing = [field for field in required if not rec.get(field)]
+            if missing:
+                outcomes[i]['error'] = f"missing {', '.join(missing)}"
+            else:
+                valid.append(i)
+        if not valid:
+            return outcomes
+
+        # Numbers for every record that may be inserted and the active fines, taken before holding a
+        # connection (a new block or a cache reload borrows one of its own); numbers of records
+        # rejected below are skipped, never reused
+        try:
+            citations = iter(self.next_citation_numbers(len(valid)))
+            fines = {t['type_id']: t['fine_amount'] for t in self.get_all_violation_types()}
+        except Exception as e:
+            for i in valid:
+                outcomes[i].update(error=str(e), retryable=True)
+            return outcomes
+        conn = self.connect()
+        if not conn:
+            for i in valid:
+                outcomes[i].update(error="no database connection", retryable=True)
+            return outcomes
+        cursor = conn.cursor()
+        try:
+            plates = {records[i]['plate_number'] for i in valid}
+            vehicle_ids = dict(self._select_in(cursor, "SELECT plate_number, vehicle_id FROM vehicles WHERE plate_number IN ({})", plates))
+            unknown_types = {records[i]['violation_type_id'] for i in valid} - set(fines)
+            # Deactivated types are still valid for citations; only missing ones are rejected
+            fines.update(self._select_in(cursor, "SELECT type_id, fine_amount FROM violation_types WHERE type_id IN ({})", unknown_types))
+            enforcers = {row[0] for row in self._select_in(cursor, "SELECT user_id FROM users WHERE user_id IN ({})", {records[i]['enforcer_id'] for i in valid})}
+            refs = {records[i]['client_ref'] for i in valid if records[i].get('client_ref')}
+            stored = {ref: (vid, citation) for ref, vid, citation in self._select_in(
+                cursor, "SELECT client_ref, violation_id, citation_number FROM violations WHERE client_ref IN ({})", refs)}
+
+            accepted, seen_refs = [], set()
+            for i in valid:
+                rec = records[i]
+                ref = rec.get('client_ref')
+                if ref in stored:
+                    vid, citation = stored[ref]
+                    outcomes[i].update(violation_id=vid, citation_number=citation, existing=True)
+                elif ref and ref in seen_refs:
+                    outcomes[i]['error'] = f"duplicate client_ref {ref} in batch"
+                elif rec['violation_type_id'] not in fines:
+                    outcomes[i]['error'] = f"unknown violation type {rec['violation_type_id']}"
+                elif rec['enforcer_id'] not in enforcers:
+                    outcomes[i]['error'] = f"unknown enforcer {rec['enforcer_id']}"
+                else:
+                    accepted.append(i)
+                    if ref:
+                        seen_refs.add(ref)
+
+            sql = """
+                INSERT INTO violations (citation_number, plate_number, vehicle_id, violation_type_id, enforcer_id, location, violation_date, fine_amount, notes, client_ref)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """
+            for start in range(0, len(accepted), chunk_size):
+                chunk = accepted[start:start + chunk_size]
+                rows = []
+                for i in chunk:
+                    rec = records[i]
+                    outcomes[i]['citation_number'] = next(citations)
+                    rows.append((outcomes[i]['citation_number'], rec['plate_number'], vehicle_ids.get(rec['plate_number']),
+                                 rec['violation_type_id'], rec['enforcer_id'], rec['location'], rec['violation_date'],
+                                 fines[rec['violation_type_id']], rec.get('notes'), rec.get('client_ref')))
+                try:
+                    cursor.executemany(sql, rows)
+                    self._bump_counters(cursor, violations=len(rows), pending_violations=len(rows))
+                    conn.commit()
+                except Exception as e:
+                    conn.rollback()
+                    print(f"Error adding violation batch: {e}")
+                    if not isinstance(e, self.backend.data_errors):
+                        for i in chunk:
+                            outcomes[i].update(citation_number=None, error=str(e), retryable=True)
+                        continue
+                    # A bad row fails the whole executemany; insert this chunk row by row so the rest commit
+                    chunk = self._insert_rows_singly(conn, cursor, sql, chunk, rows, outcomes)
+                # Auto-increment ids of a multi-row insert aren't guaranteed consecutive; read them back
+                ids = dict(self._select_in(cursor, "SELECT citation_number, violation_id FROM violations WHERE citation_number IN ({})",
+                                           [outcomes[i]['citation_number'] for i in chunk]))
+                for i in chunk:
+                    outcomes[i]['violation_id'] = ids.get(outcomes[i]['citation_number'], -1)
+        except Exception as e:
+            print(f"Error adding violations: {e}")
+            for i in valid:
+                if outcomes[i]['violation_id'] == -1 and not outcomes[i]['error']:
+                    outcomes[i].update(citation_number=None, error=str(e), retryable=True)
+        finally:
+            cursor.close()
+            conn.close()
+        return outcomes
+
+    def _insert_rows_singly(self, conn, cursor, sql, chunk, rows, outcomes) -> List[int]:
+        """add_violations_bulk fallback: one commit per row; returns the indexes that were inserted"""
+        inserted = []
+        for i, row in zip(chunk, rows):
+            try:
+                cursor.execute(sql, row)
+                self._bump_counters(cursor, violations=1, pending_violations=1)
+                conn.commit()
+                inserted.append(i)
+            except Exception as e:
+                conn.rollback()
+                outcomes[i].update(citation_number=None, error=str(e),
+                                   retryable=not isinstance(e, self.backend.data_errors))
+        return inserted
+
+    @staticmethod
+    def _select_in(cursor, sql, values, chunk_size=1000) -> List[tuple]:
+        """Run sql (with one {} for the IN list) over values in chunks; returns all rows"""
+        values = list(values)
+        rows = []
+        for start in range(0, len(values), chunk_size):
+            chunk = values[start:start + chunk_size]
+            cursor.execute(sql.format(", ".join(["%s"] * len(chunk))), chunk)
+            rows.extend(cursor.fetchall())
+        return rows
+
+    def next_citation_number(self) -> str:
+        """Unique citation number, e.g. CIT-20250101-00001234 (issue date + global sequence)"""
+        return self.next_citation_numbers(1)[0]
+
+    def next_citation_numbers(self, count) -> List[str]:
+        """`count` citation numbers at once, increasing; call before acquiring a pooled connection"""
+        day = datetime.now().strftime('%Y%m%d')
+        return [f"CIT-{day}-{n:08d}" for n in self.citation_sequence.take(count)]
+
     def get_all_violations(self) -> List[Dict]:
         conn = self.connect()
         cursor = conn.cursor(dictionary=True)
@@ -469,20 +741,103 @@ class DatabaseManager:
             cursor.close()
             conn.close()
 
-    def get_violations_by_owner(self, owner_id) -> List[Dict]:
+    def get_violations_page(self, after: Optional[Tuple] = None, limit=50, filters: Optional[Dict] = None) -> List[Dict]:
+        """
+        Keyset-paginated violations, newest first (violation_date DESC, violation_id DESC).
+        Pass the (violation_date, violation_id) of the last row seen as `after` to get the next page.
+        Supported filters: status, plate_number, enforcer_id, start_date, end_date.
+        """
         conn = self.connect()
+        if not conn: return []
         cursor = conn.cursor(dictionary=True)
         try:
-            cursor.execute("""
+            where, params = self._violation_filter_sql(filters)
+            if after:
+                after_date, after_id = after
+                where.append("(v.violation_date < %s OR (v.violation_date = %s AND v.violation_id < %s))")
+                params.extend([after_date, after_date, after_id])
+
+            sql = """
+                SELECT v.*, vt.violation_name, vt.penalty_points, u.full_name as enforcer_name
+                FROM violations v
+                JOIN violation_types vt ON v.violation_type_id = vt.type_id
+                JOIN users u ON v.enforcer_id = u.user_id
+            """
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            sql += " ORDER BY v.violation_date DESC, v.violation_id DESC LIMIT %s"
+            params.append(int(limit))
+
+            cursor.execute(sql, tuple(params))
+            return cursor.fetchall()
+        except Exception as e:
+            print(f"Error fetching violations page: {e}")
+            return []
+        finally:
+            cursor.close()
+            conn.close()
+
+    @staticmethod
+    def page_cursor(rows: List[Dict]) -> Optional[Tuple]:
+        """Keyset cursor for the page after `rows` (None when the page is empty)"""
+        if not rows:
+            return None
+        last = rows[-1]
+        return (last['violation_date'], last['violation_id'])
+
+    @staticmethod
+    def _violation_filter_sql(filters: Optional[Dict]) -> Tuple[List[str], List]:
+        where, params = [], []
+        if not filters:
+            return where, params
+        if filters.get('status'):
+            where.append("v.status = %s")
+            params.append(filters['status'])
+        if filters.get('plate_number'):
+            where.append("v.plate_number = %s")
+            params.append(filters['plate_number'])
+        if filters.get('enforcer_id'):
+            where.append("v.enforcer_id = %s")
+            params.append(filters['enforcer_id'])
+        if filters.get('start_date'):
+            where.append("v.violation_date >= %s")
+            params.append(filters['start_date'])
+        if filters.get('end_date'):
+            # Inclusive end day: compare against the start of the following day
+            end = datetime.strptime(str(filters['end_date'])[:10], '%Y-%m-%d') + timedelta(days=1)
+            where.append("v.violation_date < %s")
+            params.append(end)
+        return where, params
+
+    def get_violations_by_owner(self, owner_id, status=None, limit: Optional[int] = None, offset=0) -> List[Dict]:
+        """
+        Violations on vehicles owned by owner_id, newest first. `status` is a single
+        status or a list of them; `limit`/`offset` page through the results (None = all).
+        """
+        conn = self.connect()
+        if not conn: return []
+        cursor = conn.cursor(dictionary=True)
+        try:
+            where, params = ["veh.owner_id = %s"], [owner_id]
+            if status:
+                statuses = [status] if isinstance(status, str) else list(status)
+                where.append(f"v.status IN ({', '.join(['%s'] * len(statuses))})")
+                params.extend(statuses)
+            sql = f"""
                 SELECT v.*, vt.violation_name 
                 FROM violations v
                 JOIN vehicles veh ON v.vehicle_id = veh.vehicle_id
                 JOIN violation_types vt ON v.violation_type_id = vt.type_id
-                WHERE veh.owner_id = %s
-                ORDER BY v.violation_date DESC
-            """, (owner_id,))
+                WHERE {' AND '.join(where)}
+                ORDER BY v.violation_date DESC, v.violation_id DESC
+            """
+            if limit is not None:
+                sql += " LIMIT %s OFFSET %s"
+                params.extend([limit, offset])
+            cursor.execute(sql, params)
             return cursor.fetchall()
-        except:
+        except Exception as e:
+            print(f"Error loading violations for owner {owner_id}: {e}")
             return []
         finally:
             cursor.close()
@@ -492,13 +847,18 @@ class DatabaseManager:
         conn = self.connect()
         cursor = conn.cursor()
         try:
+            cursor.execute("SELECT status, fine_amount FROM violations WHERE violation_id=%s FOR UPDATE", (violation_id,))
+            current = cursor.fetchone()
             if status == 'paid':
                 cursor.execute("UPDATE violations SET status=%s, payment_date=NOW() WHERE violation_id=%s", (status, violation_id))
             else:
                 cursor.execute("UPDATE violations SET status=%s WHERE violation_id=%s", (status, violation_id))
+            if current:
+                self._bump_counters(cursor, **self._status_counter_deltas(current[0], status, current[1]))
             conn.commit()
             return True
-        except:
+        except Exception as e:
+            print(f"Error updating violation status: {e}")
             return False
         finally:
             cursor.close()
@@ -521,42 +881,20 @@ class DatabaseManager:
 
     # ==================== ANALYTICS & DASHBOARD ====================
     def get_dashboard_stats(self) -> Dict:
-        """Get counts for dashboard display"""
+        """Get counts for dashboard display (single-row read of dashboard_counters)"""
         conn = self.connect()
+        stats = {field: 0 for field in DASHBOARD_COUNTERS}
+        stats["fines"] = 0.0
+        if not conn: return stats
         cursor = conn.cursor(dictionary=True)
-        stats = {
-            "users": 0,
-            "enforcers": 0,
-            "vehicles": 0,
-            "violations": 0,
-            "fines": 0.0,
-            "pending_violations": 0
-        }
-        try:
-            # Users
-            cursor.execute("SELECT COUNT(*) as c FROM users")
-            stats["users"] = cursor.fetchone()['c']
-
-            cursor.execute("SELECT COUNT(*) as c FROM users WHERE role='enforcer'")
-            stats["enforcers"] = cursor.fetchone()['c']
-            
-            # Vehicles
-            cursor.execute("SELECT COUNT(*) as c FROM vehicles")
-            stats["vehicles"] = cursor.fetchone()['c']
-            
-            # Violations
-            cursor.execute("SELECT COUNT(*) as c FROM violations")
-            stats["violations"] = cursor.fetchone()['c']
-            
-            # Pending Violations
-            cursor.execute("SELECT COUNT(*) as c FROM violations WHERE status='pending'")
-            stats["pending_violations"] = cursor.fetchone()['c']
-            
-            # Collected Fines (Paid)
-            cursor.execute("SELECT SUM(fine_amount) as s FROM violations WHERE status='paid'")
-            res = cursor.fetchone()
-            stats["fines"] = float(res['s']) if res['s'] else 0.0
-            
+        try:
+            row = self._read_counters(cursor)
+            if row is None:
+                # Counter row missing (fresh or wiped table): rebuild it once
+                self.reconcile_dashboard_counters()
+                row = self._read_counters(cursor)
+            if row:
+                stats.update(self._counters_to_stats(row))
             return stats
         except Exception as e:
             print(f"Error getting stats: {e}")
@@ -565,6 +903,190 @@ class DatabaseManager:
             cursor.close()
             conn.close()
 
+    def reconcile_dashboard_counters(self) -> Dict:
+        """
+        Recount dashboard_counters from the base tables and repair any drift.
+        Returns {field: (stored, actual)} for every counter that was wrong.
+        """
+        conn = self.connect()
+        if not conn: return {}
+        cursor = conn.cursor(dictionary=True)
+        try:
+            # Lock the counter row first so writers queue behind us, then count:
+            # the snapshot taken by the counts includes everything committed so far
+            row = self._read_counters(cursor, for_update=True)
+            cursor.execute("""
+                SELECT
+                    (SELECT COUNT(*) FROM users) AS users,
+                    (SELECT COUNT(*) FROM users WHERE role='enforcer') AS enforcers,
+                    (SELECT COUNT(*) FROM vehicles) AS vehicles,
+                    (SELECT COUNT(*) FROM violations) AS violations,
+                    (SELECT COUNT(*) FROM violations WHERE status='pending') AS pending_violations,
+                    (SELECT COALESCE(SUM(fine_amount), 0) FROM violations WHERE status='paid') AS fines
+            """)
+            actual = self._counters_to_stats(cursor.fetchone())
+            stored = self._counters_to_stats(row) if row else None
+
+            drift = {}
+            for field in DASHBOARD_COUNTERS:
+                before = stored[field] if stored else None
+                if before != actual[field]:
+                    drift[field] = (before, actual[field])
+
+            cursor.execute("""
+                INSERT INTO dashboard_counters
+                    (counter_id, users, enforcers, vehicles, violations, pending_violations, fines, reconciled_at)
+                VALUES (1, %s, %s, %s, %s, %s, %s, NOW())
+                ON DUPLICATE KEY UPDATE
+                    users=VALUES(users), enforcers=VALUES(enforcers), vehicles=VALUES(vehicles),
+                    violations=VALUES(violations), pending_violations=VALUES(pending_violations),
+                    fines=VALUES(fines), reconciled_at=VALUES(reconciled_at)
+            """, tuple(actual[field] for field in DASHBOARD_COUNTERS))
+            conn.commit()
+
+            if stored and drift:
+                print(f"  ⚠ Dashboard counters drifted, repaired: {drift}")
+            return drift
+        except Exception as e:
+            print(f"Error reconciling dashboard counters: {e}")
+            return {}
+        finally:
+            cursor.close()
+            conn.close()
+
+    @staticmethod
+    def _read_counters(cursor, for_update=False) -> Optional[Dict]:
+        sql = "SELECT " + ", ".join(DASHBOARD_COUNTERS) + " FROM dashboard_counters WHERE counter_id = 1"
+        cursor.execute(sql + (" FOR UPDATE" if for_update else ""))
+        return cursor.fetchone()
+
+    @staticmethod
+    def _counters_to_stats(row: Dict) -> Dict:
+        stats = {field: int(row[field] or 0) for field in DASHBOARD_COUNTERS if field != "fines"}
+        stats["fines"] = float(row["fines"] or 0)
+        return stats
+
+    @staticmethod
+    def _bump_counters(cursor, **deltas):
+        """Apply counter deltas inside the caller's transaction (committed together with the write)"""
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        unknown = set(deltas) - set(DASHBOARD_COUNTERS)
+        if unknown:
+            raise ValueError(f"Unknown dashboard counters: {sorted(unknown)}")
+        assignments = ", ".join(f"{field} = {field} + %s" for field in deltas)
+        cursor.execute(f"UPDATE dashboard_counters SET {assignments} WHERE counter_id = 1", tuple(deltas.values()))
+
+    @staticmethod
+    def _status_counter_deltas(old_status, new_status, fine_amount) -> Dict:
+        """Counter deltas for a violation moving from old_status to new_status (None = row removed)"""
+        pending = (new_status == 'pending') - (old_status == 'pending')
+        paid = (new_status == 'paid') - (old_status == 'paid')
+        return {"pending_violations": pending, "fines": paid * (fine_amount or 0)}
+
+    def get_citizen_summary(self, owner_id) -> Dict:
+        """Dashboard cards for one citizen: vehicle and violation counts, pending and paid totals"""
+        summary = {'vehicles': 0, 'violations': 0, 'pending_violations': 0, 'pending_total': 0.0, 'paid_total': 0.0}
+        conn = self.connect()
+        if not conn: return summary
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute("""
+                SELECT COUNT(DISTINCT veh.vehicle_id) AS vehicles,
+                       COUNT(v.violation_id) AS violations,
+                       COALESCE(SUM(v.status = 'pending'), 0) AS pending_violations,
+                       COALESCE(SUM(CASE WHEN v.status = 'pending' THEN v.fine_amount END), 0) AS pending_total,
+                       COALESCE(SUM(CASE WHEN v.status = 'paid' THEN v.fine_amount END), 0) AS paid_total
+                FROM vehicles veh
+                LEFT JOIN violations v ON v.vehicle_id = veh.vehicle_id
+                WHERE veh.owner_id = %s
+            """, (owner_id,))
+            row = cursor.fetchone()
+            if row:
+                summary.update({
+                    'vehicles': int(row['vehicles']),
+                    'violations': int(row['violations']),
+                    'pending_violations': int(row['pending_violations']),
+                    'pending_total': float(row['pending_total']),
+                    'paid_total': float(row['paid_total']),
+                })
+            return summary
+        except Exception as e:
+            print(f"Error loading citizen summary: {e}")
+            return summary
+        finally:
+            cursor.close()
+            conn.close()
+
+    # ==================== REPORTS ====================
+    @staticmethod
+    def _report_filters(start, end, status) -> Dict:
+        # "all" (the report dialog's default) means no status filter
+        return {'start_date': start, 'end_date': end,
+                'status': None if not status or status == 'all' else status}
+
+    def count_violations_report(self, start=None, end=None, status=None) -> int:
+        """Number of rows iter_violations_report() will yield, for progress display"""
+        conn = self.connect()
+        if not conn: return 0
+        cursor = conn.cursor()
+        try:
+            where, params = self._violation_filter_sql(self._report_filters(start, end, status))
+            sql = "SELECT COUNT(*) FROM violations v"
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            cursor.execute(sql, params)
+            return cursor.fetchone()[0]
+        except Exception as e:
+            print(f"Error counting report rows: {e}")
+            return 0
+        finally:
+            cursor.close()
+            conn.close()
+
+    def iter_violations_report(self, start=None, end=None, status=None, batch_size=1000):
+        """
+        Stream violations between start and end (inclusive days), oldest first.
+
+        Filtering happens in SQL and rows are read from an unbuffered cursor in
+        fetchmany() batches, so memory stays flat however long the range is.
+        Errors are raised rather than swallowed, so a failed export is never
+        mistaken for a short one. Closing the generator early drops the
+        connection instead of draining the rest of the result set.
+        """
+        conn = self.connect()
+        if not conn: return
+        cursor = conn.cursor(dictionary=True, buffered=False)
+        exhausted = False
+        try:
+            where, params = self._violation_filter_sql(self._report_filters(start, end, status))
+            sql = """
+                SELECT v.violation_id, v.citation_number, v.plate_number, vt.violation_name, v.location,
+                       v.violation_date, v.fine_amount, v.status, u.full_name as enforcer_name
+                FROM violations v
+                JOIN violation_types vt ON v.violation_type_id = vt.type_id
+                JOIN users u ON v.enforcer_id = u.user_id
+            """
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            # Matches idx_violations_date / idx_violations_status_date, so no filesort
+            sql += " ORDER BY v.violation_date, v.violation_id"
+            cursor.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+            exhausted = True
+        finally:
+            if exhausted:
+                cursor.close()
+                conn.close()
+            else:
+                # Unread rows are still on the wire; don't hand this connection back
+                conn.invalidate()
+
     # ==================== EXTENDED USER MANAGEMENT ====================
     def update_user(self, user_id, full_name, email, phone, department, office) -> bool:
         conn = self.connect()
@@ -576,6 +1098,8 @@ class DatabaseManager:
                 WHERE user_id=%s
             """, (full_name, email, phone, department, office, user_id))
             conn.commit()
+            # Owner names and phones are part of the cached plate records
+            self.hot_plates.invalidate()
             return True
         except Exception as e:
             print(f"Error updating user: {e}")
@@ -603,10 +1127,15 @@ class DatabaseManager:
         conn = self.connect()
         cursor = conn.cursor()
         try:
+            cursor.execute("SELECT role FROM users WHERE user_id=%s FOR UPDATE", (user_id,))
+            current = cursor.fetchone()
             # First delete related records or handle constraints if necessary
             # For simplicity, assuming cascade or we just delete user
             cursor.execute("DELETE FROM users WHERE user_id=%s", (user_id,))
+            if current and cursor.rowcount > 0:
+                self._bump_counters(cursor, users=-1, enforcers=-1 if current[0] == 'enforcer' else 0)
             conn.commit()
+            self.hot_plates.invalidate()
             return True
         except Exception as e:
             print(f"Error deleting user: {e}")
@@ -637,7 +1166,7 @@ class DatabaseManager:
         try:
             from datetime import date, datetime, timedelta
             today = date.today()
-            expiring_threshold = today + timedelta(days=30)
+            expiring_threshold = today + timedelta(days=EXPIRING_WINDOW_DAYS)
             
             # Helper to ensure date object
             def to_date(d):
@@ -659,12 +1188,17 @@ class DatabaseManager:
             else:
                 new_status = 'active'
             
+            cursor.execute("SELECT plate_number FROM vehicles WHERE vehicle_id=%s", (vehicle_id,))
+            row = cursor.fetchone()
             cursor.execute("""
                 UPDATE vehicles 
                 SET make=%s, model=%s, year=%s, color=%s, registration_date=%s, expiry_date=%s, status=%s
                 WHERE vehicle_id=%s
             """, (make, model, year, color, reg_date, exp_date, new_status, vehicle_id))
             conn.commit()
+            self.invalidate_owner_plates()
+            if row:
+                self.hot_plates.invalidate(row[0])
             return True
         except Exception as e:
             print(f"Error updating vehicle: {e}")
@@ -677,8 +1211,16 @@ class DatabaseManager:
         conn = self.connect()
         cursor = conn.cursor()
         try:
+            cursor.execute("SELECT plate_number FROM vehicles WHERE vehicle_id=%s", (vehicle_id,))
+            row = cursor.fetchone()
             cursor.execute("DELETE FROM vehicles WHERE vehicle_id=%s", (vehicle_id,))
+            if cursor.rowcount > 0:
+                self._bump_counters(cursor, vehicles=-1)
             conn.commit()
+            self.invalidate_owner_plates()
+            if row:
+                self.plate_index.remove(row[0])
+                self.hot_plates.invalidate(row[0])
             return True
         except Exception as e:
             print(f"Error deleting vehicle: {e}")
@@ -688,46 +1230,129 @@ class DatabaseManager:
             conn.close()
     
     # ==================== VEHICLE EXPIRATION MANAGEMENT ====================
-    def check_and_update_vehicle_expiration(self):
-        """Check all vehicles and update their status based on expiry_date"""
+    def check_and_update_vehicle_expiration(self) -> int:
+        """
+        Bring every vehicle's status in line with its expiry_date now, regardless of
+        when the daily job last ran. Returns the number of vehicles whose status changed.
+        """
         conn = self.connect()
+        if not conn: return 0
         cursor = conn.cursor()
         try:
-            from datetime import date, timedelta
-            today = date.today()
-            expiring_threshold = today + timedelta(days=30)
-            
-            # Update expired vehicles
-            cursor.execute("""
-                UPDATE vehicles 
-                SET status = 'expired' 
-                WHERE expiry_date < %s AND status != 'expired'
-            """, (today,))
-            
-            # Update expiring vehicles (within 30 days)
-            cursor.execute("""
-                UPDATE vehicles 
-                SET status = 'expiring' 
-                WHERE expiry_date >= %s AND expiry_date <= %s AND status = 'active'
-            """, (today, expiring_threshold))
-            
-            # Update active vehicles (not expired and not expiring soon)
-            cursor.execute("""
-                UPDATE vehicles 
-                SET status = 'active' 
-                WHERE expiry_date > %s AND status IN ('expired', 'expiring')
-            """, (expiring_threshold,))
-            
+            changed = self._apply_expiration_status(cursor)
             conn.commit()
-            expired_count = cursor.rowcount
-            return expired_count
+            if changed:
+                self.hot_plates.invalidate()
+            return changed
         except Exception as e:
             print(f"Error checking vehicle expiration: {e}")
             return 0
         finally:
             cursor.close()
             conn.close()
-    
+
+    def run_daily_expiration(self) -> Optional[int]:
+        """
+        Once-per-day expiration job. The first client to claim today's marker in
+        job_runs applies the status update in the same transaction; everyone else
+        (including clients starting at the same moment) gets None. "Today" is the
+        server's CURDATE(), so clients with skewed clocks agree on the day.
+        """
+        conn = self.connect()
+        if not conn: return None
+        cursor = conn.cursor()
+        try:
+            cursor.execute("INSERT IGNORE INTO job_runs (job_name) VALUES (%s)", (EXPIRATION_JOB,))
+            # Claim the day: only one transaction can move the marker forward
+            cursor.execute("""
+                UPDATE job_runs SET last_run_date = CURDATE(), last_run_at = NOW()
+                WHERE job_name = %s AND (last_run_date IS NULL OR last_run_date < CURDATE())
+            """, (EXPIRATION_JOB,))
+            if cursor.rowcount == 0:
+                conn.rollback()
+                return None
+
+            changed = self._apply_expiration_status(cursor)
+            cursor.execute("UPDATE job_runs SET rows_affected = %s WHERE job_name = %s", (changed, EXPIRATION_JOB))
+            conn.commit()
+            if changed:
+                self.hot_plates.invalidate()
+            print(f"  ✓ Daily expiration job updated {changed} vehicle(s)")
+            return changed
+        except Exception as e:
+            print(f"Error running daily expiration job: {e}")
+            return None
+        finally:
+            cursor.close()
+            conn.close()
+
+    @staticmethod
+    def _apply_expiration_status(cursor) -> int:
+        """Single set-based pass that only touches vehicles whose status actually changes"""
+        cursor.execute("""
+            UPDATE vehicles
+            SET status = CASE
+                WHEN expiry_date < CURDATE() THEN 'expired'
+                WHEN expiry_date <= CURDATE() + INTERVAL %s DAY THEN 'expiring'
+                ELSE 'active'
+            END
+            WHERE (expiry_date < CURDATE() AND status <> 'expired')
+               OR (expiry_date >= CURDATE() AND expiry_date <= CURDATE() + INTERVAL %s DAY AND status <> 'expiring')
+               OR (expiry_date > CURDATE() + INTERVAL %s DAY AND status <> 'active')
+        """, (EXPIRING_WINDOW_DAYS,) * 3)
+        return cursor.rowcount
+
+    def get_expiration_overview(self, days=EXPIRING_WINDOW_DAYS, limit: Optional[int] = 200) -> Dict:
+        """
+        Expired and expiring-within-`days` vehicles in one query (one snapshot).
+
+        Returns {'expired': rows, 'expired_total': n, 'expiring': rows, 'expiring_total': n}.
+        Each bucket holds at most `limit` rows (None = all), but the totals always
+        count the whole bucket. Rows carry a precomputed `days` column: days overdue
+        for expired vehicles, days remaining for expiring ones.
+        """
+        overview = {'expired': [], 'expired_total': 0, 'expiring': [], 'expiring_total': 0}
+        conn = self.connect()
+        if not conn: return overview
+        cursor = conn.cursor(dictionary=True)
+        try:
+            row_limit = "LIMIT %s" if limit is not None else ""
+            limit_params = [limit] if limit is not None else []
+            # Totals are uncorrelated subqueries (counted once, from idx_vehicles_expiry alone)
+            # repeated on every row, so they survive the LIMIT
+            cursor.execute(f"""
+                SELECT * FROM (SELECT 'expired' AS bucket, v.*, u.full_name as owner_name, u.email, u.phone,
+                        DATEDIFF(CURDATE(), v.expiry_date) AS days,
+                        (SELECT COUNT(*) FROM vehicles WHERE expiry_date < CURDATE()) AS bucket_total
+                 FROM vehicles v
+                 JOIN users u ON v.owner_id = u.user_id
+                 WHERE v.expiry_date < CURDATE()
+                 ORDER BY v.expiry_date DESC
+                 {row_limit}) expired
+                UNION ALL
+                SELECT * FROM (SELECT 'expiring' AS bucket, v.*, u.full_name as owner_name, u.email, u.phone,
+                        DATEDIFF(v.expiry_date, CURDATE()) AS days,
+                        (SELECT COUNT(*) FROM vehicles
+                         WHERE expiry_date BETWEEN CURDATE() AND CURDATE() + INTERVAL %s DAY) AS bucket_total
+                 FROM vehicles v
+                 JOIN users u ON v.owner_id = u.user_id
+                 WHERE v.expiry_date BETWEEN CURDATE() AND CURDATE() + INTERVAL %s DAY
+                 ORDER BY v.expiry_date ASC
+                 {row_limit}) expiring
+                ORDER BY bucket, days
+            """, limit_params + [days, days] + limit_params)
+            for row in cursor.fetchall():
+                bucket = row.pop('bucket')
+                overview[f"{bucket}_total"] = row.pop('bucket_total')
+                overview[bucket].append(row)
+            return overview
+        except Exception as e:
+            print(f"Error loading expiration overview: {e}")
+            return overview
+        finally:
+            cursor.close()
+            conn.close()
+
     def get_expired_vehicles(self) -> List[Dict]:
         """Get all expired vehicles"""
         conn = self.connect()
@@ -772,6 +1397,8 @@ class DatabaseManager:
         conn = self.connect()
         cursor = conn.cursor()
         try:
+            cursor.execute("SELECT plate_number FROM vehicles WHERE vehicle_id = %s", (vehicle_id,))
+            row = cursor.fetchone()
             if expiry_date:
                 cursor.execute("""
                     UPDATE vehicles 
@@ -784,8 +1411,11 @@ class DatabaseManager:
                     SET status = %s 
                     WHERE vehicle_id = %s
                 """, (status, vehicle_id))
+            updated = cursor.rowcount > 0
             conn.commit()
-            return cursor.rowcount > 0
+            if row:
+                self.hot_plates.invalidate(row[0])
+            return updated
         except Exception as e:
             print(f"Error updating vehicle status: {e}")
             return False
@@ -797,6 +1427,8 @@ class DatabaseManager:
         conn = self.connect()
         cursor = conn.cursor()
         try:
+            cursor.execute("SELECT status, fine_amount FROM violations WHERE violation_id=%s FOR UPDATE", (violation_id,))
+            current = cursor.fetchone()
             if violation_type_id:
                 cursor.execute("""
                     UPDATE violations 
@@ -809,6 +1441,8 @@ class DatabaseManager:
                     SET location=%s, notes=%s, status=%s
                     WHERE violation_id=%s
                 """, (location, notes, status, violation_id))
+            if current:
+                self._bump_counters(cursor, **self._status_counter_deltas(current[0], status, current[1]))
             conn.commit()
             return True
         except Exception as e:
@@ -822,7 +1456,12 @@ class DatabaseManager:
         conn = self.connect()
         cursor = conn.cursor()
         try:
+            cursor.execute("SELECT status, fine_amount FROM violations WHERE violation_id=%s FOR UPDATE", (violation_id,))
+            current = cursor.fetchone()
             cursor.execute("DELETE FROM violations WHERE violation_id=%s", (violation_id,))
+            if current and cursor.rowcount > 0:
+                deltas = self._status_counter_deltas(current[0], None, current[1])
+                self._bump_counters(cursor, violations=-1, **deltas)
             conn.commit()
             return True
         except Exception as e:
@@ -834,82 +1473,102 @@ class DatabaseManager:
 
     # ==================== PAYMENT & SEARCH ====================
     def search_vehicle_full(self, plate_number) -> Dict:
-        """Search vehicle and include violations"""
+        """Search vehicle and include violations (the vehicle from the hot-plate cache when possible)"""
+        result = {"vehicle": self.search_vehicle(plate_number), "violations": []}
+        if not result["vehicle"]:
+            return result
+        # Citations and payments from other terminals must show up at once, so never cached
         conn = self.connect()
+        if not conn: return result
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute("""
+                SELECT v.*, vt.violation_name, vt.fine_amount
+                FROM violations v
+                JOIN violation_types vt ON v.violation_type_id = vt.type_id
+                WHERE v.plate_number = %s
+                ORDER BY v.violation_date DESC
+            """, (plate_number,))
+            result["violations"] = cursor.fetchall()
+            return result
+        finally:
+            cursor.close()
+            conn.close()
+
+    def get_hot_plate_cache_stats(self) -> Dict:
+        return self.hot_plates.stats()
+
+    def _load_vehicle_record(self, plate_number) -> Optional[Dict]:
+        """hot_plates loader: None for an unregistered plate, so it isn't cached"""
+        conn = self.connect()
+        if not conn:
+            raise ConnectionError("no database connection available")
         cursor = conn.cursor(dictionary=True)
-        result = {"vehicle": None, "violations": []}
         try:
-            # Vehicle Info
             cursor.execute("""
                 SELECT v.*, u.full_name as owner_name, u.phone as owner_phone, u.user_id as owner_id
                 FROM vehicles v 
                 JOIN users u ON v.owner_id = u.user_id 
                 WHERE v.plate_number = %s
             """, (plate_number,))
-            vehicle = cursor.fetchone()
-            
-            if vehicle:
-                result["vehicle"] = vehicle
-                # Violations
-                cursor.execute("""
-                    SELECT v.*, vt.violation_name, vt.fine_amount
-                    FROM violations v
-                    JOIN violation_types vt ON v.violation_type_id = vt.type_id
-                    WHERE v.plate_number = %s
-                    ORDER BY v.violation_date DESC
-                """, (plate_number,))
-                result["violations"] = cursor.fetchall()
-                
-            return result
+            return cursor.fetchone()
         finally:
             cursor.close()
             conn.close()
 
     def record_payment(self, violation_id, amount=None, method="e-wallet", user_id=None, payment_details=None, transaction_ref=None) -> bool:
         """
-        Record a payment in the payments table and update violation status
+        Record a payment in the payments table and mark the violation paid, atomically.
+
+        The violation row is locked first, so concurrent payers for the same citation
+        serialize and only one payment is inserted. `transaction_ref` doubles as an
+        idempotency key: resubmitting a payment that already went through with the
+        same reference returns True without inserting a second row.
         """
         conn = self.connect()
         if not conn: return False
         cursor = conn.cursor()
         try:
-            # Get violation info to determine amount and user if not provided
-            cursor.execute("SELECT fine_amount, plate_number FROM violations WHERE violation_id=%s", (violation_id,))
+            # Lock the violation and resolve the vehicle owner in one round trip
+            cursor.execute("""
+                SELECT v.fine_amount, v.status, veh.owner_id
+                FROM violations v
+                LEFT JOIN vehicles veh ON veh.plate_number = v.plate_number
+                WHERE v.violation_id = %s
+                FOR UPDATE
+            """, (violation_id,))
             violation = cursor.fetchone()
             if not violation:
                 return False
-            
-            fine_amount = amount if amount else violation[0]
-            
-            # Get user_id from vehicle owner if not provided
-            if not user_id:
-                cursor.execute("""
-                    SELECT owner_id FROM vehicles 
-                    WHERE plate_number = (SELECT plate_number FROM violations WHERE violation_id=%s)
-                """, (violation_id,))
-                owner_result = cursor.fetchone()
-                if owner_result:
-                    user_id = owner_result[0]
-                else:
+            fine, status, owner_id = violation
+
+            if status == 'paid':
+                # Paid already: a retry of that same payment is a success, anything else is not
+                if not transaction_ref:
                     return False
-            
-            # Insert into payments table
+                cursor.execute("""
+                    SELECT payment_id FROM payments
+                    WHERE violation_id = %s AND transaction_reference = %s
+                    LOCK IN SHARE MODE
+                """, (violation_id, transaction_ref))
+                return cursor.fetchone() is not None
+
+            user_id = user_id or owner_id
+            if not user_id:
+                return False
+
             cursor.execute("""
                 INSERT INTO payments (violation_id, user_id, amount, payment_method, payment_details, transaction_reference, status)
                 VALUES (%s, %s, %s, %s, %s, %s, 'completed')
-            """, (violation_id, user_id, fine_amount, method, payment_details, transaction_ref))
-            
-            # Update violation status
+            """, (violation_id, user_id, amount if amount else fine, method, payment_details, transaction_ref))
             cursor.execute("""
                 UPDATE violations 
                 SET status='paid', payment_date=NOW(), payment_method=%s 
-                WHERE violation_id=%s AND status != 'paid'
+                WHERE violation_id=%s
             """, (method, violation_id))
-            
-            if cursor.rowcount > 0:
-                conn.commit()
-                return True
-            return False
+            self._bump_counters(cursor, **self._status_counter_deltas(status, 'paid', fine))
+            conn.commit()
+            return True
         except Exception as e:
             print(f"Error recording payment: {e}")
             conn.rollback()
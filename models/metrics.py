@@ -0,0 +1,442 @@
+"""
+Query instrumentation for DatabaseManager.
+
+instrument() wraps the public methods of a DatabaseManager so every call is
+timed under its method name. Connections handed out by DatabaseManager.connect()
+are wrapped as well, so the time spent waiting for a pooled connection, each
+statement's execution time, the rows fetched and their approximate size are
+attributed to the method that is running on that thread. Statements slower than
+`slow_query_ms` go to a slow-query log (kept in memory, optionally appended to
+a JSON-lines file) with their SQL and the types and sizes of their parameters;
+the values themselves (logins, password hashes, personal data) are only logged
+with log_params=True, and never for statements that mention a password.
+
+QueryMetrics.export() writes everything in Prometheus text format (.prom/.txt)
+or as JSON (.json); QueryMetricsDialog on the admin dashboard shows it live.
+"""
+import functools
+import inspect
+import json
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# Upper bounds (seconds) of the latency buckets, as in Prometheus client defaults plus sub-ms buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Statements run outside any instrumented method (e.g. ReportEngine, benchmarks)
+UNSCOPED = "(other)"
+# Rows per fetch whose values are sized for the bytes counter
+BYTES_SAMPLE = 8
+_SIZED = {str, bytes, bytearray}
+_WHITESPACE = re.compile(r"\s+")
+# Statements whose parameter values are never logged, even with log_params=True
+_SECRET_SQL = re.compile(r"password", re.IGNORECASE)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (cumulative counts are computed on export)"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot: above the largest bound (+Inf)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        i = 0
+        while i < len(self.buckets) and seconds > self.buckets[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, share) -> Optional[float]:
+        """Upper bound of the bucket holding the `share` quantile (the max for the +Inf bucket)"""
+        if not self.count:
+            return None
+        rank = share * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return min(self.buckets[i], self.max) if i < len(self.buckets) else self.max
+        return self.max
+
+    def cumulative(self) -> List[tuple]:
+        """[(le, count)] including ("+Inf", count)"""
+        out, total = [], 0
+        for bound, n in zip(list(self.buckets) + ["+Inf"], self.counts):
+            total += n
+            out.append((bound, total))
+        return out
+
+    def to_dict(self) -> Dict:
+        return {"count": self.count, "sum": self.sum, "max": self.max,
+                "p50": self.percentile(0.5), "p95": self.percentile(0.95), "p99": self.percentile(0.99),
+                "buckets": {str(le): n for le, n in self.cumulative()}}
+
+
+class MethodStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0          # calls that raised
+        self.queries = 0
+        self.failed_queries = 0  # statements that raised, even if the method swallowed it
+        self.rows = 0
+        self.bytes = 0
+        self.total = LatencyHistogram()
+        self.connect = LatencyHistogram()
+        self.query = LatencyHistogram()
+        self.last_error = None
+
+    def to_dict(self) -> Dict:
+        return {"calls": self.calls, "errors": self.errors, "queries": self.queries,
+                "failed_queries": self.failed_queries, "rows": self.rows, "bytes": self.bytes,
+                "last_error": self.last_error, "total": self.total.to_dict(),
+                "connect": self.connect.to_dict(), "query": self.query.to_dict()}
+
+
+class QueryMetrics:
+    """Per-method latency histograms, row/byte counters and a slow-query log; thread-safe"""
+
+    def __init__(self, slow_query_ms=200, slow_log_size=200, slow_log_path=None, log_params=False):
+        self.slow_query_ms = slow_query_ms
+        self.slow_log_path = slow_log_path
+        self.log_params = log_params
+        self._lock = threading.Lock()
+        self._methods: Dict[str, MethodStats] = {}
+        self._slow = deque(maxlen=slow_log_size)
+        self._slow_total = 0
+        self._scope = threading.local()
+        self.started_at = datetime.now()
+
+    # --- attribution ---
+    def current(self) -> str:
+        stack = getattr(self._scope, "stack", None)
+        return stack[-1] if stack else UNSCOPED
+
+    def wrap(self, name, fn: Callable, generator=False) -> Callable:
+        """fn timed under `name`; generator functions are timed from first next() to exhaustion"""
+        if generator:
+            @functools.wraps(fn)
+            def timed_generator(*args, **kwargs):
+                return self._timed_iter(name, fn(*args, **kwargs))
+            return timed_generator
+
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            self._enter(name)
+            started = time.perf_counter()
+            error = None
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                self._exit()
+                self.observe_call(name, time.perf_counter() - started, error)
+        return timed
+
+    def _timed_iter(self, name, gen):
+        started = time.perf_counter()
+        error = None
+        try:
+            while True:
+                self._enter(name)
+                try:
+                    item = next(gen)
+                except StopIteration:
+                    return
+                except Exception as e:
+                    error = e
+                    raise
+                finally:
+                    self._exit()
+                yield item
+        finally:
+            gen.close()
+            self.observe_call(name, time.perf_counter() - started, error)
+
+    def _enter(self, name):
+        stack = getattr(self._scope, "stack", None)
+        if stack is None:
+            stack = self._scope.stack = []
+        stack.append(name)
+
+    def _exit(self):
+        self._scope.stack.pop()
+
+    def wrap_connection(self, conn, connect_seconds):
+        """Record the pool checkout time and return conn with timed cursors"""
+        self.observe_connect(self.current(), connect_seconds)
+        return _TimedConnection(conn, self)
+
+    # --- recording ---
+    def _stats(self, name) -> MethodStats:
+        stats = self._methods.get(name)
+        if stats is None:
+            stats = self._methods[name] = MethodStats()
+        return stats
+
+    def observe_call(self, name, seconds, error=None):
+        with self._lock:
+            stats = self._stats(name)
+            stats.calls += 1
+            stats.total.observe(seconds)
+            if error is not None:
+                stats.errors += 1
+                stats.last_error = f"{type(error).__name__}: {error}"
+
+    def observe_connect(self, name, seconds):
+        with self._lock:
+            self._stats(name).connect.observe(seconds)
+
+    def observe_query(self, sql, params, seconds, rowcount=None, error=None, many=False):
+        name = self.current()
+        with self._lock:
+            stats = self._stats(name)
+            stats.queries += 1
+            stats.query.observe(seconds)
+            if error is not None:
+                stats.failed_queries += 1
+                stats.last_error = f"{type(error).__name__}: {error}"
+        if self.slow_query_ms is not None and seconds * 1000 >= self.slow_query_ms:
+            self._log_slow(name, sql, params, seconds, rowcount, error, many)
+
+    def observe_rows(self, rows: List):
+        count = len(rows)
+        if count:
+            # Size the first BYTES_SAMPLE rows and scale up; sizing every value would slow large fetches down
+            sample = rows[:BYTES_SAMPLE]
+            size = 0
+            for row in sample:
+                values = row.values() if row.__class__ is dict else row
+                size += 8 * len(values)
+                for value in values:
+                    if value.__class__ in _SIZED:
+                        size += len(value) - 8
+            size = size * count // len(sample)
+            with self._lock:
+                stats = self._stats(self.current())
+                stats.rows += count
+                stats.bytes += size
+
+    def _log_slow(self, name, sql, params, seconds, rowcount, error, many):
+        show = _short_repr if self.log_params and not _SECRET_SQL.search(str(sql)) else _param_shape
+        if many:
+            params = list(params or [])
+            params = f"{len(params)} rows, first {show(params[0]) if params else None}"
+        else:
+            params = show(params)
+        entry = {"at": datetime.now().isoformat(" ", "milliseconds"), "method": name,
+                 "ms": round(seconds * 1000, 3), "sql": _WHITESPACE.sub(" ", str(sql)).strip(),
+                 "params": params, "rowcount": rowcount,
+                 "error": f"{type(error).__name__}: {error}" if error is not None else None}
+        with self._lock:
+            self._slow.append(entry)
+            self._slow_total += 1
+            if self.slow_log_path:
+                try:
+                    with open(self.slow_log_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(entry, default=str) + "\n")
+                except OSError as e:
+                    print(f"  ⚠ Could not write slow-query log: {e}")
+
+    # --- reading ---
+    def slow_queries(self, limit=None) -> List[Dict]:
+        """Newest first"""
+        with self._lock:
+            entries = list(reversed(self._slow))
+        return entries[:limit] if limit else entries
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            methods = {name: stats.to_dict() for name, stats in sorted(self._methods.items())}
+            slow_total = self._slow_total
+        return {"started_at": self.started_at.isoformat(" ", "seconds"), "slow_query_ms": self.slow_query_ms,
+                "slow_queries_total": slow_total, "methods": methods}
+
+    def reset(self):
+        with self._lock:
+            self._methods.clear()
+            self._slow.clear()
+            self._slow_total = 0
+            self.started_at = datetime.now()
+
+    # --- export ---
+    def to_json(self) -> str:
+        return json.dumps(dict(self.snapshot(), slow_queries=self.slow_queries()), indent=2, default=str)
+
+    def to_prometheus(self) -> str:
+        snapshot = self.snapshot()
+        with self._lock:
+            histograms = {name: (s.total.cumulative(), s.total.sum, s.connect.cumulative(), s.connect.sum,
+                                 s.query.cumulative(), s.query.sum)
+                          for name, s in sorted(self._methods.items())}
+        lines = []
+
+        def histogram(metric, help_text, index):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for name, values in histograms.items():
+                buckets, total = values[index], values[index + 1]
+                label = _label(name)
+                for le, n in buckets:
+                    lines.append(f'{metric}_bucket{{method="{label}",le="{le}"}} {n}')
+                lines.append(f'{metric}_sum{{method="{label}"}} {total:.6f}')
+                lines.append(f'{metric}_count{{method="{label}"}} {buckets[-1][1]}')
+
+        def counter(metric, help_text, key):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for name, stats in snapshot["methods"].items():
+                lines.append(f'{metric}{{method="{_label(name)}"}} {stats[key]}')
+
+        histogram("nexus_db_method_seconds", "Wall time of DatabaseManager method calls", 0)
+        histogram("nexus_db_connect_seconds", "Time spent waiting for a pooled connection", 2)
+        histogram("nexus_db_query_seconds", "Execution time of individual SQL statements", 4)
+        counter("nexus_db_method_errors_total", "Method calls that raised", "errors")
+        counter("nexus_db_query_errors_total", "SQL statements that raised", "failed_queries")
+        counter("nexus_db_rows_total", "Rows fetched", "rows")
+        counter("nexus_db_bytes_total", "Approximate bytes fetched (string lengths, 8 per other value; sampled)", "bytes")
+        lines.append("# HELP nexus_db_slow_queries_total Statements slower than the slow-query threshold")
+        lines.append("# TYPE nexus_db_slow_queries_total counter")
+        lines.append(f"nexus_db_slow_queries_total {snapshot['slow_queries_total']}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path) -> str:
+        """Write a .json file as JSON and anything else in Prometheus text format; returns the format used"""
+        fmt = "json" if str(path).lower().endswith(".json") else "prometheus"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json() if fmt == "json" else self.to_prometheus())
+        return fmt
+
+
+def instrument(obj, metrics: QueryMetrics, exclude=()):
+    """Replace obj's public methods (not static/class methods or properties) with timed wrappers"""
+    cls = type(obj)
+    for name in dir(cls):
+        if name.startswith("_") or name in exclude:
+            continue
+        attr = inspect.getattr_static(cls, name)
+        if not inspect.isfunction(attr):
+            continue
+        setattr(obj, name, metrics.wrap(name, getattr(obj, name), inspect.isgeneratorfunction(attr)))
+
+
+def _label(name) -> str:
+    return name.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _short_repr(value, limit=300) -> str:
+    text = repr(value)
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def _param_shape(params, limit=300) -> str:
+    """Parameter types and sizes without their values, e.g. (str[8], int, NoneType)"""
+    def shape(value):
+        size = f"[{len(value)}]" if isinstance(value, (str, bytes, bytearray, list, tuple)) else ""
+        return type(value).__name__ + size
+
+    if params is None:
+        return "None"
+    if isinstance(params, dict):
+        text = "{" + ", ".join(f"{key}: {shape(value)}" for key, value in params.items()) + "}"
+    else:
+        text = "(" + ", ".join(shape(value) for value in params) + ")"
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+class _TimedConnection:
+    """Pooled connection whose cursors report to QueryMetrics"""
+
+    def __init__(self, conn, metrics):
+        self._conn = conn
+        self._metrics = metrics
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        return _TimedCursor(self._conn.cursor(*args, **kwargs), self._metrics)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._conn.close()
+
+
+class _TimedCursor:
+    """
+    Cursor proxy timing each statement from execute() through its fetches (lazy and
+    unbuffered cursors do most of their work while fetching); a statement is recorded
+    when the next one starts or the cursor is closed.
+    """
+
+    def __init__(self, cursor, metrics):
+        self._cursor = cursor
+        self._metrics = metrics
+        self._statement = None  # [sql, params, seconds, many, error]
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def execute(self, sql, *args, **kwargs):
+        return self._run(self._cursor.execute, sql, args, kwargs, many=False)
+
+    def executemany(self, sql, *args, **kwargs):
+        return self._run(self._cursor.executemany, sql, args, kwargs, many=True)
+
+    def _run(self, run, sql, args, kwargs, many):
+        self._finish()
+        params = args[0] if args else next(iter(kwargs.values()), None)
+        self._statement = [sql, params, 0.0, many, None]
+        return self._timed(run, sql, *args, **kwargs)
+
+    def _timed(self, fn, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if self._statement:
+                self._statement[4] = e
+            raise
+        finally:
+            if self._statement:
+                self._statement[2] += time.perf_counter() - started
+
+    def _finish(self):
+        if self._statement:
+            sql, params, seconds, many, error = self._statement
+            self._statement = None
+            rowcount = getattr(self._cursor, "rowcount", None)
+            self._metrics.observe_query(sql, params, seconds, rowcount, error, many)
+
+    def fetchone(self):
+        row = self._timed(self._cursor.fetchone)
+        if row is not None:
+            self._metrics.observe_rows([row])
+        return row
+
+    def fetchall(self):
+        rows = self._timed(self._cursor.fetchall)
+        self._metrics.observe_rows(rows)
+        return rows
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._timed(self._cursor.fetchmany, *args, **kwargs)
+        self._metrics.observe_rows(rows)
+        return rows
+
+    def close(self):
+        self._finish()
+        return self._cursor.close()
@@ -0,0 +1,277 @@
+"""
+Versioned schema migrations.
+
+Each migration is (version, description, function(cursor)). Applied versions are
+recorded in `schema_migrations`; `migrate()` runs whatever is missing, in order.
+MySQL commits DDL implicitly, so every step is written to be safe to re-run
+(IF NOT EXISTS / information_schema checks) in case a previous run died halfway.
+The same DDL runs on the SQLite backend, which translates the MySQL-only parts
+(see models/backends.py).
+"""
+from typing import List
+
+
+def _column_exists(cursor, table, column) -> bool:
+    if getattr(cursor, "dialect", None) == "sqlite":
+        cursor.execute(f"PRAGMA table_info({table})")
+        return any(row[1] == column for row in cursor.fetchall())
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+    """, (table, column))
+    return cursor.fetchone()[0] > 0
+
+
+def _index_exists(cursor, table, index) -> bool:
+    if getattr(cursor, "dialect", None) == "sqlite":
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND tbl_name = %s AND name = %s",
+                       (table, index))
+        return cursor.fetchone()[0] > 0
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+    """, (table, index))
+    return cursor.fetchone()[0] > 0
+
+
+# ==================== MIGRATIONS ====================
+def _m001_base_tables(cursor):
+    # 1. USERS TABLE
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            user_id INT AUTO_INCREMENT PRIMARY KEY,
+            username VARCHAR(50) UNIQUE NOT NULL,
+            password VARCHAR(255) NOT NULL,
+            full_name VARCHAR(100) NOT NULL,
+            email VARCHAR(100),
+            phone VARCHAR(20),
+            role ENUM('admin', 'enforcer', 'citizen') NOT NULL,
+            department VARCHAR(100),
+            office_location VARCHAR(100),
+            status VARCHAR(20) DEFAULT 'active',
+            last_login DATETIME,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # 2. VEHICLES TABLE
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS vehicles (
+            vehicle_id INT AUTO_INCREMENT PRIMARY KEY,
+            plate_number VARCHAR(20) UNIQUE NOT NULL,
+            owner_id INT NOT NULL,
+            make VARCHAR(50),
+            model VARCHAR(50),
+            year INT,
+            color VARCHAR(30),
+            chassis_number VARCHAR(50) UNIQUE,
+            registration_date DATE,
+            expiry_date DATE,
+            or_cr_number VARCHAR(50) UNIQUE,
+            status ENUM('active', 'expired', 'expiring') DEFAULT 'active',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (owner_id) REFERENCES users(user_id)
+        )
+    """)
+
+    # 3. VIOLATION TYPES TABLE
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS violation_types (
+            type_id INT AUTO_INCREMENT PRIMARY KEY,
+            violation_name VARCHAR(100) UNIQUE NOT NULL,
+            fine_amount DECIMAL(10, 2) NOT NULL,
+            description TEXT,
+            penalty_points INT DEFAULT 0,
+            status VARCHAR(20) DEFAULT 'active',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # 4. VIOLATIONS TABLE
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS violations (
+            violation_id INT AUTO_INCREMENT PRIMARY KEY,
+            citation_number VARCHAR(50) UNIQUE,
+            plate_number VARCHAR(20) NOT NULL,
+            vehicle_id INT,
+            violation_type_id INT NOT NULL,
+            enforcer_id INT NOT NULL,
+            location VARCHAR(255) NOT NULL,
+            violation_date DATETIME NOT NULL,
+            fine_amount DECIMAL(10, 2) NOT NULL,
+            status VARCHAR(20) DEFAULT 'pending',
+            notes TEXT,
+            photo_evidence TEXT,
+            payment_date TIMESTAMP NULL,
+            payment_method VARCHAR(50),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (vehicle_id) REFERENCES vehicles(vehicle_id),
+            FOREIGN KEY (violation_type_id) REFERENCES violation_types(type_id),
+            FOREIGN KEY (enforcer_id) REFERENCES users(user_id)
+        )
+    """)
+
+    # 5. OFFICERS TABLE
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS officers (
+            officer_id INT AUTO_INCREMENT PRIMARY KEY,
+            user_id INT UNIQUE NOT NULL,
+            badge_number VARCHAR(50) UNIQUE NOT NULL,
+            assigned_area VARCHAR(100),
+            duty_status VARCHAR(20) DEFAULT 'off-duty',
+            shift_start TIME,
+            shift_end TIME,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(user_id)
+        )
+    """)
+
+    # 6. PAYMENTS TABLE
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS payments (
+            payment_id INT AUTO_INCREMENT PRIMARY KEY,
+            violation_id INT NOT NULL,
+            user_id INT NOT NULL,
+            amount DECIMAL(10, 2) NOT NULL,
+            payment_method VARCHAR(50) NOT NULL,
+            payment_details TEXT,
+            transaction_reference VARCHAR(100),
+            status VARCHAR(20) DEFAULT 'completed',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (violation_id) REFERENCES violations(violation_id),
+            FOREIGN KEY (user_id) REFERENCES users(user_id)
+        )
+    """)
+
+
+def _m002_vehicle_status(cursor):
+    # Databases created before vehicles.status existed
+    if not _column_exists(cursor, "vehicles", "status"):
+        cursor.execute("ALTER TABLE vehicles ADD COLUMN status ENUM('active', 'expired', 'expiring') DEFAULT 'active'")
+
+
+def _m003_dashboard_counters(cursor):
+    # Single row, kept in step by the DatabaseManager write methods
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS dashboard_counters (
+            counter_id TINYINT PRIMARY KEY,
+            users INT NOT NULL DEFAULT 0,
+            enforcers INT NOT NULL DEFAULT 0,
+            vehicles INT NOT NULL DEFAULT 0,
+            violations INT NOT NULL DEFAULT 0,
+            pending_violations INT NOT NULL DEFAULT 0,
+            fines DECIMAL(14, 2) NOT NULL DEFAULT 0,
+            reconciled_at DATETIME NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        )
+    """)
+
+
+# (table, index name, columns) - the lookup each one serves is noted alongside
+HOT_PATH_INDEXES = [
+    # search_vehicle_full / per-plate history; leftmost column also serves plain plate lookups
+    ("violations", "idx_violations_plate_date", "plate_number, violation_date"),
+    # pending/paid filters and stats, ordered by date
+    ("violations", "idx_violations_status_date", "status, violation_date"),
+    # newest-first listings and keyset pages (InnoDB appends violation_id to the key)
+    ("violations", "idx_violations_date", "violation_date"),
+    # get_vehicles_by_owner ... ORDER BY created_at; also backs the owner_id foreign key
+    ("vehicles", "idx_vehicles_owner_created", "owner_id, created_at"),
+    # expiration scans
+    ("vehicles", "idx_vehicles_expiry", "expiry_date"),
+    # get_payment_history(user_id) ... ORDER BY created_at; also backs the user_id foreign key
+    ("payments", "idx_payments_user_created", "user_id, created_at"),
+]
+
+
+def _m004_hot_path_indexes(cursor):
+    for table, index, columns in HOT_PATH_INDEXES:
+        if not _index_exists(cursor, table, index):
+            cursor.execute(f"CREATE INDEX {index} ON {table} ({columns})")
+
+
+def _m005_job_runs(cursor):
+    # Last-run markers for scheduled jobs (e.g. the daily vehicle expiration pass)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS job_runs (
+            job_name VARCHAR(64) PRIMARY KEY,
+            last_run_date DATE NULL,
+            last_run_at DATETIME NULL,
+            rows_affected INT NOT NULL DEFAULT 0
+        )
+    """)
+
+
+def _m006_owner_violation_index(cursor):
+    # get_violations_by_owner / get_citizen_summary reach violations through vehicle_id and
+    # page newest first; supersedes the implicit single-column foreign key index
+    if not _index_exists(cursor, "violations", "idx_violations_vehicle_date"):
+        cursor.execute("CREATE INDEX idx_violations_vehicle_date ON violations (vehicle_id, violation_date)")
+
+
+def _m007_id_sequences(cursor):
+    # Block-reserved number sequences (models/sequences.py), e.g. citation numbers
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS id_sequences (
+            name VARCHAR(64) PRIMARY KEY,
+            next_value BIGINT NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute("INSERT IGNORE INTO id_sequences (name, next_value) VALUES ('citation', 0)")
+
+
+def _m008_violation_client_ref(cursor):
+    # Idempotency key for citations queued offline (models/offline.py): a retried sync finds
+    # the row it already wrote instead of inserting it twice
+    if not _column_exists(cursor, "violations", "client_ref"):
+        cursor.execute("ALTER TABLE violations ADD COLUMN client_ref VARCHAR(64) NULL")
+    if not _index_exists(cursor, "violations", "idx_violations_client_ref"):
+        cursor.execute("CREATE UNIQUE INDEX idx_violations_client_ref ON violations (client_ref)")
+
+
+MIGRATIONS = [
+    (1, "base tables", _m001_base_tables),
+    (2, "vehicles.status column", _m002_vehicle_status),
+    (3, "dashboard_counters summary table", _m003_dashboard_counters),
+    (4, "secondary indexes for hot lookups", _m004_hot_path_indexes),
+    (5, "job_runs markers for scheduled jobs", _m005_job_runs),
+    (6, "violations (vehicle_id, violation_date) index", _m006_owner_violation_index),
+    (7, "id_sequences for citation numbers", _m007_id_sequences),
+    (8, "violations.client_ref idempotency key", _m008_violation_client_ref),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+# ==================== RUNNER ====================
+def current_version(cursor) -> int:
+    """Highest applied migration, or 0 when the schema_migrations table is empty"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            description VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations")
+    return cursor.fetchone()[0]
+
+
+def migrate(conn, target=SCHEMA_VERSION) -> List[int]:
+    """Apply pending migrations up to `target`; returns the versions applied"""
+    cursor = conn.cursor()
+    applied = []
+    try:
+        version = current_version(cursor)
+        for number, description, apply in MIGRATIONS:
+            if number <= version or number > target:
+                continue
+            print(f"  - Applying migration {number}: {description}")
+            apply(cursor)
+            cursor.execute("INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                           (number, description))
+            conn.commit()
+            applied.append(number)
+        return applied
+    finally:
+        cursor.close()
@@ -0,0 +1,309 @@
+"""
+Offline-first citation queue for enforcers.
+
+RecordViolationDialog writes new citations to a CitationJournal, a small SQLite
+file on the enforcer's machine committed with fsync, so submitting never waits
+on the central database. CitationSync drains the journal in batches through
+DatabaseManager.add_violations_bulk(), backing off while the server is
+unreachable. Every queued citation carries a client_ref that is stored with the
+violation, so a batch whose acknowledgement was lost is reconciled (the server's
+citation number is copied back) instead of being inserted twice.
+"""
+import json
+import random
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+# Queue entry states: waiting to be sent / stored centrally / refused by the server
+QUEUED, SYNCED, REJECTED = "queued", "synced", "rejected"
+
+REQUIRED_FIELDS = ('plate_number', 'violation_type_id', 'enforcer_id', 'location', 'violation_date')
+# VARCHAR sizes of the violations columns (models/migrations.py)
+MAX_LENGTHS = {'plate_number': 20, 'location': 255}
+
+
+def validate_record(record) -> Optional[str]:
+    """Why the server would refuse this citation outright, or None if it looks storable"""
+    missing = [field for field in REQUIRED_FIELDS if record.get(field) in (None, "")]
+    if missing:
+        return f"missing {', '.join(missing)}"
+    for field, limit in MAX_LENGTHS.items():
+        if len(str(record[field])) > limit:
+            return f"{field} is longer than {limit} characters"
+    return None
+
+
+def provisional_reference(client_ref) -> str:
+    """Short reference shown to the motorist until the central citation number is known"""
+    return f"OFF-{client_ref[:8].upper()}"
+
+
+class CitationJournal:
+    """Durable local queue of citations waiting for the central database"""
+
+    def __init__(self, path="enforcer_journal.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        # Shared by the GUI thread (enqueue) and the sync worker, serialised by _lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # FULL: every commit is fsynced, so an accepted citation survives a crash or power loss
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS queued_citations (
+                local_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                client_ref TEXT UNIQUE NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                violation_id INTEGER,
+                citation_number TEXT,
+                queued_at TEXT NOT NULL,
+                synced_at TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_queued_citations_status ON queued_citations (status, local_id);
+            CREATE TABLE IF NOT EXISTS cached_violation_types (
+                type_id INTEGER PRIMARY KEY,
+                payload TEXT NOT NULL
+            );
+        """)
+
+    def enqueue(self, record) -> Dict:
+        """
+        Store one add_violations_bulk() record; returns its local_id, client_ref and provisional
+        reference. Raises ValueError for a record the server would never accept (validate_record()).
+        """
+        problem = validate_record(record)
+        if problem:
+            raise ValueError(problem)
+        client_ref = uuid.uuid4().hex
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO queued_citations (client_ref, payload, queued_at) VALUES (?, ?, ?)",
+                (client_ref, json.dumps(record, default=str), datetime.now().isoformat(" ", "seconds")))
+            self._conn.commit()
+            local_id = cursor.lastrowid
+        return {'local_id': local_id, 'client_ref': client_ref, 'reference': provisional_reference(client_ref)}
+
+    def pending(self, limit=200) -> List[Dict]:
+        """Oldest queued entries first: [{'local_id', 'client_ref', 'record'}]"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT local_id, client_ref, payload FROM queued_citations WHERE status = ? ORDER BY local_id LIMIT ?",
+                (QUEUED, limit)).fetchall()
+        return [{'local_id': local_id, 'client_ref': ref, 'record': json.loads(payload)} for local_id, ref, payload in rows]
+
+    def mark_synced(self, results):
+        """results: [(local_id, violation_id, citation_number)]"""
+        now = datetime.now().isoformat(" ", "seconds")
+        with self._lock:
+            self._conn.executemany("""
+                UPDATE queued_citations SET status = ?, violation_id = ?, citation_number = ?, synced_at = ?, last_error = NULL
+                WHERE local_id = ?
+            """, [(SYNCED, vid, citation, now, local_id) for local_id, vid, citation in results])
+            self._conn.commit()
+
+    def mark_rejected(self, results):
+        """results: [(local_id, error)] - the server will never accept these as they are"""
+        with self._lock:
+            self._conn.executemany("UPDATE queued_citations SET status = ?, last_error = ? WHERE local_id = ?",
+                                   [(REJECTED, error, local_id) for local_id, error in results])
+            self._conn.commit()
+
+    def mark_failed(self, local_ids, error, max_attempts=None):
+        """
+        Count an attempt the server answered with an error; entries that reach max_attempts
+        are rejected so they can't block the queue. Use note_unreachable() when the server
+        wasn't reached at all.
+        """
+        with self._lock:
+            self._conn.executemany("UPDATE queued_citations SET attempts = attempts + 1, last_error = ? WHERE local_id = ?",
+                                   [(error, local_id) for local_id in local_ids])
+            if max_attempts:
+                self._conn.execute("UPDATE queued_citations SET status = ? WHERE status = ? AND attempts >= ?",
+                                   (REJECTED, QUEUED, max_attempts))
+            self._conn.commit()
+
+    def note_unreachable(self, local_ids, error):
+        """Record why a send failed without counting an attempt: an outage must never reject citations"""
+        with self._lock:
+            self._conn.executemany("UPDATE queued_citations SET last_error = ? WHERE local_id = ?",
+                                   [(error, local_id) for local_id in local_ids])
+            self._conn.commit()
+
+    def requeue(self, local_ids=None) -> int:
+        """Send rejected entries again (all of them when local_ids is None); returns how many were requeued"""
+        with self._lock:
+            if local_ids is None:
+                cursor = self._conn.execute("UPDATE queued_citations SET status = ?, attempts = 0 WHERE status = ?",
+                                            (QUEUED, REJECTED))
+                count = cursor.rowcount
+            else:
+                count = 0
+                for local_id in local_ids:
+                    cursor = self._conn.execute(
+                        "UPDATE queued_citations SET status = ?, attempts = 0 WHERE status = ? AND local_id = ?",
+                        (QUEUED, REJECTED, local_id))
+                    count += cursor.rowcount
+            self._conn.commit()
+            return count
+
+    def counts(self) -> Dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM queued_citations GROUP BY status").fetchall()
+        counts = {QUEUED: 0, SYNCED: 0, REJECTED: 0}
+        counts.update(rows)
+        return counts
+
+    def entries(self, status=None, limit=50) -> List[Dict]:
+        """Newest entries first, e.g. entries(REJECTED) for the enforcer to review"""
+        sql = """
+            SELECT local_id, client_ref, payload, status, attempts, last_error, violation_id, citation_number, queued_at, synced_at
+            FROM queued_citations {} ORDER BY local_id DESC LIMIT ?
+        """.format("WHERE status = ?" if status else "")
+        with self._lock:
+            cursor = self._conn.execute(sql, (status, limit) if status else (limit,))
+            columns = [col[0] for col in cursor.description]
+            rows = cursor.fetchall()
+        entries = []
+        for row in rows:
+            entry = dict(zip(columns, row))
+            entry['record'] = json.loads(entry.pop('payload'))
+            entry['reference'] = provisional_reference(entry['client_ref'])
+            entries.append(entry)
+        return entries
+
+    def purge_synced(self, older_than_days=30) -> int:
+        cutoff = (datetime.now() - timedelta(days=older_than_days)).isoformat(" ", "seconds")
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM queued_citations WHERE status = ? AND synced_at < ?", (SYNCED, cutoff))
+            self._conn.commit()
+            return cursor.rowcount
+
+    # Last known violation types, so the form still works when the server is unreachable
+    def save_violation_types(self, types):
+        with self._lock:
+            self._conn.execute("DELETE FROM cached_violation_types")
+            self._conn.executemany("INSERT INTO cached_violation_types (type_id, payload) VALUES (?, ?)",
+                                   [(t['type_id'], json.dumps(t, default=str)) for t in types])
+            self._conn.commit()
+
+    def load_violation_types(self) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute("SELECT payload FROM cached_violation_types ORDER BY type_id").fetchall()
+        types = [json.loads(payload) for payload, in rows]
+        for t in types:
+            t['fine_amount'] = float(t['fine_amount'])
+        return types
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CitationSync:
+    """
+    Sends journal entries to the central database in batches.
+
+    sync_once() is meant to run on a worker thread (main.py uses the shared
+    QueryExecutor); next_delay() says when to call it again: immediately while
+    a backlog remains, after an exponential backoff with jitter while the server
+    is down or citations keep failing, and every `idle_interval` seconds otherwise.
+    """
+
+    def __init__(self, db_manager, journal, batch_size=200, base_delay=2.0, max_delay=300.0,
+                 idle_interval=30.0, max_attempts=50):
+        self.db_manager = db_manager
+        self.journal = journal
+        self.batch_size = batch_size
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.idle_interval = idle_interval
+        self.max_attempts = max_attempts
+        self.online = True
+        self._failures = 0
+        self._backlog = False
+        self._saved_types = None
+
+    def sync_once(self) -> Dict:
+        """Send one batch; returns its {'synced', 'reconciled', 'rejected', 'failed'} and the journal counts"""
+        summary = {'synced': 0, 'reconciled': 0, 'rejected': 0, 'failed': 0}
+        batch = self.journal.pending(self.batch_size)
+        if batch:
+            synced, rejected, failed = self._send(batch, summary)
+            # Any answer from the server means it is reachable, even if some rows failed;
+            # if nothing got through, ask the server directly before blaming the citations
+            self.online = bool(synced or rejected) or self._server_reachable()
+            if failed and self.online and len(batch) > 1:
+                # The server is up but rows failed: resend them one at a time, so only
+                # citations that fail on their own are charged an attempt
+                retry, failed = failed, []
+                for entry, _ in retry:
+                    one_synced, one_rejected, one_failed = self._send([entry], summary)
+                    synced += one_synced
+                    rejected += one_rejected
+                    failed += one_failed
+                if len(failed) == len(retry):
+                    self.online = self._server_reachable()
+            if synced:
+                self.journal.mark_synced(synced)
+            if rejected:
+                self.journal.mark_rejected(rejected)
+            by_error = {}
+            for entry, error in failed:
+                by_error.setdefault(error, []).append(entry['local_id'])
+            for error, local_ids in by_error.items():
+                if self.online:
+                    self.journal.mark_failed(local_ids, error, self.max_attempts)
+                else:
+                    self.journal.note_unreachable(local_ids, error)
+            summary.update(synced=len(synced), rejected=len(rejected), failed=len(failed))
+        else:
+            self.online = self._server_reachable()
+
+        if self.online:
+            types = self.db_manager.get_all_violation_types()
+            if types and types != self._saved_types:
+                self.journal.save_violation_types(types)
+                self._saved_types = types
+        # Back off while the server is down, and while citations keep failing on a reachable one
+        if self.online and not summary['failed']:
+            self._failures = 0
+        else:
+            self._failures += 1
+        summary['journal'] = self.journal.counts()
+        self._backlog = summary['journal'][QUEUED] > 0
+        return summary
+
+    def _send(self, entries, summary):
+        """add_violations_bulk() for journal entries -> (synced, rejected, failed); failed holds (entry, error)"""
+        records = [dict(entry['record'], client_ref=entry['client_ref']) for entry in entries]
+        outcomes = self.db_manager.add_violations_bulk(records)
+        synced, rejected, failed = [], [], []
+        for entry, outcome in zip(entries, outcomes):
+            if outcome['violation_id'] > 0:
+                synced.append((entry['local_id'], outcome['violation_id'], outcome['citation_number']))
+                summary['reconciled'] += outcome['existing']
+            elif outcome['retryable']:
+                failed.append((entry, outcome['error']))
+            else:
+                rejected.append((entry['local_id'], outcome['error']))
+        return synced, rejected, failed
+
+    def _server_reachable(self) -> bool:
+        try:
+            return self.db_manager.schema_version() > 0
+        except Exception:
+            return False
+
+    def next_delay(self) -> float:
+        """Seconds until the next sync_once()"""
+        if self._failures:
+            delay = min(self.max_delay, self.base_delay * 2 ** (self._failures - 1))
+            # Jitter, so offices coming back online together don't retry in lockstep
+            return delay * random.uniform(0.5, 1.0)
+        return 0.0 if self._backlog else self.idle_interval
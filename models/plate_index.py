@@ -0,0 +1,139 @@
+"""
+In-memory plate-number index for type-ahead and misread-tolerant lookups.
+
+Plates are indexed under two keys:
+
+  normalized   upper case, letters and digits only ("abc-1234" -> "ABC1234")
+  confusable   normalized, with characters an officer or camera easily mixes
+               up folded together (O/0/Q/D, I/1/L, 8/B, 5/S, 2/Z, 6/G), so
+               "ABC 1Z34" and "A8C 1234" both land on "ABC 1234"
+
+Each key lives in a sorted list (a flattened trie): a prefix query is one
+bisect plus a scan over the matches, i.e. O(log n + k), and a million plates
+cost a few hundred MB less than a dict-of-dicts trie would. add()/remove()
+keep the lists sorted in place, so vehicle writes update the index without a
+rebuild.
+"""
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional
+
+_NON_ALNUM = re.compile(r"[^0-9A-Z]")
+# Each group folds to its first character
+CONFUSABLE_GROUPS = ["0ODQ", "1IL", "8B", "5S", "2Z", "6G"]
+_FOLD = str.maketrans({ch: group[0] for group in CONFUSABLE_GROUPS for ch in group[1:]})
+# Separates the confusable key from the plate in the fuzzy list; sorts after every key character
+_SEP = "|"
+
+
+def normalize_plate(plate) -> str:
+    return _NON_ALNUM.sub("", str(plate).upper())
+
+
+def confusable_key(plate) -> str:
+    return normalize_plate(plate).translate(_FOLD)
+
+
+class PlateIndex:
+    """Normalized and confusable-folded plate keys in sorted lists; thread-safe"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._plates: Dict[str, str] = {}  # normalized -> plate as stored in vehicles
+        self._keys: List[str] = []         # sorted normalized keys
+        self._fuzzy: List[str] = []        # sorted "confusable|normalized"
+        self.built_at = None
+
+    @property
+    def ready(self) -> bool:
+        return self.built_at is not None
+
+    def age(self) -> Optional[float]:
+        return time.monotonic() - self.built_at if self.built_at is not None else None
+
+    def __len__(self):
+        return len(self._plates)
+
+    def build(self, plates: Iterable[str]):
+        """Replace the contents with `plates` (e.g. every vehicles.plate_number)"""
+        mapping = {}
+        for plate in plates:
+            key = normalize_plate(plate)
+            if key:
+                mapping[key] = plate
+        keys = sorted(mapping)
+        fuzzy = sorted(key.translate(_FOLD) + _SEP + key for key in keys)
+        with self._lock:
+            self._plates, self._keys, self._fuzzy = mapping, keys, fuzzy
+            self.built_at = time.monotonic()
+
+    def add(self, plate):
+        key = normalize_plate(plate)
+        if not key:
+            return
+        with self._lock:
+            if key not in self._plates:
+                insort(self._keys, key)
+                insort(self._fuzzy, key.translate(_FOLD) + _SEP + key)
+            self._plates[key] = plate
+
+    def remove(self, plate):
+        key = normalize_plate(plate)
+        with self._lock:
+            if self._plates.pop(key, None) is None:
+                return
+            for items, item in ((self._keys, key), (self._fuzzy, key.translate(_FOLD) + _SEP + key)):
+                i = bisect_left(items, item)
+                if i < len(items) and items[i] == item:
+                    del items[i]
+
+    def lookup(self, query) -> Optional[str]:
+        """The stored plate whose normalized form equals query's ("abc1234" -> "ABC 1234"), or None"""
+        with self._lock:
+            return self._plates.get(normalize_plate(query))
+
+    def suggest(self, query, limit=10) -> List[str]:
+        """
+        Up to `limit` stored plates for a partial or misread query, best first:
+        exact match, plates starting with the query, then plates that match or
+        start with it once confusable characters are folded.
+        """
+        key = normalize_plate(query)
+        if not key or limit <= 0:
+            return []
+        fold = key.translate(_FOLD)
+        found, seen = [], set()
+
+        def take(norm):
+            if norm not in seen:
+                seen.add(norm)
+                found.append(self._plates[norm])
+            return len(found) >= limit
+
+        with self._lock:
+            if key in self._plates and take(key):
+                return found
+            for norm in self._scan(self._keys, key):
+                if take(norm):
+                    return found
+            # Same length first (a misread plate), then longer ones (a misread prefix)
+            exact_fold = fold + _SEP
+            for entry in self._scan(self._fuzzy, exact_fold):
+                if take(entry[len(exact_fold):]):
+                    return found
+            for entry in self._scan(self._fuzzy, fold):
+                if take(entry.split(_SEP, 1)[1]):
+                    return found
+        return found
+
+    @staticmethod
+    def _scan(items, prefix):
+        i = bisect_left(items, prefix)
+        while i < len(items) and items[i].startswith(prefix):
+            yield items[i]
+            i += 1
+
+    def stats(self) -> Dict:
+        return {"plates": len(self._plates), "age": self.age()}
@@ -0,0 +1,199 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection became free within the checkout timeout"""
+
+
+class PooledConnection:
+    """Thin proxy around a driver connection; close() hands it back to the pool"""
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+        self._returned = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def close(self):
+        if not self._returned:
+            self._returned = True
+            self._pool.release(self._raw)
+
+    def invalidate(self):
+        """Close the underlying connection instead of returning it (e.g. mid-stream abort)"""
+        if not self._returned:
+            self._returned = True
+            self._pool.discard(self._raw)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe connection pool.
+
+    Keeps up to `size` idle connections around and allows `max_overflow`
+    extra short-lived connections under load. Idle connections older than
+    `idle_timeout` seconds are dropped, and connections are health-checked
+    on checkout when `pre_ping` is enabled.
+    """
+
+    def __init__(self, creator: Callable, size=5, max_overflow=10, idle_timeout=300,
+                 timeout=10, pre_ping=True, ping: Optional[Callable] = None):
+        self._creator = creator
+        self._ping = ping or self._default_ping
+        self.size = size
+        self.max_overflow = max_overflow
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.pre_ping = pre_ping
+
+        self._idle = deque()  # (connection, last_used)
+        self._checked_out = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "reconnects": 0,
+            "created": 0,
+            "discarded": 0,
+        }
+
+    @staticmethod
+    def _default_ping(raw) -> bool:
+        is_connected = getattr(raw, "is_connected", None)
+        return is_connected() if is_connected else True
+
+    def acquire(self) -> Optional[PooledConnection]:
+        deadline = time.monotonic() + self.timeout
+        stale = []
+        with self._cond:
+            self._stats["checkouts"] += 1
+            waited = False
+            while True:
+                stale.extend(self._prune_idle())
+                if self._idle:
+                    raw, _ = self._idle.pop()  # LIFO keeps the warmest connection busy
+                    break
+                if self._checked_out < self.size + self.max_overflow:
+                    raw = None
+                    break
+                if not waited:
+                    self._stats["waits"] += 1
+                    waited = True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolTimeout(f"No connection available after {self.timeout}s")
+                self._cond.wait(remaining)
+            self._checked_out += 1
+
+        for conn in stale:
+            self._close_quietly(conn)
+
+        try:
+            if raw is not None and self.pre_ping and not self._safe_ping(raw):
+                self._close_quietly(raw)
+                with self._cond:
+                    self._stats["reconnects"] += 1
+                    self._stats["discarded"] += 1
+                raw = None
+            if raw is None:
+                raw = self._creator()
+                if raw is not None:
+                    with self._cond:
+                        self._stats["created"] += 1
+        except Exception:
+            self._free_slot()
+            raise
+
+        if raw is None:
+            self._free_slot()
+            return None
+        return PooledConnection(self, raw)
+
+    def release(self, raw):
+        healthy = True
+        try:
+            # Never hand out a connection with an open transaction/snapshot
+            if getattr(raw, "in_transaction", True):
+                raw.rollback()
+        except Exception:
+            healthy = False
+
+        with self._cond:
+            self._checked_out -= 1
+            keep = healthy and len(self._idle) < self.size
+            if keep:
+                self._idle.append((raw, time.monotonic()))
+            else:
+                self._stats["discarded"] += 1
+            self._cond.notify()
+        if not keep:
+            self._close_quietly(raw)
+
+    def discard(self, raw):
+        """Drop a checked-out connection without reusing it"""
+        with self._cond:
+            self._checked_out -= 1
+            self._stats["discarded"] += 1
+            self._cond.notify()
+        self._close_quietly(raw)
+
+    def dispose(self):
+        """Close every idle connection (checked-out ones close on release)"""
+        with self._cond:
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+        for conn in idle:
+            self._close_quietly(conn)
+
+    def stats(self) -> Dict:
+        with self._cond:
+            snapshot = dict(self._stats)
+            snapshot.update({
+                "size": self.size,
+                "max_overflow": self.max_overflow,
+                "in_use": self._checked_out,
+                "idle": len(self._idle),
+            })
+        return snapshot
+
+    def _prune_idle(self):
+        if not self.idle_timeout:
+            return []
+        cutoff = time.monotonic() - self.idle_timeout
+        stale = []
+        # Oldest connections sit at the left end of the deque
+        while self._idle and self._idle[0][1] < cutoff:
+            stale.append(self._idle.popleft()[0])
+            self._stats["discarded"] += 1
+        return stale
+
+    def _free_slot(self):
+        with self._cond:
+            self._checked_out -= 1
+            self._cond.notify()
+
+    def _safe_ping(self, raw) -> bool:
+        try:
+            return bool(self._ping(raw))
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
@@ -0,0 +1,167 @@
+"""
+Aggregate reports for analysts.
+
+Every report is a single GROUP BY query over violations, so MySQL does the
+counting and summing and only the grouped rows reach Python. Results can be
+written as CSV, JSON Lines or Parquet (columnar; needs the optional pyarrow
+package). ReportEngine does blocking I/O, so the UI runs it on the
+QueryExecutor.
+"""
+import csv
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from importlib.util import find_spec
+from typing import Dict, List, Optional, Tuple
+
+from models.database import DatabaseManager
+
+# name -> definition. "sql" gets the WHERE clause built from the date range plus
+# any report-specific "where" conditions; "options" are extra bind parameters
+# appended after the filter parameters, in order, with their defaults.
+REPORTS = {
+    "revenue_by_type": {
+        "title": "Revenue by Violation Type",
+        "columns": ["violation_type", "citations", "assessed", "collected", "outstanding"],
+        "where": ["v.status <> 'cancelled'"],
+        "sql": """
+            SELECT vt.violation_name, COUNT(*),
+                   SUM(v.fine_amount),
+                   SUM(CASE WHEN v.status = 'paid' THEN v.fine_amount ELSE 0 END),
+                   SUM(CASE WHEN v.status <> 'paid' THEN v.fine_amount ELSE 0 END)
+            FROM violations v
+            JOIN violation_types vt ON v.violation_type_id = vt.type_id
+            {where}
+            GROUP BY vt.type_id, vt.violation_name
+            ORDER BY SUM(v.fine_amount) DESC
+        """,
+    },
+    "citations_per_enforcer_day": {
+        "title": "Citations per Enforcer per Day",
+        "columns": ["day", "enforcer_id", "enforcer", "citations", "assessed"],
+        "sql": """
+            SELECT DATE(v.violation_date), v.enforcer_id, u.full_name, COUNT(*), SUM(v.fine_amount)
+            FROM violations v
+            JOIN users u ON v.enforcer_id = u.user_id
+            {where}
+            GROUP BY DATE(v.violation_date), v.enforcer_id, u.full_name
+            ORDER BY DATE(v.violation_date), u.full_name
+        """,
+    },
+    "collection_rate_by_month": {
+        "title": "Collection Rate by Month",
+        "columns": ["year", "month", "citations", "paid_citations", "assessed", "collected", "collection_rate"],
+        "where": ["v.status <> 'cancelled'"],
+        "sql": """
+            SELECT YEAR(v.violation_date), MONTH(v.violation_date), COUNT(*),
+                   SUM(CASE WHEN v.status = 'paid' THEN 1 ELSE 0 END),
+                   SUM(v.fine_amount),
+                   SUM(CASE WHEN v.status = 'paid' THEN v.fine_amount ELSE 0 END),
+                   ROUND(100 * SUM(CASE WHEN v.status = 'paid' THEN v.fine_amount ELSE 0 END)
+                         / NULLIF(SUM(v.fine_amount), 0), 2)
+            FROM violations v
+            {where}
+            GROUP BY YEAR(v.violation_date), MONTH(v.violation_date)
+            ORDER BY YEAR(v.violation_date), MONTH(v.violation_date)
+        """,
+    },
+    "top_repeat_plates": {
+        "title": "Top Repeat-Offender Plates",
+        "columns": ["plate_number", "citations", "assessed", "outstanding", "first_violation", "last_violation"],
+        "options": [("min_citations", 2), ("limit", 100)],
+        "sql": """
+            SELECT v.plate_number, COUNT(*), SUM(v.fine_amount),
+                   SUM(CASE WHEN v.status NOT IN ('paid', 'cancelled') THEN v.fine_amount ELSE 0 END),
+                   MIN(v.violation_date), MAX(v.violation_date)
+            FROM violations v
+            {where}
+            GROUP BY v.plate_number
+            HAVING COUNT(*) >= %s
+            ORDER BY COUNT(*) DESC, v.plate_number
+            LIMIT %s
+        """,
+    },
+}
+
+# format -> (label, file extension, module it needs or None)
+FORMATS = {
+    "csv": ("CSV", ".csv", None),
+    "jsonl": ("JSON Lines", ".jsonl", None),
+    "parquet": ("Parquet", ".parquet", "pyarrow"),
+}
+
+
+def available_formats() -> List[str]:
+    """Export formats whose optional dependencies are installed"""
+    return [fmt for fmt, (_, _, module) in FORMATS.items() if module is None or find_spec(module)]
+
+
+def _plain(value):
+    """Decimal/date values as JSON- and Arrow-friendly scalars"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+class ReportEngine:
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+
+    def build_sql(self, name, start=None, end=None, **options) -> Tuple[str, List]:
+        """SQL and bind parameters for report `name` over [start, end] (inclusive days)"""
+        spec = REPORTS[name]
+        where, params = DatabaseManager._violation_filter_sql({'start_date': start, 'end_date': end})
+        where += spec.get("where", [])
+        sql = spec["sql"].format(where="WHERE " + " AND ".join(where) if where else "")
+        for option, default in spec.get("options", []):
+            params.append(options.get(option, default))
+        return sql, params
+
+    def run(self, name, start=None, end=None, **options) -> Tuple[List[str], List[tuple]]:
+        """Execute report `name`; returns (column names, rows). Raises on database errors."""
+        sql, params = self.build_sql(name, start, end, **options)
+        conn = self.db_manager.connect()
+        if not conn:
+            raise ConnectionError("no database connection available")
+        cursor = conn.cursor()
+        try:
+            cursor.execute(sql, params)
+            return list(REPORTS[name]["columns"]), cursor.fetchall()
+        finally:
+            cursor.close()
+            conn.close()
+
+    def export(self, name, path, fmt="csv", start=None, end=None, **options) -> int:
+        """Run report `name` and write it to `path` as `fmt`; returns the number of rows written"""
+        if fmt not in available_formats():
+            raise ValueError(f"Unsupported or unavailable export format: {fmt}")
+        columns, rows = self.run(name, start, end, **options)
+        getattr(self, f"_write_{fmt}")(path, columns, rows)
+        return len(rows)
+
+    # ---------- Writers ----------
+    @staticmethod
+    def _write_csv(path, columns, rows):
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            writer.writerows(rows)
+
+    @staticmethod
+    def _write_jsonl(path, columns, rows):
+        with open(path, 'w') as f:
+            for row in rows:
+                f.write(json.dumps({col: _plain(val) for col, val in zip(columns, row)}))
+                f.write("\n")
+
+    @staticmethod
+    def _write_parquet(path, columns, rows):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        data: Dict[str, list] = {col: [] for col in columns}
+        for row in rows:
+            for col, val in zip(columns, row):
+                data[col].append(float(val) if isinstance(val, Decimal) else val)
+        pq.write_table(pa.table(data), path)
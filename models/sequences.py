@@ -0,0 +1,64 @@
+import threading
+from typing import Dict, List
+
+
+class BlockSequence:
+    """
+    Unique, increasing numbers from a named row in the id_sequences table.
+
+    Each client reserves `block_size` numbers at a time with one atomic update
+    (StorageBackend.reserve_block; UPDATE ... LAST_INSERT_ID(next_value + n) on
+    MySQL), then hands them out from memory, so most next() calls cost no
+    database round trip. Numbers are unique across
+    clients and increasing within a client; numbers left in a block when the
+    process exits are skipped, never reused.
+
+    Reserving a block borrows its own pooled connection and commits at once, so
+    a rolled-back insert can never hand the block out twice. Callers that hold a
+    pooled connection themselves should take their numbers before acquiring it.
+    """
+
+    def __init__(self, db_manager, name, block_size=100):
+        self.db_manager = db_manager
+        self.name = name
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._next = 0
+        self._end = 0  # exclusive
+        self._stats = {"issued": 0, "blocks": 0}
+
+    def next(self) -> int:
+        return self.take(1)[0]
+
+    def take(self, count) -> List[int]:
+        """`count` numbers in increasing order; what the current block lacks is reserved in one round trip"""
+        with self._lock:
+            values = list(range(self._next, min(self._end, self._next + count)))
+            self._next += len(values)
+            short = count - len(values)
+            if short > 0:
+                # Whole blocks, so the leftover keeps serving later next() calls
+                self._reserve_block(-(-short // self.block_size) * self.block_size)
+                values.extend(range(self._next, self._next + short))
+                self._next += short
+            self._stats["issued"] += count
+            return values
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self._stats, block_size=self.block_size, remaining=self._end - self._next)
+
+    def _reserve_block(self, size):
+        conn = self.db_manager.connect()
+        if not conn:
+            raise ConnectionError("no database connection available")
+        cursor = conn.cursor()
+        try:
+            high = self.db_manager.backend.reserve_block(cursor, self.name, size)
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
+        self._next = high - size + 1
+        self._end = high + 1
+        self._stats["blocks"] += 1
@@ -0,0 +1,116 @@
+import itertools
+import traceback
+from typing import Callable, Dict, Optional
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+
+class _JobSignals(QObject):
+    # Emitted from worker threads; queued back to the thread owning the executor
+    done = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+
+class _QueryJob(QRunnable):
+    def __init__(self, ticket, fn, args, kwargs, signals):
+        super().__init__()
+        self.ticket = ticket
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = signals
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.failed.emit(self.ticket, str(e))
+            return
+        self.signals.done.emit(self.ticket, result)
+
+
+class QueryExecutor(QObject):
+    """
+    Runs DatabaseManager calls on a QThreadPool and delivers results on the GUI thread.
+
+    Jobs are submitted under a key (e.g. "admin.stats"). Submitting again under the
+    same key supersedes the earlier job: its result is dropped when it arrives.
+    cancel()/cancel_all() discard queued jobs and ignore results still in flight.
+    """
+    busy_changed = pyqtSignal(str, bool)  # key, busy
+
+    def __init__(self, max_threads=4, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._signals = _JobSignals(self)
+        self._signals.done.connect(self._on_done)
+        self._signals.failed.connect(self._on_failed)
+        self._tickets = itertools.count(1)
+        self._jobs: Dict[int, tuple] = {}   # ticket -> (key, on_result, on_error)
+        self._latest: Dict[str, int] = {}   # key -> newest ticket
+
+    def submit(self, key: str, fn: Callable, *args, on_result: Optional[Callable] = None,
+               on_error: Optional[Callable] = None, **kwargs) -> int:
+        ticket = next(self._tickets)
+        superseded = self._latest.get(key)
+        if superseded is not None:
+            self._jobs.pop(superseded, None)
+        else:
+            self.busy_changed.emit(key, True)
+        self._latest[key] = ticket
+        self._jobs[ticket] = (key, on_result, on_error)
+        self.pool.start(_QueryJob(ticket, fn, args, kwargs, self._signals))
+        return ticket
+
+    def is_busy(self, key: str) -> bool:
+        return key in self._latest
+
+    def cancel(self, key: str):
+        ticket = self._latest.pop(key, None)
+        if ticket is not None:
+            self._jobs.pop(ticket, None)
+            self.busy_changed.emit(key, False)
+
+    def cancel_all(self, keep=()):
+        """
+        Drop queued jobs and ignore results of those already running. Jobs whose key
+        starts with one of the `keep` prefixes (e.g. "app.") are left running and
+        still report back, so is_busy() keeps guarding them.
+        """
+        keep = tuple(keep)
+        if not keep:
+            # Nothing to spare: queued jobs needn't run at all
+            self.pool.clear()
+        for key in [key for key in self._latest if not key.startswith(keep)]:
+            self.cancel(key)
+
+    def wait_for_done(self, msecs=-1) -> bool:
+        return self.pool.waitForDone(msecs)
+
+    def _finish(self, ticket):
+        entry = self._jobs.pop(ticket, None)
+        if entry is None:
+            return None  # superseded or cancelled
+        key = entry[0]
+        if self._latest.get(key) == ticket:
+            del self._latest[key]
+            self.busy_changed.emit(key, False)
+        return entry
+
+    @pyqtSlot(int, object)
+    def _on_done(self, ticket, result):
+        entry = self._finish(ticket)
+        if entry and entry[1]:
+            entry[1](result)
+
+    @pyqtSlot(int, str)
+    def _on_failed(self, ticket, message):
+        entry = self._finish(ticket)
+        if entry is None:
+            return
+        if entry[2]:
+            entry[2](message)
+        else:
+            print(f"  ⚠ Background query '{entry[0]}' failed: {message}")
@@ -0,0 +1,62 @@
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+# Tests run from the repo root or from tests/; the app imports its packages as top-level modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.backends import SQLiteBackend  # noqa: E402
+from models.database import DatabaseManager  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Freshly migrated and seeded DatabaseManager on a throwaway SQLite file"""
+    manager = DatabaseManager(backend=SQLiteBackend(str(tmp_path / "nexus.db")), instrument_queries=False)
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def strict_lengths(db):
+    """SQLite ignores VARCHAR lengths; make an over-long location fail as in MySQL strict mode"""
+    conn = db.connect()
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TRIGGER strict_violation_location BEFORE INSERT ON violations
+        WHEN length(NEW.location) > 255
+        BEGIN SELECT RAISE(ABORT, 'Data too long for column location'); END
+    """)
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return db
+
+
+@pytest.fixture
+def enforcer_id(db):
+    conn = db.connect()
+    cursor = conn.cursor()
+    cursor.execute("SELECT user_id FROM users WHERE role='enforcer' ORDER BY user_id LIMIT 1")
+    user_id = cursor.fetchone()[0]
+    cursor.close()
+    conn.close()
+    return user_id
+
+
+@pytest.fixture
+def type_id(db):
+    return db.get_all_violation_types()[0]['type_id']
+
+
+@pytest.fixture
+def make_record(enforcer_id, type_id):
+    """add_violations_bulk() record factory; keyword arguments override the defaults"""
+    def make(**fields):
+        record = {'plate_number': "ABC 1234", 'violation_type_id': type_id, 'enforcer_id': enforcer_id,
+                  'location': "Roxas Ave", 'violation_date': datetime(2026, 1, 15, 9, 30), 'notes': None}
+        record.update(fields)
+        return record
+    return make
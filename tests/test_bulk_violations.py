@@ -0,0 +1,56 @@
+from models.database import DatabaseManager
+
+
+def test_inserts_every_record_with_its_own_citation(db, make_record):
+    outcomes = db.add_violations_bulk([make_record(location=f"Checkpoint {i}") for i in range(25)], chunk_size=10)
+
+    assert all(o['violation_id'] > 0 and not o['error'] for o in outcomes)
+    assert len({o['citation_number'] for o in outcomes}) == 25
+    assert len({o['violation_id'] for o in outcomes}) == 25
+
+
+def test_bad_row_fails_alone_and_is_not_retryable(strict_lengths, make_record):
+    records = [make_record(location=f"Checkpoint {i}") for i in range(5)]
+    records.insert(2, make_record(location="x" * 300))
+
+    outcomes = strict_lengths.add_violations_bulk(records)
+
+    bad = outcomes.pop(2)
+    assert bad['violation_id'] == -1 and bad['citation_number'] is None
+    assert "too long" in bad['error'] and bad['retryable'] is False
+    assert all(o['violation_id'] > 0 and not o['error'] for o in outcomes)
+    assert strict_lengths.reconcile_dashboard_counters() == {}
+
+
+def test_invalid_records_are_not_retryable(db, make_record):
+    outcomes = db.add_violations_bulk([make_record(location=""), make_record(violation_type_id=-1),
+                                       make_record(enforcer_id=-1)])
+
+    assert [o['retryable'] for o in outcomes] == [False, False, False]
+    assert outcomes[0]['error'] == "missing location"
+    assert outcomes[1]['error'] == "unknown violation type -1"
+    assert outcomes[2]['error'] == "unknown enforcer -1"
+
+
+def test_client_ref_makes_resubmission_idempotent(db, make_record):
+    first = db.add_violations_bulk([make_record(client_ref="ref-1"), make_record(client_ref="ref-2")])
+    again = db.add_violations_bulk([make_record(client_ref="ref-1"), make_record(client_ref="ref-2")])
+
+    assert [o['existing'] for o in again] == [True, True]
+    assert [(o['violation_id'], o['citation_number']) for o in again] == \
+           [(o['violation_id'], o['citation_number']) for o in first]
+
+
+def test_duplicate_client_ref_within_a_batch(db, make_record):
+    outcomes = db.add_violations_bulk([make_record(client_ref="dup"), make_record(client_ref="dup")])
+
+    assert outcomes[0]['violation_id'] > 0
+    assert outcomes[1]['error'] == "duplicate client_ref dup in batch" and outcomes[1]['retryable'] is False
+
+
+def test_no_connection_is_retryable(db, make_record, monkeypatch):
+    monkeypatch.setattr(DatabaseManager, "connect", lambda self: None)
+
+    outcomes = db.add_violations_bulk([make_record(), make_record()])
+
+    assert all("no database connection" in o['error'] and o['retryable'] for o in outcomes)
@@ -0,0 +1,62 @@
+import threading
+from datetime import datetime
+
+import pytest
+
+from models.backends import SQLiteBackend
+from models.database import DatabaseManager
+from models.sequences import BlockSequence
+
+
+def test_take_spans_blocks_without_gaps_or_repeats(db):
+    sequence = BlockSequence(db, "test", block_size=10)
+
+    first = sequence.take(7)
+    second = sequence.take(25)  # 3 left in the block + a 30-number reservation
+    third = [sequence.next() for _ in range(6)]
+
+    numbers = first + second + third
+    assert numbers == list(range(1, 39))
+    assert sequence.stats() == {"issued": 38, "blocks": 2, "block_size": 10, "remaining": 2}
+
+
+def test_clients_never_share_numbers(db):
+    other = DatabaseManager(backend=SQLiteBackend(db.backend.path), instrument_queries=False)
+    sequences = [BlockSequence(db, "shared", block_size=5), BlockSequence(other, "shared", block_size=5)]
+    issued = [[], []]
+
+    def client(k):
+        for _ in range(200):
+            issued[k].append(sequences[k].next())
+
+    threads = [threading.Thread(target=client, args=(k,)) for k in (0, 1)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    other.close()
+
+    assert issued[0] == sorted(issued[0]) and issued[1] == sorted(issued[1])
+    assert len(set(issued[0]) | set(issued[1])) == 400
+
+
+@pytest.fixture
+def single_connection_db(db):
+    """db's file behind one pooled connection and blocks of one number: every citation needs a new block"""
+    manager = DatabaseManager(backend=SQLiteBackend(db.backend.path), instrument_queries=False,
+                              pool_size=1, max_overflow=0, pool_timeout=1, citation_block_size=1)
+    yield manager
+    manager.close()
+
+
+def test_citations_reserve_blocks_before_holding_a_connection(single_connection_db, make_record):
+    enforcer_id, type_id = make_record()['enforcer_id'], make_record()['violation_type_id']
+
+    violation_id = single_connection_db.add_violation("ABC 1234", type_id, enforcer_id, "Roxas Ave", datetime.now())
+    outcomes = single_connection_db.add_violations_bulk([make_record(location=f"Checkpoint {i}") for i in range(3)])
+
+    assert single_connection_db.get_pool_stats()['timeouts'] == 0
+    assert violation_id > 0
+    assert all(o['violation_id'] > 0 for o in outcomes)
+    numbers = [o['citation_number'] for o in outcomes]
+    assert numbers == sorted(numbers) and len(set(numbers)) == 3
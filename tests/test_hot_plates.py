@@ -0,0 +1,62 @@
+from datetime import date, datetime
+
+from models.backends import SQLiteBackend
+from models.cache import LRUCache
+from models.database import DatabaseManager
+
+
+def test_peek_leaves_stats_and_order_alone():
+    cache = LRUCache(lambda key: key.lower(), maxsize=2, key=str.upper)
+    cache.get("a")
+    cache.get("b")
+
+    assert cache.peek("a") == "a" and cache.peek("zzz") is None
+    cache.get("c")  # evicts the least recently used entry, still "A" despite the peek
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (0, 3)
+    assert cache.peek("a") is None and cache.peek("b") == "b"
+
+
+def test_loader_gets_the_key_and_misses_are_not_cached():
+    loaded = []
+    cache = LRUCache(lambda key: loaded.append(key), key=str.upper)
+
+    assert cache.get("xyz 999") is None and cache.get("xyz 999") is None
+    assert loaded == ["XYZ 999", "XYZ 999"]
+
+
+def test_search_is_case_insensitive_and_never_caches_a_miss(db):
+    owner_id = db.search_vehicle("ABC 1234")['owner_id']
+    assert db.search_vehicle("xyz 999") is None
+
+    db.add_vehicle("XYZ 999", owner_id, "Honda", "City", 2022, "Red", "CH-XYZ999", date(2024, 1, 1),
+                   date(2030, 1, 1), "OR-XYZ999")
+
+    assert db.search_vehicle("xyz 999")['plate_number'] == "XYZ 999"
+    assert db.search_vehicle_full(" Xyz 999 ")['vehicle']['plate_number'] == "XYZ 999"
+
+
+def test_citing_does_not_count_as_a_cache_lookup(db, make_record):
+    record = make_record()
+    db.add_violation(record['plate_number'], record['violation_type_id'], record['enforcer_id'], "Roxas Ave",
+                     datetime.now())
+
+    stats = db.get_hot_plate_cache_stats()
+    assert (stats["hits"], stats["misses"]) == (0, 0)
+
+
+def test_other_terminals_citations_and_payments_show_up_at_once(db, make_record):
+    other = DatabaseManager(backend=SQLiteBackend(db.backend.path), instrument_queries=False)
+    before = db.search_vehicle_full("ABC 1234")['violations']
+    record = make_record()
+
+    violation_id = other.add_violation("ABC 1234", record['violation_type_id'], record['enforcer_id'], "Roxas Ave",
+                                       datetime.now())
+    assert len(db.search_vehicle_full("ABC 1234")['violations']) == len(before) + 1
+
+    assert other.record_payment(violation_id, method="cash")
+    statuses = {v['violation_id']: v['status'] for v in db.search_vehicle_full("ABC 1234")['violations']}
+    assert statuses[violation_id] == "paid"
+    assert db.get_hot_plate_cache_stats()["hits"] >= 2
+    other.close()
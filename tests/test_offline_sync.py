@@ -0,0 +1,110 @@
+import pytest
+
+from models import offline
+from models.database import DatabaseManager
+from models.offline import CitationJournal, CitationSync, QUEUED, REJECTED, SYNCED
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = CitationJournal(str(tmp_path / "journal.db"))
+    yield journal
+    journal.close()
+
+
+def queue(journal, records):
+    return [journal.enqueue(record)['local_id'] for record in records]
+
+
+def attempts(journal):
+    return {e['local_id']: e['attempts'] for e in journal.entries(limit=1000)}
+
+
+def test_drains_the_queue_and_copies_citation_numbers_back(db, journal, make_record):
+    queue(journal, [make_record(location=f"Checkpoint {i}") for i in range(7)])
+    sync = CitationSync(db, journal, batch_size=3)
+
+    while journal.counts()[QUEUED]:
+        sync.sync_once()
+
+    synced = journal.entries(SYNCED)
+    assert len(synced) == 7 and all(e['citation_number'] for e in synced)
+    assert sync.next_delay() == sync.idle_interval
+
+
+def test_one_bad_citation_does_not_poison_the_batch(strict_lengths, journal, make_record, monkeypatch):
+    queue(journal, [make_record(location=f"Checkpoint {i}") for i in range(5)])
+    # Queued before enqueue() validated records (e.g. by an older build)
+    monkeypatch.setattr(offline, "validate_record", lambda record: None)
+    bad_id = queue(journal, [make_record(location="x" * 300)])[0]
+    sync = CitationSync(strict_lengths, journal)
+
+    for _ in range(50):
+        sync.sync_once()
+
+    assert journal.counts() == {QUEUED: 0, SYNCED: 5, REJECTED: 1}
+    assert [e['local_id'] for e in journal.entries(REJECTED)] == [bad_id]
+
+
+def test_online_failure_is_charged_only_to_the_failing_row(db, journal, make_record, monkeypatch):
+    bulk = DatabaseManager.add_violations_bulk
+
+    def flaky(self, records, **kwargs):
+        # Any chunk holding the "flaky" row fails as a whole with a transient error
+        if any(r['location'] == "flaky" for r in records):
+            return [{'violation_id': -1, 'citation_number': None, 'error': "lock wait timeout",
+                     'retryable': True, 'existing': False} for _ in records]
+        return bulk(self, records, **kwargs)
+    monkeypatch.setattr(DatabaseManager, "add_violations_bulk", flaky)
+    ids = queue(journal, [make_record(), make_record(location="flaky"), make_record()])
+    sync = CitationSync(db, journal, max_attempts=3)
+
+    sync.sync_once()
+
+    assert journal.counts() == {QUEUED: 1, SYNCED: 2, REJECTED: 0}
+    assert attempts(journal)[ids[1]] == 1
+    assert sync.online and sync.next_delay() > 0  # backs off instead of spinning on the failing row
+
+
+class _UnreachableServer:
+    def add_violations_bulk(self, records, **kwargs):
+        return [{'violation_id': -1, 'citation_number': None, 'error': "no database connection",
+                 'retryable': True, 'existing': False} for _ in records]
+
+    def schema_version(self):
+        raise ConnectionError("no database connection available")
+
+
+def test_outage_never_rejects_and_backs_off(journal, make_record):
+    ids = queue(journal, [make_record(), make_record()])
+    sync = CitationSync(_UnreachableServer(), journal, base_delay=1.0, max_delay=8.0, max_attempts=3)
+
+    delays = []
+    for _ in range(10):
+        sync.sync_once()
+        delays.append(sync.next_delay())
+
+    assert not sync.online
+    assert journal.counts() == {QUEUED: 2, SYNCED: 0, REJECTED: 0}
+    assert attempts(journal) == {ids[0]: 0, ids[1]: 0}
+    assert 0.5 <= delays[0] <= 1.0 and 4.0 <= delays[-1] <= 8.0
+
+
+def test_requeue_sends_rejected_citations_again(db, journal, make_record):
+    local_id = queue(journal, [make_record(violation_type_id=-1)])[0]
+    sync = CitationSync(db, journal)
+    sync.sync_once()
+    assert journal.counts()[REJECTED] == 1
+
+    assert journal.requeue([local_id]) == 1
+    assert journal.counts() == {QUEUED: 1, SYNCED: 0, REJECTED: 0}
+    assert attempts(journal)[local_id] == 0
+
+
+def test_journal_refuses_citations_the_server_would_reject(journal, make_record):
+    for record, problem in ((make_record(location="x" * 256), "location is longer than 255 characters"),
+                            (make_record(violation_type_id=None), "missing violation_type_id"),
+                            (make_record(plate_number=""), "missing plate_number")):
+        with pytest.raises(ValueError, match=problem):
+            journal.enqueue(record)
+    assert journal.counts() == {QUEUED: 0, SYNCED: 0, REJECTED: 0}
@@ -0,0 +1,75 @@
+from datetime import date
+
+import pytest
+
+from models.plate_index import PlateIndex, confusable_key, normalize_plate
+
+
+@pytest.fixture
+def index():
+    plates = PlateIndex()
+    plates.build(["ABC 1234", "ABC 1299", "ABD 5678", "XYZ 0001", "NBC 1234"])
+    return plates
+
+
+def test_keys():
+    assert normalize_plate(" abc-1234 ") == "ABC1234"
+    assert confusable_key("a8c 1z34") == confusable_key("ABC 1234") == "A8C1234"
+    assert confusable_key("OQD0") == "0000"
+
+
+def test_lookup_returns_plate_as_stored(index):
+    assert index.lookup("abc1234") == "ABC 1234"
+    assert index.lookup("ABC-1234") == "ABC 1234"
+    assert index.lookup("A8C 1234") is None  # lookup is exact; misreads go through suggest()
+    assert len(index) == 5 and index.ready
+
+
+def test_suggest_orders_exact_then_prefix(index):
+    assert index.suggest("abc1234") == ["ABC 1234"]
+    assert index.suggest("ab") == ["ABC 1234", "ABC 1299", "ABD 5678"]
+    assert index.suggest("ab", limit=2) == ["ABC 1234", "ABC 1299"]
+    assert index.suggest("") == [] and index.suggest("ab", limit=0) == []
+
+
+def test_suggest_folds_confusables(index):
+    assert index.suggest("A8C 1Z34") == ["ABC 1234"]
+    assert index.suggest("XYZ OOO1") == ["XYZ 0001"]
+    # Misread prefix: same-length matches first, then longer plates
+    assert index.suggest("A8C 12") == ["ABC 1234", "ABC 1299"]
+
+
+def test_add_and_remove_keep_index_sorted(index):
+    index.add("ABB 0001")
+    assert index.suggest("AB") == ["ABB 0001", "ABC 1234", "ABC 1299", "ABD 5678"]
+    assert index.suggest("A88 OOO1") == ["ABB 0001"]
+
+    index.remove("abc-1234")
+    index.remove("NOT THERE")
+    assert index.lookup("ABC 1234") is None
+    assert index.suggest("A8C") == ["ABC 1299"]
+    assert len(index) == 5
+
+
+def test_database_manager_plate_lookups(db):
+    assert db.is_registered_plate("ABC 1234") is None  # index not built yet
+    assert db.suggest_plates("ABC") == []
+
+    assert db.warm_plate_index() == 1
+    assert db.resolve_plate("abc1234") == "ABC 1234"
+    assert db.resolve_plate(" new 1 ") == "NEW 1"
+    assert db.is_registered_plate("ABC 1234") is True
+    assert db.is_registered_plate("ZZZ 9999") is False
+
+    conn = db.connect()
+    cursor = conn.cursor()
+    cursor.execute("SELECT user_id FROM users WHERE role='citizen' ORDER BY user_id LIMIT 1")
+    owner_id = cursor.fetchone()[0]
+    cursor.close()
+    conn.close()
+    vehicle_id = db.add_vehicle("A8C 9999", owner_id, "Toyota", "Vios", 2024, "Red", "CH-1", date(2026, 1, 1),
+                                date(2027, 1, 1), "OR-1")
+    assert db.suggest_plates("ABC") == ["ABC 1234", "A8C 9999"]
+
+    assert db.delete_vehicle(vehicle_id)
+    assert db.suggest_plates("ABC") == ["ABC 1234"]
@@ -0,0 +1,106 @@
+import sqlite3
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from models.backends import SQLiteBackend, translate_sql
+
+
+@pytest.mark.parametrize("mysql, sqlite", [
+    ("SELECT * FROM users WHERE email = %s AND role = %s",
+     "SELECT * FROM users WHERE email = ? AND role = ?"),
+    ("SELECT * FROM vehicles WHERE plate_number LIKE 'AB%%'",
+     "SELECT * FROM vehicles WHERE plate_number LIKE 'AB%'"),
+    ("CREATE TABLE t (id INT AUTO_INCREMENT PRIMARY KEY, role ENUM('admin', 'citizen') NOT NULL)",
+     "CREATE TABLE t (id INTEGER PRIMARY KEY AUTOINCREMENT, role TEXT NOT NULL)"),
+    ("CREATE TABLE t (updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP)",
+     "CREATE TABLE t (updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"),
+    ("INSERT IGNORE INTO id_sequences (name, next_value) VALUES (%s, 0)",
+     "INSERT OR IGNORE INTO id_sequences (name, next_value) VALUES (?, 0)"),
+    ("SELECT * FROM vehicles WHERE expiry <= CURDATE() + INTERVAL %s DAY",
+     "SELECT * FROM vehicles WHERE expiry <= date(CURDATE(), ? || ' days')"),
+    ("UPDATE t SET due = v.issued + INTERVAL 30 DAY",
+     "UPDATE t SET due = date(v.issued, 30 || ' days')"),
+    ("INSERT INTO settings (k, v) VALUES (%s, %s) ON DUPLICATE KEY UPDATE v=VALUES(v)",
+     "INSERT INTO settings (k, v) VALUES (?, ?) ON CONFLICT DO UPDATE SET v=excluded.v"),
+])
+def test_translate_sql_rewrites(mysql, sqlite):
+    assert translate_sql(mysql) == (sqlite, False)
+
+
+def test_translate_sql_strips_locking_reads():
+    assert translate_sql("SELECT next_value FROM id_sequences WHERE name = %s FOR UPDATE") == \
+        ("SELECT next_value FROM id_sequences WHERE name = ?", True)
+    assert translate_sql("SELECT * FROM payments LOCK IN SHARE MODE") == ("SELECT * FROM payments", True)
+
+
+@pytest.fixture
+def conn(tmp_path):
+    connection = SQLiteBackend(str(tmp_path / "types.db")).connect()
+    yield connection
+    connection.close()
+
+
+def test_values_round_trip_as_mysql_types(conn):
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("CREATE TABLE t (id INT AUTO_INCREMENT PRIMARY KEY, d DATE, dt DATETIME, "
+                   "amount DECIMAL(10,2), label VARCHAR(20))")
+    row = (date(2026, 3, 1), datetime(2026, 3, 1, 14, 5, 9), Decimal("1500.50"), "ok")
+    cursor.execute("INSERT INTO t (d, dt, amount, label) VALUES (%s, %s, %s, %s)", row)
+    cursor.executemany("INSERT INTO t (d, dt, amount, label) VALUES (%s, %s, %s, %s)", [row, row])
+    conn.commit()
+
+    cursor.execute("SELECT d, dt, amount, label FROM t")
+    rows = cursor.fetchall()
+    cursor.close()
+
+    assert rows == [{"d": row[0], "dt": row[1], "amount": row[2], "label": row[3]}] * 3
+    assert all(type(r["amount"]) is Decimal and type(r["d"]) is date for r in rows)
+
+
+def test_mysql_functions_and_interval(conn):
+    cursor = conn.cursor()
+    cursor.execute("SELECT DATEDIFF(%s, %s), YEAR(%s), MONTH(%s), CURDATE() + INTERVAL 1 DAY",
+                   (date(2026, 3, 1), date(2026, 2, 1), date(2026, 3, 1), datetime(2026, 3, 1, 8, 0)))
+    diff, year, month, tomorrow = cursor.fetchone()
+    cursor.close()
+
+    assert (diff, year, month) == (28, 2026, 3)
+    assert tomorrow == (date.today() + timedelta(days=1)).isoformat()
+
+
+def test_upsert_updates_existing_row(conn):
+    cursor = conn.cursor()
+    cursor.execute("CREATE TABLE settings (k VARCHAR(20) PRIMARY KEY, v VARCHAR(20))")
+    sql = "INSERT INTO settings (k, v) VALUES (%s, %s) ON DUPLICATE KEY UPDATE v=VALUES(v)"
+    cursor.execute(sql, ("mode", "online"))
+    cursor.execute(sql, ("mode", "offline"))
+    conn.commit()
+    cursor.execute("SELECT k, v FROM settings")
+
+    assert cursor.fetchall() == [("mode", "offline")]
+    cursor.close()
+
+
+def test_locking_read_takes_write_lock(conn):
+    cursor = conn.cursor()
+    cursor.execute("CREATE TABLE id_sequences (name VARCHAR(20) PRIMARY KEY, next_value INT)")
+    conn.commit()
+    cursor.execute("SELECT next_value FROM id_sequences WHERE name = %s FOR UPDATE", ("citation",))
+
+    assert conn._raw.in_transaction
+    conn.rollback()
+    cursor.close()
+
+
+def test_plain_sqlite3_connections_are_untouched(tmp_path, conn):
+    # The backend adapts parameters per statement; nothing is registered process-wide
+    assert (Decimal, sqlite3.PrepareProtocol) not in sqlite3.adapters
+    plain = sqlite3.connect(str(tmp_path / "plain.db"))
+    plain.execute("CREATE TABLE t (d DATE)")
+    plain.execute("INSERT INTO t VALUES ('2026-03-01')")
+    with pytest.raises(sqlite3.ProgrammingError):
+        plain.execute("INSERT INTO t VALUES (?)", (Decimal("1.5"),))
+    assert plain.execute("SELECT d FROM t").fetchone() == ("2026-03-01",)
+    plain.close()
@@ -0,0 +1,63 @@
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QPixmap, QPixmapCache
+
+# Image paths are relative to the project root (see MVC_STRUCTURE.md)
+APP_LOGO = "images/cropped_circle_image(1).png"
+BAGONG_PILIPINAS_LOGO = "images/BAGONG-PILIPINAS-LOGO-1-1-150x150.png"
+UM_DAVAO_LOGO = "images/UM davao.png"
+
+# Logical sizes the views display the logos at
+LOGIN_LOGO_SIZE = (180, 180)
+SIDEBAR_LOGO_SIZE = (80, 80)
+PARTNER_LOGO_SIZE = (100, 60)
+
+PRELOAD = [
+    (APP_LOGO, *LOGIN_LOGO_SIZE),
+    (APP_LOGO, *SIDEBAR_LOGO_SIZE),
+    (BAGONG_PILIPINAS_LOGO, *PARTNER_LOGO_SIZE),
+    (UM_DAVAO_LOGO, *PARTNER_LOGO_SIZE),
+]
+
+_stats = {"hits": 0, "misses": 0}
+
+
+def device_pixel_ratio() -> float:
+    app = QApplication.instance()
+    screen = app.primaryScreen() if app else None
+    return screen.devicePixelRatio() if screen else 1.0
+
+
+def scaled_pixmap(path, width, height, dpr=None) -> QPixmap:
+    """
+    Pixmap of `path` smooth-scaled to fit width x height (logical pixels), cached
+    process-wide in QPixmapCache under (path, size, DPR). Returns a null pixmap if
+    the file cannot be loaded, so callers can fall back to text.
+    """
+    dpr = dpr or device_pixel_ratio()
+    key = f"asset:{path}:{width}x{height}@{dpr:g}"
+    cached = QPixmapCache.find(key)
+    if cached is not None:
+        _stats["hits"] += 1
+        return cached
+
+    _stats["misses"] += 1
+    source = QPixmap(path)
+    if source.isNull():
+        return source
+    # Render at device resolution so HiDPI screens stay sharp
+    pixmap = source.scaled(round(width * dpr), round(height * dpr),
+                           Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+    pixmap.setDevicePixelRatio(dpr)
+    QPixmapCache.insert(key, pixmap)
+    return pixmap
+
+
+def preload_assets():
+    """Decode and scale every logo up front (call once the event loop is idle)"""
+    for path, width, height in PRELOAD:
+        scaled_pixmap(path, width, height)
+
+
+def asset_cache_stats():
+    return dict(_stats, cache_limit_kb=QPixmapCache.cacheLimit())
@@ -0,0 +1,88 @@
+"""
+Application-wide stylesheet.
+
+Widgets opt in with an object name (e.g. `setObjectName("FieldLabel")`) or a
+dynamic property (e.g. `setProperty("rowAction", "delete")`) instead of carrying
+their own setStyleSheet() string, so Qt parses the rules once per process rather
+than once per widget. apply_theme() must run before any window is built.
+"""
+
+APP_STYLESHEET = """
+/* ---------- Dialog shells ---------- */
+QDialog#FormDialog { background-color: #f8fafc; }
+
+QFrame#FormCard {
+    background-color: white;
+    border-radius: 12px;
+    border: 1px solid #e2e8f0;
+}
+
+QLabel#FieldLabel {
+    color: #64748b;
+    font-size: 11px;
+    font-weight: bold;
+    background: transparent;
+    border: none;
+}
+
+/* Admin dialog text inputs; accent="amber" for the violation type dialogs */
+QLineEdit#FormInput {
+    background-color: #f8fafc;
+    border: 2px solid #e2e8f0;
+    border-radius: 8px;
+    padding: 8px 12px;
+    font-size: 13px;
+}
+QLineEdit#FormInput:focus { border: 2px solid #1e40af; background-color: white; }
+QLineEdit#FormInput[accent="amber"]:focus { border: 2px solid #f59e0b; }
+
+/* Enforcer dialog inputs */
+#PlainInput {
+    padding: 10px;
+    border: 2px solid #e2e8f0;
+    border-radius: 8px;
+    background: white;
+}
+
+/* ---------- Per-row table actions ---------- */
+QPushButton[rowAction="edit"], QPushButton[rowAction="delete"], QPushButton[rowAction="edit-date"] {
+    color: white;
+    border: none;
+    border-radius: 4px;
+}
+QPushButton[rowAction="edit"] { background-color: #f59e0b; }
+QPushButton[rowAction="edit"]:hover { background-color: #d97706; }
+QPushButton[rowAction="delete"] { background-color: #dc2626; }
+QPushButton[rowAction="delete"]:hover { background-color: #b91c1c; }
+QPushButton[rowAction="edit-date"] { background-color: #f59e0b; font-weight: bold; }
+QPushButton[rowAction="edit-date"]:hover { background-color: #d97706; }
+
+/* ---------- Citizen vehicle cards ---------- */
+QFrame#VehicleCard {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #eff6ff, stop:1 #dbeafe);
+    border: 1px solid #bfdbfe;
+    border-radius: 12px;
+}
+QFrame#VehicleCard:hover { border: 2px solid #3b82f6; }
+QFrame#VehicleCard QLabel { background: transparent; border: none; }
+QLabel#VehiclePlate { color: #1e40af; }
+QLabel#VehicleModel { color: #64748b; }
+QLabel#VehicleDetail { color: #475569; }
+
+QLabel#VehicleStatus { padding: 4px 8px; border-radius: 5px; }
+QFrame#VehicleCard QLabel#VehicleStatus[status="active"] { background-color: #dcfce7; color: #166534; }
+QFrame#VehicleCard QLabel#VehicleStatus[status="expiring"] { background-color: #fef3c7; color: #92400e; }
+QFrame#VehicleCard QLabel#VehicleStatus[status="expired"] { background-color: #fee2e2; color: #991b1b; }
+"""
+
+
+def apply_theme(app):
+    """Install the shared stylesheet on the QApplication (once, before building windows)"""
+    app.setStyleSheet(APP_STYLESHEET)
+
+
+def repolish(widget):
+    """Re-evaluate property selectors after changing a dynamic property on a shown widget"""
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
@@ -4,7 +4,12 @@ from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout,
                              QTableWidgetItem, QFrame, QLineEdit, QScrollArea, 
                              QHeaderView, QGraphicsDropShadowEffect, QStackedWidget, QMessageBox)
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont, QPixmap, QColor
+from PyQt6.QtGui import QFont, QColor
+from views.assets import scaled_pixmap, APP_LOGO, SIDEBAR_LOGO_SIZE
+from views.violation_table import ViolationTableModel, create_violation_view, format_fine, format_status
+
+# Rows rendered per expiration table; the count cards always show the full totals
+EXPIRATION_TABLE_LIMIT = 200
 
 # --- HELPER FUNCTIONS ---
 def hex_to_rgba(hex_color, alpha=0.2):
@@ -99,6 +104,8 @@ class AdminDashboard(QWidget):
         # These will be populated by main.py
         self.db_manager = None 
         self.current_user = None
+        self.executor = None
+        self.busy_queries = set()
         
         self.init_ui()
         
@@ -194,8 +201,7 @@ class AdminDashboard(QWidget):
         
         logo_image = QLabel()
         try:
-            logo_pixmap = QPixmap("images/cropped_circle_image(1).png")
-            logo_image.setPixmap(logo_pixmap.scaled(80, 80, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
+            logo_image.setPixmap(scaled_pixmap(APP_LOGO, *SIDEBAR_LOGO_SIZE))
         except:
             logo_image.setText("🔍")
             logo_image.setFont(QFont("Arial", 40))
@@ -503,9 +509,24 @@ class AdminDashboard(QWidget):
         db_label = QLabel("🗄️ Database: Connected")
         db_label.setStyleSheet("color: #64748b;")
         
+        self.pool_label = QLabel("🔌 Pool: -")
+        self.pool_label.setStyleSheet("color: #64748b; font-size: 11px;")
+        
+        self.btn_query_metrics = QPushButton("📈 Query Metrics")
+        self.btn_query_metrics.setToolTip("Per-method database latency and slow queries")
+        self.btn_query_metrics.setStyleSheet("QPushButton { color: #1e40af; background: transparent; border: 1px solid #cbd5e1; "
+                                             "border-radius: 6px; padding: 4px 8px; font-size: 11px; }")
+        
+        self.loading_label = QLabel("⏳ Refreshing data...")
+        self.loading_label.setStyleSheet("color: #f59e0b; font-weight: bold;")
+        self.loading_label.setVisible(False)
+        
         layout.addWidget(title)
         layout.addWidget(status_label)
         layout.addWidget(db_label)
+        layout.addWidget(self.pool_label)
+        layout.addWidget(self.btn_query_metrics, alignment=Qt.AlignmentFlag.AlignLeft)
+        layout.addWidget(self.loading_label)
         layout.addStretch()
         container.setLayout(layout)
         return container
@@ -542,27 +563,27 @@ class AdminDashboard(QWidget):
         header_layout.addWidget(title)
         header.setLayout(header_layout)
         
-        self.violation_table = QTableWidget()
-        self.violation_table.setColumnCount(7) 
-        self.violation_table.verticalHeader().setVisible(False)
-        self.violation_table.setHorizontalHeaderLabels([
-            "CITATION NO.", "PLATE NO.", "VIOLATION", "LOCATION", "DATE", "FINE", "STATUS"
-        ])
-        
+        self.violation_model = ViolationTableModel(None, [
+            ("CITATION NO.", "citation_number", None),
+            ("PLATE NO.", "plate_number", None),
+            ("VIOLATION", "violation_name", None),
+            ("LOCATION", "location", None),
+            ("DATE", "violation_date", None),
+            ("FINE", "fine_amount", format_fine),
+            ("STATUS", "status", format_status),
+        ], parent=self)
+        self.violation_table = create_violation_view(self.violation_model)
         self.violation_table.setMinimumHeight(300)
         self.violation_table.setStyleSheet("""
-            QTableWidget { border: none; gridline-color: transparent; background-color: white; border-bottom-left-radius: 12px; border-bottom-right-radius: 12px; }
+            QTableView { border: none; gridline-color: transparent; background-color: white; border-bottom-left-radius: 12px; border-bottom-right-radius: 12px; }
             QHeaderView::section { background-color: #f8fafc; padding: 12px; border: none; border-bottom: 1px solid #e2e8f0; font-weight: bold; color: #475569; }
-            QTableWidget::item { border-bottom: 1px solid #f1f5f9; padding: 5px; color: #334155; }
+            QTableView::item { border-bottom: 1px solid #f1f5f9; padding: 5px; color: #334155; }
         """)
         self.violation_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents) # Citation
         self.violation_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents) # Plate
-        self.violation_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch) # Violation
-        self.violation_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch) # Location
         self.violation_table.horizontalHeader().setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents) # Date
         self.violation_table.horizontalHeader().setSectionResizeMode(5, QHeaderView.ResizeMode.ResizeToContents) # Fine
         self.violation_table.horizontalHeader().setSectionResizeMode(6, QHeaderView.ResizeMode.ResizeToContents) # Status
-        self.violation_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
         
         layout.addWidget(header)
         layout.addWidget(self.violation_table)
@@ -678,61 +699,89 @@ class AdminDashboard(QWidget):
         return container
 
     # --- POPULATE FUNCTIONS ---
-    def populate_violation_table(self, violations):
-        self.violation_table.setRowCount(0)
-        for row, v in enumerate(violations):
-            self.violation_table.insertRow(row)
-            
-            citation = str(v.get('citation_number', 'N/A'))
-            self.violation_table.setItem(row, 0, QTableWidgetItem(citation))
-            self.violation_table.setItem(row, 1, QTableWidgetItem(v['plate_number']))
-            self.violation_table.setItem(row, 2, QTableWidgetItem(v['violation_name']))
-            self.violation_table.setItem(row, 3, QTableWidgetItem(v['location']))
-            self.violation_table.setItem(row, 4, QTableWidgetItem(str(v['violation_date'])))
-            self.violation_table.setItem(row, 5, QTableWidgetItem(f"₱{v['fine_amount']:,.2f}"))
-            
-            status_item = QTableWidgetItem(v['status'].upper())
-            if v['status'] == 'paid':
-                status_item.setForeground(Qt.GlobalColor.darkGreen)
-            elif v['status'] == 'overdue':
-                status_item.setForeground(Qt.GlobalColor.red)
-            
-            self.violation_table.setItem(row, 6, status_item)
+    def refresh_violation_table(self):
+        if not self.db_manager: return
+        self.violation_model.db_manager = self.db_manager
+        self.violation_model.refresh()
+
+    # --- BACKGROUND QUERIES ---
+    def set_executor(self, executor):
+        self.executor = executor
+        self.violation_model.executor = executor
+        self.violation_model.key = "admin.violation_page"
+        executor.busy_changed.connect(self.on_query_busy)
+
+    def on_query_busy(self, key, busy):
+        if not key.startswith("admin."): return
+        if busy:
+            self.busy_queries.add(key)
+        else:
+            self.busy_queries.discard(key)
+        self.loading_label.setVisible(bool(self.busy_queries))
+
+    def run_query(self, key, fn, on_result):
+        """Run fn on the background executor when one is attached, inline otherwise"""
+        if self.executor:
+            self.executor.submit(key, fn, on_result=on_result)
+        else:
+            on_result(fn())
 
     def update_stats(self):
         if not self.db_manager: return
-        stats = self.db_manager.get_dashboard_stats()
+        for card in (self.card_users, self.card_vehicles, self.card_violations, self.card_fines):
+            card.findChild(QLabel).setText("...")
+        self.run_query("admin.stats", self.db_manager.get_dashboard_stats, self.apply_stats)
         
+        # Update expiration tracking
+        self.refresh_expiration_tracking()
+
+    def apply_stats(self, stats):
         self.card_users.findChild(QLabel).setText(str(stats['users']))
         self.card_vehicles.findChild(QLabel).setText(str(stats['vehicles']))
         self.card_violations.findChild(QLabel).setText(str(stats['violations']))
         self.card_fines.findChild(QLabel).setText(f"₱{stats['fines']:,.0f}")
-        
-        # Update expiration tracking
-        self.refresh_expiration_tracking()
+        self.update_pool_stats()
+    
+    def update_pool_stats(self):
+        if not self.db_manager or not hasattr(self.db_manager, 'get_pool_stats'): return
+        pool = self.db_manager.get_pool_stats()
+        text = (f"🔌 Pool: {pool['in_use']} in use / {pool['idle']} idle\n"
+                f"Checkouts: {pool['checkouts']}  •  Waits: {pool['waits']}  •  Reconnects: {pool['reconnects']}")
+        if hasattr(self.db_manager, 'get_hot_plate_cache_stats'):
+            plates = self.db_manager.get_hot_plate_cache_stats()
+            hit_rate = f"{plates['hit_rate']:.0%}" if plates['hit_rate'] is not None else "n/a"
+            text += (f"\nPlate cache: {hit_rate} hits  •  {plates['size']}/{plates['maxsize']} plates"
+                     f"  •  Evictions: {plates['evictions']}")
+        self.pool_label.setText(text)
     
     def refresh_expiration_tracking(self):
         """Refresh the vehicle expiration tracking section"""
         if not self.db_manager: return
         if not hasattr(self, 'expired_vehicles_table'): return
         
-        # Check and update expiration status
-        self.db_manager.check_and_update_vehicle_expiration()
-        
-        # Get expired and expiring vehicles
-        expired = self.db_manager.get_expired_vehicles()
-        expiring = self.db_manager.get_expiring_vehicles(30)
+        self.expired_count_label.setText("...")
+        self.expiring_count_label.setText("...")
+        self.run_query("admin.expiration", self.load_expiration_data, self.populate_expiration_tables)
+
+    def load_expiration_data(self):
+        """Runs on a worker thread - must not touch widgets"""
+        # Read-only: statuses are kept current by the daily expiration job (see main.py)
+        # Both buckets and their totals in one query; tables render at most EXPIRATION_TABLE_LIMIT rows
+        return self.db_manager.get_expiration_overview(30, EXPIRATION_TABLE_LIMIT)
+
+    def populate_expiration_tables(self, overview):
+        expired, expiring = overview['expired'], overview['expiring']
         
-        # Update counts
+        # Update counts (totals, not just the rows shown)
         if hasattr(self, 'expired_count_label'):
-            self.expired_count_label.setText(str(len(expired)))
+            self.expired_count_label.setText(f"{overview['expired_total']:,}")
+            self.expired_count_label.setToolTip(self.shown_rows_hint(len(expired), overview['expired_total']))
         if hasattr(self, 'expiring_count_label'):
-            self.expiring_count_label.setText(str(len(expiring)))
+            self.expiring_count_label.setText(f"{overview['expiring_total']:,}")
+            self.expiring_count_label.setToolTip(self.shown_rows_hint(len(expiring), overview['expiring_total']))
         
         # Populate expired table
         self.expired_vehicles_table.setRowCount(0)
-        from datetime import date
-        today = date.today()
         
         for row, v in enumerate(expired):
             self.expired_vehicles_table.insertRow(row)
@@ -741,10 +790,9 @@ class AdminDashboard(QWidget):
             self.expired_vehicles_table.setItem(row, 2, QTableWidgetItem(f"{v['make']} {v['model']}"))
             self.expired_vehicles_table.setItem(row, 3, QTableWidgetItem(str(v['expiry_date'])))
             
-            # Calculate days overdue
+            # Days overdue (DATEDIFF from the query)
             if v['expiry_date']:
-                days_overdue = (today - v['expiry_date']).days
-                overdue_item = QTableWidgetItem(f"{days_overdue} days")
+                overdue_item = QTableWidgetItem(f"{v['days']} days")
                 overdue_item.setForeground(QColor('#dc2626'))
                 self.expired_vehicles_table.setItem(row, 4, overdue_item)
             else:
@@ -753,7 +801,7 @@ class AdminDashboard(QWidget):
             # Action button
             action_btn = QPushButton("✏️ Edit Date")
             action_btn.setFixedSize(100, 30)
-            action_btn.setStyleSheet("background-color: #f59e0b; color: white; border-radius: 4px; font-weight: bold;")
+            action_btn.setProperty("rowAction", "edit-date")
             action_btn.clicked.connect(lambda checked, veh=v: self.edit_vehicle_callback(veh))
             self.expired_vehicles_table.setCellWidget(row, 5, action_btn)
         
@@ -766,10 +814,9 @@ class AdminDashboard(QWidget):
             self.expiring_vehicles_table.setItem(row, 2, QTableWidgetItem(f"{v['make']} {v['model']}"))
             self.expiring_vehicles_table.setItem(row, 3, QTableWidgetItem(str(v['expiry_date'])))
             
-            # Calculate days remaining
+            # Days remaining (DATEDIFF from the query)
             if v['expiry_date']:
-                days_remaining = (v['expiry_date'] - today).days
-                remaining_item = QTableWidgetItem(f"{days_remaining} days")
+                remaining_item = QTableWidgetItem(f"{v['days']} days")
                 remaining_item.setForeground(QColor('#f59e0b'))
                 self.expiring_vehicles_table.setItem(row, 4, remaining_item)
             else:
@@ -778,13 +825,19 @@ class AdminDashboard(QWidget):
             # Action button
             action_btn = QPushButton("✏️ Edit Date")
             action_btn.setFixedSize(100, 30)
-            action_btn.setStyleSheet("background-color: #f59e0b; color: white; border-radius: 4px; font-weight: bold;")
+            action_btn.setProperty("rowAction", "edit-date")
             action_btn.clicked.connect(lambda checked, veh=v: self.edit_vehicle_callback(veh))
             self.expiring_vehicles_table.setCellWidget(row, 5, action_btn)
 
+    @staticmethod
+    def shown_rows_hint(shown, total):
+        return f"Showing the first {shown:,} of {total:,}" if shown < total else ""
+
     def refresh_user_table(self):
         if not self.db_manager: return
-        users = self.db_manager.get_all_users()
+        self.run_query("admin.users", self.db_manager.get_all_users, self.populate_user_table)
+
+    def populate_user_table(self, users):
         self.user_table.setRowCount(0)
         for row, u in enumerate(users):
             self.user_table.insertRow(row)
@@ -804,7 +857,7 @@ class AdminDashboard(QWidget):
             
             del_btn = QPushButton("🗑️")
             del_btn.setFixedSize(30, 30)
-            del_btn.setStyleSheet("background-color: #dc2626; color: white; border-radius: 4px;")
+            del_btn.setProperty("rowAction", "delete")
             del_btn.clicked.connect(lambda checked, uid=u['user_id']: self.delete_user_callback(uid))
             
             btn_layout.addWidget(del_btn)
@@ -814,9 +867,13 @@ class AdminDashboard(QWidget):
 
     def refresh_vehicle_table(self):
         if not self.db_manager: return
-        # Check and update expiration status first
-        self.db_manager.check_and_update_vehicle_expiration()
-        vehicles = self.db_manager.get_all_vehicles()
+        self.run_query("admin.vehicles", self.load_vehicle_data, self.populate_vehicle_table)
+
+    def load_vehicle_data(self):
+        """Runs on a worker thread - must not touch widgets"""
+        return self.db_manager.get_all_vehicles()
+
+    def populate_vehicle_table(self, vehicles):
         self.vehicle_table.setRowCount(0)
         for row, v in enumerate(vehicles):
             self.vehicle_table.insertRow(row)
@@ -850,12 +907,12 @@ class AdminDashboard(QWidget):
             
             edit_btn = QPushButton("✏️")
             edit_btn.setFixedSize(30, 30)
-            edit_btn.setStyleSheet("background-color: #f59e0b; color: white; border-radius: 4px;")
+            edit_btn.setProperty("rowAction", "edit")
             edit_btn.clicked.connect(lambda checked, veh=v: self.edit_vehicle_callback(veh))
             
             del_btn = QPushButton("🗑️")
             del_btn.setFixedSize(30, 30)
-            del_btn.setStyleSheet("background-color: #dc2626; color: white; border-radius: 4px;")
+            del_btn.setProperty("rowAction", "delete")
             del_btn.clicked.connect(lambda checked, vid=v['vehicle_id']: self.delete_vehicle_callback(vid))
             
             btn_layout.addWidget(edit_btn)
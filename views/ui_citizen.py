@@ -4,7 +4,11 @@ from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout,
                              QTableWidgetItem, QFrame, QLineEdit, QScrollArea, 
                              QHeaderView, QGraphicsDropShadowEffect, QMessageBox)
 from PyQt6.QtCore import Qt, QSize
-from PyQt6.QtGui import QFont, QPixmap, QColor
+from PyQt6.QtGui import QFont, QColor
+from views.assets import scaled_pixmap, APP_LOGO, SIDEBAR_LOGO_SIZE
+
+# Rows in the dashboard's violation table; the cards count everything (get_citizen_summary)
+RECENT_VIOLATIONS_LIMIT = 50
 
 # --- HELPER FUNCTIONS ---
 def hex_to_rgba(hex_color, alpha=0.2):
@@ -81,20 +85,21 @@ class StatCard(QFrame):
 
 
 class CitizenDashboard(QWidget):
-    def __init__(self, user_data=None, db_manager=None):
+    def __init__(self, user_data=None, db_manager=None, executor=None):
         super().__init__()
         self.user_data = user_data or {"full_name": "GUEST", "user_id": 0}
         self.user_name = self.user_data.get("full_name", "GUEST")
         self.db_manager = db_manager
+        self.executor = executor
         
         # State
         self.plate_numbers = []
         self.sidebar_buttons = {} # Store buttons for toggling styles
-        
-        # Initial Fetch
-        if self.db_manager and self.user_data.get("user_id"):
-            self.refresh_plates()
+        self.busy_queries = set()
+        if self.executor:
+            self.executor.busy_changed.connect(self.on_query_busy)
             
+        # Initial data load happens in init_ui via update_dashboard
         self.init_ui()
         
     def init_ui(self):
@@ -141,9 +146,9 @@ class CitizenDashboard(QWidget):
         logo_bg.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         try:
-            pix = QPixmap("images/cropped_circle_image(1).png")
+            pix = scaled_pixmap(APP_LOGO, *SIDEBAR_LOGO_SIZE)
             if not pix.isNull():
-               logo_bg.setPixmap(pix.scaled(80, 80, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
+               logo_bg.setPixmap(pix)
         except: pass
             
         brand = QLabel("Nexus Monitor")
@@ -509,16 +514,9 @@ class CitizenDashboard(QWidget):
 
     def create_vehicle_card(self, plate, model="-", status="Active", expiry="-", color="-"):
         card = QFrame()
+        card.setObjectName("VehicleCard")  # styled by views/theme.py
         card.setFixedSize(280, 140)
         apply_shadow(card)
-        card.setStyleSheet("""
-            QFrame {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #eff6ff, stop:1 #dbeafe);
-                border: 1px solid #bfdbfe;
-                border-radius: 12px;
-            }
-            QFrame:hover { border: 2px solid #3b82f6; }
-        """)
         
         layout = QVBoxLayout()
         layout.setContentsMargins(20, 15, 20, 15)
@@ -526,14 +524,13 @@ class CitizenDashboard(QWidget):
         top = QHBoxLayout()
         icon = QLabel("🚗")
         icon.setFont(QFont("Arial", 30))
-        icon.setStyleSheet("background: transparent; border: none;")
         
         text_box = QVBoxLayout()
         p = QLabel(plate)
+        p.setObjectName("VehiclePlate")
         p.setFont(QFont("Arial", 18, QFont.Weight.Bold))
-        p.setStyleSheet("color: #1e40af; background: transparent; border: none;")
         t = QLabel(model)
-        t.setStyleSheet("color: #64748b; background: transparent; border: none;")
+        t.setObjectName("VehicleModel")
         text_box.addWidget(p)
         text_box.addWidget(t)
         
@@ -545,22 +542,20 @@ class CitizenDashboard(QWidget):
         status_text = status.upper()
         if status_text == "EXPIRED":
             status_icon = "✗"
-            status_style = "background-color: #fee2e2; color: #991b1b; padding: 4px 8px; border-radius: 5px;"
         elif status_text == "EXPIRING":
             status_icon = "⚠"
-            status_style = "background-color: #fef3c7; color: #92400e; padding: 4px 8px; border-radius: 5px;"
         else:  # ACTIVE
             status_icon = "✓"
-            status_style = "background-color: #dcfce7; color: #166534; padding: 4px 8px; border-radius: 5px;"
         
         status_lbl = QLabel(f"{status_icon} {status_text}")
-        status_lbl.setStyleSheet(status_style)
+        status_lbl.setObjectName("VehicleStatus")
+        status_lbl.setProperty("status", status_text.lower() if status_text in ("EXPIRED", "EXPIRING") else "active")
         status_lbl.setFont(QFont("Arial", 9, QFont.Weight.Bold))
         status_lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
         status_lbl.setFixedWidth(100)
         
         detail = QLabel(f"Expiry: {expiry}  •  Color: {color}")
-        detail.setStyleSheet("color: #475569;")
+        detail.setObjectName("VehicleDetail")
 
         layout.addLayout(top)
         layout.addWidget(detail)
@@ -617,25 +612,44 @@ class CitizenDashboard(QWidget):
                 self.qa_panel.setVisible(True)
             self.update_dashboard()
 
-    def refresh_plates(self):
-        if not self.db_manager: return
-        vehicles = self.db_manager.get_all_vehicles()
+    # --- BACKGROUND QUERIES ---
+    def on_query_busy(self, key, busy):
+        if not key.startswith("citizen."): return
+        if busy:
+            self.busy_queries.add(key)
+        else:
+            self.busy_queries.discard(key)
+        if hasattr(self, 'btn_refresh'):
+            self.btn_refresh.setEnabled(not self.busy_queries)
+            self.btn_refresh.setText("LOADING..." if self.busy_queries else "REFRESH")
+
+    def run_query(self, key, fn, on_result):
+        """Run fn on the background executor when one is attached, inline otherwise"""
+        if self.executor:
+            self.executor.submit(key, fn, on_result=on_result)
+        else:
+            on_result(fn())
+
+    def fetch_plates(self):
+        return self.db_manager.get_owner_plates(self.user_data.get('user_id'))
+
+    def load_dashboard_data(self):
+        """Runs on a worker thread - must not touch widgets"""
         uid = self.user_data.get('user_id')
-        self.plate_numbers = [v['plate_number'] for v in vehicles if v['owner_id'] == uid]
+        return (self.fetch_plates(), self.db_manager.get_citizen_summary(uid),
+                self.db_manager.get_violations_by_owner(uid, limit=RECENT_VIOLATIONS_LIMIT))
 
     def update_dashboard(self):
         if not self.db_manager: return
-        self.refresh_plates()
-        
-        uid = self.user_data.get('user_id')
-        violations = self.db_manager.get_violations_by_owner(uid)
-        
-        # Update Cards
-        self.card_vehicles.update_value(len(self.plate_numbers))
-        self.card_violations.update_value(len(violations))
+        self.run_query("citizen.dashboard", self.load_dashboard_data, self.apply_dashboard_data)
+
+    def apply_dashboard_data(self, data):
+        self.plate_numbers, summary, violations = data
         
-        pending_fine = sum(v['fine_amount'] for v in violations if v['status'] == 'pending')
-        self.card_fines.update_value(f"₱{pending_fine:,.0f}")
+        # Update Cards (aggregated in SQL; the table below only holds the latest rows)
+        self.card_vehicles.update_value(summary['vehicles'])
+        self.card_violations.update_value(summary['violations'])
+        self.card_fines.update_value(f"₱{summary['pending_total']:,.0f}")
         
         # Populate Table
         self.violations_table.setRowCount(0)
@@ -658,19 +672,19 @@ class CitizenDashboard(QWidget):
             self.violations_table.setItem(row, 5, QTableWidgetItem(str(pay_date)))
 
     def populate_vehicles_list(self):
+        if not self.db_manager: return
+        self.run_query("citizen.vehicles", self.load_my_vehicles, self.render_vehicle_cards)
+
+    def load_my_vehicles(self):
+        """Runs on a worker thread - must not touch widgets"""
+        return self.db_manager.get_vehicles_by_owner(self.user_data.get('user_id'))
+
+    def render_vehicle_cards(self, my_vehicles):
         # Clear existing
         while self.vehicles_layout.count():
             item = self.vehicles_layout.takeAt(0)
             if item.widget():
                 item.widget().deleteLater()
-                
-        if not self.db_manager: return
-        
-        # Check and update expiration status first
-        self.db_manager.check_and_update_vehicle_expiration()
-        
-        vehicles = self.db_manager.get_all_vehicles()
-        my_vehicles = [v for v in vehicles if v['owner_id'] == self.user_data.get('user_id')]
         
         if not my_vehicles:
             lbl = QLabel("No registered vehicles found.")
@@ -5,6 +5,11 @@ from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout,
                              QHeaderView, QGraphicsDropShadowEffect, QStackedWidget)
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont, QColor
+from views.assets import scaled_pixmap, APP_LOGO, SIDEBAR_LOGO_SIZE
+from views.violation_table import ViolationTableModel, RowActionDelegate, create_violation_view, format_status
+
+# Rows shown in the dashboard's recent violations table
+RECENT_VIOLATIONS_LIMIT = 20
 
 # --- HELPER FUNCTIONS ---
 def apply_shadow(widget, blur=15, y_offset=4, alpha=30):
@@ -79,6 +84,8 @@ class EnforcerDashboard(QWidget):
         self.user_office = user_office
         self.db_manager = None
         self.current_user = None
+        self.executor = None
+        self.busy_queries = set()
         self.init_ui()
         
     def init_ui(self):
@@ -135,18 +142,31 @@ class EnforcerDashboard(QWidget):
         header.setFont(QFont("Arial", 24, QFont.Weight.Bold))
         header.setStyleSheet("color: #1e3a8a;")
         
-        # Table
-        self.manage_table = QTableWidget()
-        self.manage_table.setColumnCount(7)
-        self.manage_table.setHorizontalHeaderLabels(["ID", "Plate", "Violation", "Date", "Location", "Status", "Actions"])
-        self.manage_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        # Table (rows are fetched page by page as the view scrolls)
+        self.manage_model = ViolationTableModel(None, [
+            ("ID", "violation_id", None),
+            ("Plate", "plate_number", None),
+            ("Violation", "violation_name", None),
+            ("Date", "violation_date", None),
+            ("Location", "location", None),
+            ("Status", "status", format_status),
+            ("Actions", None, None),
+        ], parent=self)
+        self.manage_table = create_violation_view(self.manage_model, row_height=40)
         self.manage_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents) # ID
-        self.manage_table.verticalHeader().setVisible(False)
         self.manage_table.setStyleSheet("""
-            QTableWidget { background-color: white; border-radius: 10px; border: 1px solid #e2e8f0; gridline-color: #f1f5f9; }
+            QTableView { background-color: white; border-radius: 10px; border: 1px solid #e2e8f0; gridline-color: #f1f5f9; }
             QHeaderView::section { background-color: #f8fafc; padding: 12px; border: none; border-bottom: 1px solid #e2e8f0; font-weight: bold; color: #475569; }
         """)
         
+        # Edit/delete buttons are painted by a delegate instead of one widget pair per row
+        self.manage_actions = RowActionDelegate([
+            ("edit", "✏️", "#f59e0b"),
+            ("delete", "🗑️", "#dc2626"),
+        ], self.manage_table)
+        self.manage_actions.clicked.connect(self.on_manage_action)
+        self.manage_table.setItemDelegateForColumn(6, self.manage_actions)
+        
         layout.addWidget(header)
         layout.addWidget(self.manage_table)
         
@@ -155,38 +175,16 @@ class EnforcerDashboard(QWidget):
         
     def refresh_manage_table(self):
         if not self.db_manager: return
-        violations = self.db_manager.get_all_violations()
-        self.manage_table.setRowCount(0)
-        for row, v in enumerate(violations):
-            self.manage_table.insertRow(row)
-            self.manage_table.setItem(row, 0, QTableWidgetItem(str(v.get('violation_id', '')))) # Changed to violation_id
-            self.manage_table.setItem(row, 1, QTableWidgetItem(v['plate_number']))
-            self.manage_table.setItem(row, 2, QTableWidgetItem(v['violation_name']))
-            self.manage_table.setItem(row, 3, QTableWidgetItem(str(v['violation_date'])))
-            self.manage_table.setItem(row, 4, QTableWidgetItem(v['location']))
-            self.manage_table.setItem(row, 5, QTableWidgetItem(v['status'].upper()))
-            
-            # Actions
-            btn_widget = QWidget()
-            btn_layout = QHBoxLayout()
-            btn_layout.setContentsMargins(0, 0, 0, 0)
-            btn_layout.setSpacing(5)
-            
-            edit_btn = QPushButton("✏️")
-            edit_btn.setFixedSize(30, 30)
-            edit_btn.setStyleSheet("background-color: #f59e0b; color: white; border-radius: 4px;")
-            edit_btn.clicked.connect(lambda checked, viol=v: self.edit_violation_callback(viol))
-            
-            del_btn = QPushButton("🗑️")
-            del_btn.setFixedSize(30, 30)
-            del_btn.setStyleSheet("background-color: #dc2626; color: white; border-radius: 4px;")
-            del_btn.clicked.connect(lambda checked, vid=v['violation_id']: self.delete_violation_callback(vid))
-            
-            btn_layout.addWidget(edit_btn)
-            btn_layout.addWidget(del_btn)
-            btn_layout.addStretch()
-            btn_widget.setLayout(btn_layout)
-            self.manage_table.setCellWidget(row, 6, btn_widget)
+        self.manage_model.db_manager = self.db_manager
+        self.manage_model.refresh()
+
+    def on_manage_action(self, action, row):
+        v = self.manage_model.violation_at(row)
+        if not v: return
+        if action == "edit":
+            self.edit_violation_callback(v)
+        elif action == "delete":
+            self.delete_violation_callback(v['violation_id'])
 
     def edit_violation_callback(self, data): pass
     def delete_violation_callback(self, vid): pass
@@ -216,9 +214,7 @@ class EnforcerDashboard(QWidget):
 
         logo_img = QLabel()
         try:
-            from PyQt6.QtGui import QPixmap
-            pm = QPixmap("images/cropped_circle_image(1).png")
-            logo_img.setPixmap(pm.scaled(80, 80, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
+            logo_img.setPixmap(scaled_pixmap(APP_LOGO, *SIDEBAR_LOGO_SIZE))
         except Exception:
             logo_img.setText("🔍")
             logo_img.setFont(QFont("Arial", 40))
@@ -285,6 +281,22 @@ class EnforcerDashboard(QWidget):
         stats_row.addWidget(self.card_pending)
         stats_row.addWidget(self.card_searched)
         stats_row.addStretch() 
+        
+        self.loading_label = QLabel("⏳ Refreshing data...")
+        self.loading_label.setStyleSheet("color: #f59e0b; font-weight: bold; background: transparent;")
+        self.loading_label.setVisible(False)
+        stats_row.addWidget(self.loading_label, alignment=Qt.AlignmentFlag.AlignTop)
+        # Offline queue status (see set_sync_status)
+        self.sync_label = QLabel()
+        self.sync_label.setStyleSheet("color: #1e40af; font-weight: bold; background: transparent;")
+        self.sync_label.setVisible(False)
+        stats_row.addWidget(self.sync_label, alignment=Qt.AlignmentFlag.AlignTop)
+        self.btn_requeue = QPushButton("↻ Retry rejected")
+        self.btn_requeue.setToolTip("Send rejected citations to the server again")
+        self.btn_requeue.setStyleSheet("QPushButton { color: #1e40af; background: white; border: 1px solid #cbd5e1; "
+                                       "border-radius: 6px; padding: 4px 8px; font-weight: bold; }")
+        self.btn_requeue.setVisible(False)
+        stats_row.addWidget(self.btn_requeue, alignment=Qt.AlignmentFlag.AlignTop)
         body_layout.addLayout(stats_row)
         
         # 2. Split Section
@@ -509,6 +521,45 @@ class EnforcerDashboard(QWidget):
             """)
         return btn
 
+    # --- BACKGROUND QUERIES ---
+    def set_executor(self, executor):
+        self.executor = executor
+        self.manage_model.executor = executor
+        self.manage_model.key = "enforcer.manage_page"
+        executor.busy_changed.connect(self.on_query_busy)
+
+    def on_query_busy(self, key, busy):
+        if not key.startswith("enforcer."): return
+        if busy:
+            self.busy_queries.add(key)
+        else:
+            self.busy_queries.discard(key)
+        self.loading_label.setVisible(bool(self.busy_queries))
+
+    def run_query(self, key, fn, on_result):
+        """Run fn on the background executor when one is attached, inline otherwise"""
+        if self.executor:
+            self.executor.submit(key, fn, on_result=on_result)
+        else:
+            on_result(fn())
+
+    def set_sync_status(self, counts, online=True):
+        """Show queued/rejected offline citations; hidden when everything has synced"""
+        parts = []
+        if counts.get('queued'):
+            parts.append(f"📡 {counts['queued']} citation(s) waiting to sync" + ("" if online else " (offline)"))
+        if counts.get('rejected'):
+            parts.append(f"⚠ {counts['rejected']} citation(s) rejected by the server")
+        self.sync_label.setText("\n".join(parts))
+        self.sync_label.setVisible(bool(parts))
+        self.btn_requeue.setVisible(bool(counts.get('rejected')))
+
+    def refresh_recent_table(self):
+        if not self.db_manager: return
+        self.run_query("enforcer.recent",
+                       lambda: self.db_manager.get_violations_page(limit=RECENT_VIOLATIONS_LIMIT),
+                       self.populate_recent_table)
+
     def populate_recent_table(self, violations):
         self.recent_table.setRowCount(0)
         for row, v in enumerate(violations):
@@ -527,8 +578,9 @@ class EnforcerDashboard(QWidget):
     # Updated update_stats to use real data
     def update_stats(self):
         if not self.db_manager: return
-        stats = self.db_manager.get_dashboard_stats()
-        
+        self.run_query("enforcer.stats", self.db_manager.get_dashboard_stats, self.apply_stats)
+
+    def apply_stats(self, stats):
         # stats keys: users, vehicles, violations, fines, pending_violations, paid_violations, overdue_violations
         
         # Card 1: Total Violations
@@ -3,7 +3,9 @@ from PyQt6.QtWidgets import (QWidget, QLabel, QLineEdit, QPushButton,
                              QVBoxLayout, QHBoxLayout, QFrame, 
                              QGraphicsDropShadowEffect, QComboBox) 
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont, QColor, QPixmap
+from PyQt6.QtGui import QFont, QColor
+from views.assets import (scaled_pixmap, APP_LOGO, BAGONG_PILIPINAS_LOGO, UM_DAVAO_LOGO,
+                          LOGIN_LOGO_SIZE, PARTNER_LOGO_SIZE)
 
 # --- HELPER FOR SHADOWS ---
 def apply_shadow(widget, blur=20, x=0, y=5, alpha=50, color=None):
@@ -65,9 +67,8 @@ class LoginWindow(QWidget):
         
         logo_logo = QLabel()
         try:
-            # Using scaled for better quality
-            p = QPixmap("images/cropped_circle_image(1).png")
-            logo_logo.setPixmap(p.scaled(180, 180, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
+            # Pre-scaled and cached process-wide (views/assets.py)
+            logo_logo.setPixmap(scaled_pixmap(APP_LOGO, *LOGIN_LOGO_SIZE))
         except:
              logo_logo.setText("🔍")
              logo_logo.setFont(QFont("Arial", 60))
@@ -144,8 +145,7 @@ class LoginWindow(QWidget):
         def make_logo(path):
             lbl = QLabel()
             try:
-                p = QPixmap(path)
-                lbl.setPixmap(p.scaled(100, 60, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
+                lbl.setPixmap(scaled_pixmap(path, *PARTNER_LOGO_SIZE))
             except:
                 lbl.setText("LOGO")
                 lbl.setStyleSheet("color: white;")
@@ -153,8 +153,8 @@ class LoginWindow(QWidget):
             lbl.setStyleSheet("border: none; background: transparent;")
             return lbl
 
-        bagong_logo = make_logo("images/BAGONG-PILIPINAS-LOGO-1-1-150x150.png")
-        um_logo = make_logo("images/UM davao.png")
+        bagong_logo = make_logo(BAGONG_PILIPINAS_LOGO)
+        um_logo = make_logo(UM_DAVAO_LOGO)
 
         partners_layout.addWidget(bagong_logo)
         partners_layout.addWidget(um_logo)
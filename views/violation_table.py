@@ -0,0 +1,181 @@
+from PyQt6.QtWidgets import QTableView, QHeaderView, QStyledItemDelegate, QAbstractItemView
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QRect, QSize, QEvent, pyqtSignal
+from PyQt6.QtGui import QColor, QPainter
+
+# Rows pulled from the database per fetchMore() call
+DEFAULT_PAGE_SIZE = 100
+
+STATUS_COLORS = {
+    "paid": QColor("#16a34a"),
+    "pending": QColor("#dc2626"),
+    "overdue": QColor("#dc2626"),
+}
+
+
+def format_fine(value):
+    return f"₱{value:,.2f}" if value is not None else "-"
+
+
+def format_status(value):
+    return str(value or "").upper()
+
+
+class ViolationTableModel(QAbstractTableModel):
+    """
+    Lazily-populated violations model backed by DatabaseManager.get_violations_page().
+
+    `columns` is a list of (header, field, formatter) tuples; a field of None
+    leaves the cell empty (e.g. an actions column painted by a delegate).
+    Rows are only fetched when the view scrolls near the end of what is loaded.
+    With a QueryExecutor, pages are fetched in the background under `key` and
+    appended when they arrive (one page in flight at a time); without one they
+    are fetched inline.
+    """
+
+    def __init__(self, db_manager, columns, page_size=DEFAULT_PAGE_SIZE, filters=None, parent=None,
+                 executor=None, key="violations.page"):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.columns = columns
+        self.page_size = page_size
+        self.filters = filters
+        self.executor = executor
+        self.key = key
+        self._rows = []
+        self._cursor = None
+        self._exhausted = False
+        self._fetching = False
+
+    # --- Qt model interface ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.columns[section][0]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        _, field, formatter = self.columns[index.column()]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if field is None:
+                return None
+            value = row.get(field)
+            return formatter(value) if formatter else ("" if value is None else str(value))
+        if role == Qt.ItemDataRole.ForegroundRole and field == "status":
+            return STATUS_COLORS.get(str(row.get("status", "")).lower())
+        if role == Qt.ItemDataRole.UserRole:
+            return row
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return (not parent.isValid() and not self._exhausted and not self._fetching
+                and self.db_manager is not None)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        if self.executor is None:
+            self._append_page(self.db_manager.get_violations_page(after=self._cursor, limit=self.page_size,
+                                                                  filters=self.filters))
+            return
+        self._fetching = True
+        self.executor.submit(self.key, self.db_manager.get_violations_page, after=self._cursor,
+                             limit=self.page_size, filters=self.filters,
+                             on_result=self._append_page, on_error=self._on_page_failed)
+
+    def _append_page(self, rows):
+        self._fetching = False
+        self._exhausted = len(rows) < self.page_size
+        if not rows:
+            return
+        self._cursor = self.db_manager.page_cursor(rows)
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def _on_page_failed(self, error):
+        # Left fetchable: the next scroll tries the page again
+        self._fetching = False
+        print(f"  ⚠ Could not load violations: {error}")
+
+    # --- Helpers ---
+    def refresh(self, filters=None):
+        """Drop loaded rows and start again from the newest page"""
+        self.beginResetModel()
+        if filters is not None:
+            self.filters = filters
+        if self.executor is not None:
+            # A page still in flight belongs to the old rows
+            self.executor.cancel(self.key)
+        self._rows = []
+        self._cursor = None
+        self._exhausted = False
+        self._fetching = False
+        self.endResetModel()
+
+    def violation_at(self, row):
+        return self._rows[row] if 0 <= row < len(self._rows) else None
+
+
+class RowActionDelegate(QStyledItemDelegate):
+    """Paints small action buttons in a cell and emits (action, row) on click"""
+    clicked = pyqtSignal(str, int)
+
+    BUTTON_SIZE = 30
+    SPACING = 5
+
+    def __init__(self, actions, parent=None):
+        super().__init__(parent)
+        # actions: list of (name, label, background color)
+        self.actions = actions
+
+    def _button_rects(self, cell):
+        top = cell.top() + (cell.height() - self.BUTTON_SIZE) // 2
+        return [QRect(cell.left() + 4 + i * (self.BUTTON_SIZE + self.SPACING), top, self.BUTTON_SIZE, self.BUTTON_SIZE)
+                for i in range(len(self.actions))]
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        for (_, label, color), rect in zip(self.actions, self._button_rects(option.rect)):
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(color))
+            painter.drawRoundedRect(rect, 4, 4)
+            painter.setPen(QColor("white"))
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, label)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        return QSize(8 + len(self.actions) * (self.BUTTON_SIZE + self.SPACING), self.BUTTON_SIZE + 6)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonRelease:
+            pos = event.position().toPoint()
+            for (name, _, _), rect in zip(self.actions, self._button_rects(option.rect)):
+                if rect.contains(pos):
+                    self.clicked.emit(name, index.row())
+                    return True
+        return False
+
+
+def create_violation_view(model, row_height=36):
+    """QTableView configured for large, lazily-fetched violation models"""
+    view = QTableView()
+    view.setModel(model)
+    view.verticalHeader().setVisible(False)
+    # Fixed row heights avoid measuring every row as pages arrive
+    view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+    view.verticalHeader().setDefaultSectionSize(row_height)
+    view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+    view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+    view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+    return view